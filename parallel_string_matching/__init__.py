@@ -0,0 +1,21 @@
+"""
+Parallel string matching, over processes or threads.
+
+`search` answers one query on a file or buffer, `search_async` on an
+asynchronous stream. Optional backends (NumPy, suffix array index), 
+asyncio and the command line tools are only imported when used.
+"""
+
+from .string_matching import ALGORITHMS, MODES, EXECUTORS, APPROXIMATE
+from .string_matching import CompiledPattern, MatchResults, compile_pattern
+from .compressed import COMPRESSIONS
+from .search_stats import SearchStats
+from .api import search
+
+def __getattr__(name):
+    # The asyncio API is imported on first use, asyncio slows down startup
+    if name == "search_async":
+        from .async_search import search_async
+        return search_async
+    raise AttributeError("module {!r} has no attribute {!r}".format(
+                                                            __name__, name))
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+
+import os
+import time
+from .string_matching import StringMatching as sm
+from .string_matching import ParallelStringMatching as psm
+from .string_matching import ParallelPreprocessing as pp
+from .string_matching import DEFAULT_BUFFER_SIZE, DEFAULT_CHUNK_SIZE
+from .string_matching import SAMPLE_SIZE
+from .string_matching import MatchResults, compile_pattern
+from .search_stats import SearchStats
+from .executors import run_tasks, run_threads
+
+def search(path_or_buffer, patterns, engine="auto", workers=1, mode="all",
+                k=1, ignore_case=False, max_errors=0, edits=True,
+                chunk_size=None, stats=None):
+    """
+    Search a file or an in-memory buffer for one or more patterns. Data is
+    searched as bytes, so offsets are in bytes, and only ASCII case is
+    ignored. Files are memory-mapped, never loaded whole. Compressed files
+    are decompressed on the fly, offsets being in decompressed bytes.
+
+    Parameters:
+    -----------
+    path_or_buffer: `str`, path-like or buffer
+        Path to input file, plain or in one of `COMPRESSIONS`, or object
+        supporting the buffer protocol, such as `bytes`, `bytearray`,
+        `memoryview` or `mmap`.
+    patterns: `str`, `bytes` or list of them
+        Pattern to search for, or list of patterns searched for in a single
+        Aho-Corasick pass (in the calling process, exact matches only).
+        Strings are encoded as UTF-8.
+    engine: `str`
+        Algorithm used for a single pattern, one of `ALGORITHMS`, or 'auto'
+        to time the candidate engines on the start of a file or buffer.
+    workers: `int`
+        Number of parallel workers: processes mapping their own range of a
+        file, or decompressing their own blocks of a bgzip or multi-frame
+        zstd file, or threads sharing a buffer. 1 searches in the calling
+        thread.
+    mode: `str`
+        Query mode, one of `MODES`.
+    k: `int`
+        Number of matches returned in 'first-k' mode.
+    ignore_case: `bool`
+        Ignore ASCII letters case.
+    max_errors: `int`
+        Maximum number of errors in approximate matches.
+    edits: `bool`
+        Count insertions, deletions and substitutions as errors, instead
+        of substitutions only.
+    chunk_size: `int`
+        Split parallel input in chunks of this many bytes, scheduled
+        dynamically over workers, instead of one segment per worker.
+    stats: `SearchStats`
+        Search statistics, filled when given.
+
+    Returns:
+    --------
+    result:
+        For a single pattern, list of match offsets in 'all' and 'first-k'
+        modes, number of matches in 'count' mode, `bool` in 'exists' mode.
+        For a list of patterns, dictionary of each pattern to its result.
+    """
+
+    if isinstance(path_or_buffer, (str, os.PathLike)):
+        from .compressed import detect_compression
+
+        compression = detect_compression(path_or_buffer)
+        if compression:
+            return search_compressed(os.fspath(path_or_buffer), patterns,
+                                    engine, workers, mode, k, ignore_case,
+                                    max_errors, edits, chunk_size, stats,
+                                    compression)
+        with open(path_or_buffer, "rb") as file:
+            if not os.fstat(file.fileno()).st_size:
+                return search_buffer(b"", patterns, engine, 1, mode, k,
+                                        ignore_case, max_errors, edits)
+            if workers > 1 and not isinstance(patterns, list):
+                return search_file(os.fspath(path_or_buffer), patterns,
+                                    engine, workers, mode, k, ignore_case,
+                                    max_errors, edits, chunk_size, stats)
+            import mmap
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return search_buffer(mm, patterns, engine, 1, mode, k,
+                                    ignore_case, max_errors, edits, None,
+                                    stats)
+    return search_buffer(path_or_buffer, patterns, engine, workers, mode, k,
+                            ignore_case, max_errors, edits, chunk_size, stats)
+
+def prepare_pattern(pattern, engine="auto", ignore_case=False, max_errors=0,
+                                                    edits=True, sample=None):
+    """
+    Encode a pattern and compile it for the chosen engine.
+
+    Parameters:
+    -----------
+    pattern: `str` or `bytes`
+        Pattern to search for.
+    engine: `str`
+        Algorithm name, one of `ALGORITHMS`, or 'auto'.
+    ignore_case: `bool`
+        Ignore ASCII letters case.
+    max_errors: `int`
+        Maximum number of errors in approximate matches.
+    edits: `bool`
+        Count insertions and deletions as errors, besides substitutions.
+    sample:
+        Start of the data, over which 'auto' times the candidate engines.
+
+    Returns:
+    --------
+    compiled: `CompiledPattern`
+        Compiled pattern, from the shared cache.
+    """
+
+    if isinstance(pattern, str):
+        pattern = pattern.encode("utf-8")
+    if not pattern:
+        raise ValueError("Pattern must not be empty")
+    if engine == "auto":
+        engine, _ = sm().choose_algorithm(pattern, ignore_case, True,
+                                                        max_errors, sample)
+    return compile_pattern(pattern, engine, ignore_case, max_errors, edits)
+
+def search_file(path, pattern, engine="auto", workers=2, mode="all", k=1,
+                    ignore_case=False, max_errors=0, edits=True,
+                    chunk_size=None, stats=None):
+    """
+    Search a file for a pattern over a pool of processes, each one
+    memory-mapping the file and scanning its own byte ranges.
+
+    Parameters are those of `search`, for a single pattern and a path.
+    """
+
+    chunk_size = pp.choose_chunk_size(chunk_size, mode)
+    with open(path, "rb") as file:
+        sample = file.read(SAMPLE_SIZE)
+    compiled = prepare_pattern(pattern, engine, ignore_case, max_errors,
+                                                            edits, sample)
+    segments = pp.get_file_segments(path, workers, chunk_size)
+    result = run_tasks(workers, psm(), "mmap_algorithm",
+                        [(path, compiled.pattern, seg, compiled.algorithm)
+                        for seg in segments], mode, k, compiled, stats)
+    return finish(result, mode)
+
+def search_compressed(path, patterns, engine="auto", workers=1, mode="all",
+                        k=1, ignore_case=False, max_errors=0, edits=True,
+                        chunk_size=None, stats=None, compression=None):
+    """
+    Search a compressed file for one or more patterns, decompressing it as
+    a stream, or over a pool of processes for a single pattern in a bgzip
+    or multi-frame zstd file.
+
+    Parameters are those of `search`, for a compressed file, with its
+    compression format, one of `COMPRESSIONS`, detected when not given.
+    """
+
+    from . import compressed
+
+    timer = stats if stats is not None else SearchStats()
+    if isinstance(patterns, list):
+        from .multi_pattern import MultiPatternMatcher as mpm
+
+        encoded = [p.encode("utf-8") if isinstance(p, str) else p
+                                                            for p in patterns]
+        if not all(encoded):
+            raise ValueError("Patterns must not be empty")
+        automaton = mpm(encoded, ignore_case)
+        found = {key: list() for key in encoded}
+        with timer.phase("search"), compressed.open_compressed(path,
+                                                    compression) as file:
+            state = 0
+            position = 0
+            for chunk in iter(lambda: file.read(DEFAULT_BUFFER_SIZE), b""):
+                matches, state = automaton.resume(chunk, state)
+                for key in found:
+                    found[key].extend(position + i for i in matches[key])
+                position += len(chunk)
+        return {pattern: psm.apply_mode(iter(found[key]), mode, k)
+                                for pattern, key in zip(patterns, encoded)}
+
+    compiled = prepare_pattern(patterns, engine, ignore_case, max_errors,
+                                                                    edits)
+    with timer.phase("search"):
+        result = compressed.search_compressed(path, compiled.pattern,
+                            workers, compiled.algorithm, ignore_case,
+                            max_errors, edits, compression,
+                            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                            mode=mode, k=k)
+    return finish(result, mode)
+
+def search_buffer(buffer, patterns, engine="auto", workers=1, mode="all",
+                    k=1, ignore_case=False, max_errors=0, edits=True,
+                    chunk_size=None, stats=None):
+    """
+    Search a buffer for one or more patterns, through zero-copy views,
+    on threads when there are several workers.
+
+    Parameters are those of `search`, for a buffer.
+    """
+
+    if isinstance(patterns, list):
+        return search_patterns(buffer, patterns, mode, k, ignore_case)
+
+    view = memoryview(buffer).cast("B")
+    compiled = prepare_pattern(patterns, engine, ignore_case, max_errors,
+                                            edits, view[:SAMPLE_SIZE])
+    parallelSM = psm()
+    length = len(view)
+    view.release()
+    if workers > 1:
+        chunk_size = pp.choose_chunk_size(chunk_size, mode)
+        if chunk_size:
+            segments = pp.calculate_chunk_size(length, chunk_size)
+        else:
+            segments = pp.calculate_segment_size(length, workers)
+        result = run_threads(workers, parallelSM, "buffer_algorithm",
+                            [(buffer, compiled.pattern, seg,
+                            compiled.algorithm) for seg in segments],
+                            mode, k, compiled, stats)
+        return finish(result, mode)
+
+    timer = stats if stats is not None else SearchStats()
+    start = time.time()
+    with timer.phase("search"):
+        result = parallelSM.buffer_algorithm(buffer, compiled.pattern,
+                                [0, length], compiled.algorithm,
+                                *compiled.args, mode=mode, k=k)
+    timer.add_task(parallelSM.task_stats([0, length], start, time.time(),
+                                                                    result))
+    return finish(result, mode)
+
+def search_patterns(buffer, patterns, mode="all", k=1, ignore_case=False):
+    """
+    Search a buffer for several patterns, with an Aho-Corasick automaton.
+
+    Parameters are those of `search`, for a list of patterns and a buffer.
+    """
+
+    from .multi_pattern import MultiPatternMatcher as mpm
+
+    encoded = [p.encode("utf-8") if isinstance(p, str) else p
+                                                            for p in patterns]
+    if not all(encoded):
+        raise ValueError("Patterns must not be empty")
+    found = mpm(encoded, ignore_case).search(memoryview(buffer).cast("B"))
+    return {pattern: psm.apply_mode(iter(found[key]), mode, k)
+                                for pattern, key in zip(patterns, encoded)}
+
+def finish(result, mode="all"):
+    """
+    Convert the result of a query mode to plain Python types.
+
+    Parameters:
+    -----------
+    result:
+        Result of the query mode, an `array` or `MatchResults` in 'all'
+        mode.
+    mode: `str`
+        Query mode, one of `MODES`.
+
+    Returns:
+    --------
+    result:
+        List of offsets in 'all' mode, the result itself otherwise.
+    """
+
+    if isinstance(result, MatchResults):
+        with result:
+            return result.tolist()
+    if mode == "all":
+        return list(result)
+    return result
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+import asyncio
+from itertools import takewhile
+from .string_matching import StringMatching as sm
+from .string_matching import DEFAULT_BUFFER_SIZE, compile_pattern
+
+# Chunks smaller than this are searched in the event loop even when an
+# executor is given, handing them over would cost more than the search
+OFFLOAD_SIZE = 256 * 1024
+
+async def iter_chunks(source, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Read the chunks of an asynchronous source.
+
+    Parameters:
+    -----------
+    source:
+        `asyncio.StreamReader`, or any object with a `read` coroutine,
+        or asynchronous iterable of bytes chunks.
+    buffer_size: `int`
+        Maximum number of bytes read at a time from a reader.
+
+    Returns:
+    --------
+    chunks: `async generator`
+        Non empty bytes chunks, in stream order.
+    """
+
+    if hasattr(source, "__aiter__") and not hasattr(source, "read"):
+        async for chunk in source:
+            if chunk:
+                yield chunk
+        return
+
+    while True:
+        chunk = await source.read(buffer_size)
+        if not chunk:
+            break
+        yield chunk
+
+def search_window(compiled, window, owned):
+    """
+    Search a window of the stream for a compiled pattern, keeping the
+    matches it owns. Picklable, to run in process executors.
+
+    Parameters:
+    -----------
+    compiled: `CompiledPattern`
+        Compiled pattern.
+    window: `bytes`
+        Data carried over from the previous window, followed by a chunk.
+    owned: `int`
+        Number of window bytes where owned matches start, the remaining
+        ones being carried over to the next window.
+
+    Returns:
+    --------
+    matches: `int`
+        List of window indices where owned matches start.
+    """
+
+    return list(takewhile(lambda i: i < owned, compiled.matches(window)))
+
+async def search_async(source, patterns, engine="auto", ignore_case=False,
+                        max_errors=0, edits=True,
+                        buffer_size=DEFAULT_BUFFER_SIZE, executor=None,
+                        offload_size=OFFLOAD_SIZE):
+    """
+    Search an asynchronous stream, such as a socket or a subprocess pipe,
+    emitting matches as soon as the chunk holding their end is searched.
+    Only the matcher state is kept between chunks, so memory does not grow
+    with the stream.
+
+    A single pattern is searched over windows made of the last bytes of
+    the previous window followed by the next chunk, as in
+    `StreamingStringMatching.search_stream`. The carried bytes are those
+    of every match that could still be completed, the matcher state of
+    KMP or Shift-Or being a function of them. A list of patterns is
+    searched with an Aho-Corasick automaton, resumed on each chunk from
+    its state at the end of the previous one.
+
+    Parameters:
+    -----------
+    source:
+        `asyncio.StreamReader`, or any object with a `read` coroutine,
+        or asynchronous iterable of bytes chunks.
+    patterns: `str`, `bytes` or list of them
+        Pattern to search for, or list of patterns (exact matches only).
+        Strings are encoded as UTF-8.
+    engine: `str`
+        Algorithm used for a single pattern, one of `ALGORITHMS`, or
+        'auto' to choose it by pattern and options.
+    ignore_case: `bool`
+        Ignore ASCII letters case.
+    max_errors: `int`
+        Maximum number of errors in approximate matches.
+    edits: `bool`
+        Count insertions, deletions and substitutions as errors, instead
+        of substitutions only.
+    buffer_size: `int`
+        Maximum number of bytes read at a time from a reader.
+    executor: `concurrent.futures.Executor`
+        Executor searching chunks of at least `offload_size` bytes, so
+        the event loop keeps serving other tasks. `None` searches every
+        chunk in the event loop.
+    offload_size: `int`
+        Minimum chunk size searched in the executor.
+
+    Returns:
+    --------
+    matches: `async generator`
+        Stream offsets where matches start, in increasing order; (pattern,
+        offset) pairs for a list of patterns.
+    """
+
+    loop = asyncio.get_running_loop()
+    chunks = iter_chunks(source, buffer_size)
+
+    async def run(function, *args, size):
+        if executor is not None and size >= offload_size:
+            return await loop.run_in_executor(executor, function, *args)
+        return function(*args)
+
+    if isinstance(patterns, list):
+        from .multi_pattern import MultiPatternMatcher as mpm
+
+        encoded = [p.encode("utf-8") if isinstance(p, str) else p
+                                                            for p in patterns]
+        if not all(encoded):
+            raise ValueError("Patterns must not be empty")
+        automaton = mpm(encoded, ignore_case)
+
+        state = 0
+        position = 0
+        async for chunk in chunks:
+            found, state = await run(automaton.resume, chunk, state,
+                                                            size=len(chunk))
+            for offset, _, pattern in sorted((position + i, index, pattern)
+                            for index, (pattern, key) in enumerate(zip(
+                                                        patterns, encoded))
+                            for i in found[key]):
+                yield pattern, offset
+            position += len(chunk)
+        return
+
+    pattern = patterns.encode("utf-8") if isinstance(patterns, str) \
+                                                                else patterns
+    if not pattern:
+        raise ValueError("Pattern must not be empty")
+    if engine == "auto":
+        engine, _ = sm().choose_algorithm(pattern, ignore_case, False,
+                                                                max_errors)
+    compiled = compile_pattern(pattern, engine, ignore_case, max_errors,
+                                                                    edits)
+    overlap = sm.get_overlap(pattern, engine, *compiled.args)
+
+    carry = b""
+    position = 0
+    async for chunk in chunks:
+        window = carry + chunk
+        owned = max(len(window) - overlap, 0)
+        for match in await run(search_window, compiled, window, owned,
+                                                            size=len(window)):
+            yield position + match
+        carry = window[owned:]
+        position += owned
+
+    # Approximate matches may be shorter than the carried bytes
+    for match in search_window(compiled, carry, len(carry)):
+        yield position + match
@@ -0,0 +1,502 @@
+#!/usr/bin/env python
+
+import os
+import csv
+import math
+import sys
+import json
+import time
+import argparse
+import statistics
+import multiprocessing as mp
+from .string_matching import ParallelStringMatching as psm
+from .string_matching import ParallelPreprocessing as pp
+from .string_matching import load_text, load_bytes, MatchResults, ALGORITHMS
+from .string_matching import compile_pattern
+
+PATTERN_KINDS = {
+    "word": "people",
+    "phrase": "of the",
+    "short": "he",
+    "absent": "zqxjkv"
+}
+
+def create_parser():
+
+    parser = argparse.ArgumentParser(
+        usage="python3 benchmark.py <options>",
+        description=("Benchmark string matching over a matrix of files, "
+                    "algorithms, core counts and pattern kinds, timing "
+                    "load, segment, search and merge phases separately.")
+    )
+
+    parser.add_argument("-f", "--files",
+                        nargs="+",
+                        help="Text files used as haystack",
+                        required=True
+    )
+
+    parser.add_argument("-a", "--algorithms",
+                        nargs="+",
+                        choices=ALGORITHMS,
+                        default=["kmp", "horspool"],
+                        help="Algorithms benchmarked"
+    )
+
+    parser.add_argument("-c", "--cores",
+                        nargs="+",
+                        type=int,
+                        help=("Core counts benchmarked, 1 runs sequentially "
+                            "(defaults to powers of 2 up to the CPU count)")
+    )
+
+    parser.add_argument("-p", "--patterns",
+                        nargs="+",
+                        default=list(PATTERN_KINDS),
+                        help=("Pattern kinds benchmarked ({}) or custom "
+                            "patterns as kind=pattern").format(
+                                                    ", ".join(PATTERN_KINDS))
+    )
+
+    parser.add_argument("--bytes",
+                        action="store_true",
+                        help="Load texts as raw bytes instead of decoding them"
+    )
+
+    parser.add_argument("--case_sensitive",
+                        action="store_true",
+                        help="Match case exactly, instead of ignoring it"
+    )
+
+    parser.add_argument("-r", "--repeat",
+                        type=int,
+                        default=5,
+                        help="Timed runs per case"
+    )
+
+    parser.add_argument("-w", "--warmup",
+                        type=int,
+                        default=1,
+                        help="Untimed runs per case, before timed runs"
+    )
+
+    parser.add_argument("-o", "--output",
+                        type=str,
+                        default="benchmark_results.json",
+                        help="JSON results file"
+    )
+
+    parser.add_argument("--csv",
+                        type=str,
+                        help="Also write results as CSV to this file"
+    )
+
+    parser.add_argument("--baseline",
+                        type=str,
+                        help="JSON results of a previous run to compare with"
+    )
+
+    parser.add_argument("--threshold",
+                        type=float,
+                        default=0.10,
+                        help=("Relative slowdown of the median total time "
+                            "flagged as a regression")
+    )
+
+    return parser
+
+def get_core_counts(max_core_count):
+    """
+    Create list with core counts used in benchmark (values are power of 2).
+
+    Parameters:
+    -----------
+    max_core_count: `int`
+        Max core count used
+    """
+
+    core_counts = []
+    i = 0
+    while 2**i < max_core_count:
+        core_counts.append(2**i)
+        i += 1
+    core_counts.append(max_core_count)
+    return core_counts
+
+def parse_patterns(patterns):
+    """
+    Map pattern kinds to patterns.
+
+    Parameters:
+    -----------
+    patterns: `str`
+        List of known pattern kinds, or 'kind=pattern' entries
+
+    Returns:
+    --------
+    patterns: `dict`
+        Pattern kind to pattern.
+    """
+
+    result = dict()
+    for entry in patterns:
+        if "=" in entry:
+            kind, pattern = entry.split("=", 1)
+        elif entry in PATTERN_KINDS:
+            kind, pattern = entry, PATTERN_KINDS[entry]
+        else:
+            raise ValueError("Unknown pattern kind '{}'".format(entry))
+        result[kind] = pattern
+    return result
+
+def percentile(samples, fraction):
+    """
+    Nearest-rank percentile.
+
+    Parameters:
+    -----------
+    samples: `float`
+        List of samples
+    fraction: `float`
+        Percentile, between 0 and 1
+    """
+
+    ordered = sorted(samples)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+def summarize(samples):
+    """
+    Repeat statistics of timing samples.
+
+    Parameters:
+    -----------
+    samples: `float`
+        List of samples, in seconds
+
+    Returns:
+    --------
+    statistics: `dict`
+        Median, 95th percentile, standard deviation, mean, min and max.
+    """
+
+    return {
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 0.95),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "mean": statistics.mean(samples),
+        "min": min(samples),
+        "max": max(samples)
+    }
+
+def run_once(path, compiled, cores, pool=None, use_bytes=False):
+    """
+    Run one search, timing each phase. The pattern is compiled beforehand,
+    outside of the timed phases, in sequential and parallel runs alike.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to text
+    compiled: `CompiledPattern`
+        Pattern to look for in text, with the tables of the algorithm used,
+        encoded when text is loaded as bytes
+    cores: `int`
+        Core count, 1 runs sequentially
+    pool: `multiprocessing.Pool`
+        Pool of `cores` processes, for parallel runs, initialized with 
+        the compiled pattern
+    use_bytes: `bool`
+        Load text as raw bytes
+
+    Returns:
+    --------
+    timings: `dict`
+        Phase name to elapsed seconds.
+    matches: `int`
+        Number of matches found.
+    """
+
+    timings = dict()
+
+    start = time.perf_counter()
+    if use_bytes:
+        text = load_bytes(path, lowercase=False)
+    else:
+        text = load_text(path, lowercase=False)
+    timings["load"] = time.perf_counter() - start
+
+    if cores == 1:
+        start = time.perf_counter()
+        matches = compiled.search(text)
+        timings["search"] = time.perf_counter() - start
+        return timings, len(matches)
+
+    parallelSM = psm()
+    pattern, algorithm = compiled.pattern, compiled.algorithm
+    start = time.perf_counter()
+    overlap = parallelSM.get_overlap(pattern, algorithm, *compiled.args)
+    sliced_text, segments = pp.get_text_segments(text, cores, overlap + 1)
+    timings["segment"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    jobs = [(y[0], "segment_algorithm", (pattern, x, y, algorithm), dict())
+            for x, y in zip(sliced_text, segments)]
+    parts = pool.map(parallelSM.run_task, jobs, chunksize=1)
+    timings["search"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with MatchResults(matches for _, matches in sorted(parts,
+                                        key=lambda part: part[0])) as results:
+        matches = len(results)
+    timings["merge"] = time.perf_counter() - start
+    return timings, matches
+
+def run_case(path, pattern, algorithm, cores, repeat=5, warmup=1,
+                                        use_bytes=False, ignore_case=True):
+    """
+    Benchmark one case of the matrix.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to text
+    pattern: `str`
+        Pattern to look for in text
+    algorithm: `str`
+        Algorithm used for string search
+    cores: `int`
+        Core count, 1 runs sequentially
+    repeat: `int`
+        Number of timed runs
+    warmup: `int`
+        Number of untimed runs, before timed runs
+    use_bytes: `bool`
+        Load text as raw bytes
+    ignore_case: `bool`
+        Ignore case when matching
+
+    Returns:
+    --------
+    phases: `dict`
+        Phase name to statistics, including a 'total' phase.
+    matches: `int`
+        Number of matches found.
+    """
+
+    # Compiled once per case, as pool workers receive it once
+    compiled = compile_pattern(pattern.encode() if use_bytes else pattern,
+                                                    algorithm, ignore_case)
+    pool = None
+    if cores > 1:
+        psm.prepare_sharing()
+        pool = mp.Pool(cores, initializer=psm.init_worker, 
+                                                    initargs=(None, compiled))
+
+    samples = dict()
+    try:
+        for iteration in range(warmup + repeat):
+            timings, matches = run_once(path, compiled, cores, pool, 
+                                                                use_bytes)
+            if iteration < warmup:
+                continue
+            timings["total"] = sum(timings.values())
+            for phase, elapsed in timings.items():
+                samples.setdefault(phase, []).append(elapsed)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return {phase: summarize(values) for phase, values in samples.items()}, \
+                                                                    matches
+
+def run_matrix(files, patterns, algorithms, core_counts, repeat=5, warmup=1,
+                                        use_bytes=False, ignore_case=True):
+    """
+    Benchmark every combination of files, pattern kinds, algorithms and
+    core counts.
+
+    Parameters:
+    -----------
+    files: `str`
+        List of paths to texts
+    patterns: `dict`
+        Pattern kind to pattern
+    algorithms: `str`
+        List of algorithms
+    core_counts: `int`
+        List of core counts
+    repeat: `int`
+        Number of timed runs per case
+    warmup: `int`
+        Number of untimed runs per case
+    use_bytes: `bool`
+        Load texts as raw bytes
+    ignore_case: `bool`
+        Ignore case when matching
+
+    Returns:
+    --------
+    records: `dict`
+        List of results, one per case.
+    """
+
+    records = list()
+    for path in files:
+        size = os.path.getsize(path)
+        for kind, pattern in patterns.items():
+            for algorithm in algorithms:
+                for cores in core_counts:
+                    phases, matches = run_case(path, pattern, algorithm,
+                                            cores, repeat, warmup, use_bytes,
+                                            ignore_case)
+                    records.append({
+                        "file": os.path.basename(path),
+                        "size": size,
+                        "pattern_kind": kind,
+                        "pattern": pattern,
+                        "algorithm": algorithm,
+                        "cores": cores,
+                        "loader": "bytes" if use_bytes else "text",
+                        "ignore_case": ignore_case,
+                        "repeat": repeat,
+                        "matches": matches,
+                        "phases": phases
+                    })
+                    print("{file} {pattern_kind} {algorithm} {cores} core(s)"
+                            " -> median {median:.4f}s, p95 {p95:.4f}s, "
+                            "{matches} matches".format(
+                                median=phases["total"]["median"],
+                                p95=phases["total"]["p95"],
+                                **records[-1]))
+    return records
+
+def write_json(records, path):
+    """
+    Write benchmark results as JSON.
+
+    Parameters:
+    -----------
+    records: `dict`
+        List of results
+    path: `str`
+        Output file
+    """
+
+    with open(path, "w") as file:
+        json.dump({"python": sys.version.split()[0],
+                    "cpu_count": mp.cpu_count(),
+                    "results": records}, file, indent=2)
+
+def write_csv(records, path):
+    """
+    Write benchmark results as CSV, one row per case and phase.
+
+    Parameters:
+    -----------
+    records: `dict`
+        List of results
+    path: `str`
+        Output file
+    """
+
+    fields = ("file", "size", "pattern_kind", "pattern", "algorithm",
+                "cores", "loader", "ignore_case", "repeat", "matches", 
+                "phase", "median", "p95", "stddev", "mean", "min", "max")
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for record in records:
+            for phase, stats in record["phases"].items():
+                row = {key: record[key] for key in fields if key in record}
+                row["phase"] = phase
+                row.update(stats)
+                writer.writerow(row)
+
+def case_key(record):
+    return (record["file"], record["pattern_kind"], record["algorithm"],
+                        record["cores"], record.get("loader", "text"),
+                        record.get("ignore_case", True))
+
+def compare_baseline(records, baseline_path, threshold=0.10):
+    """
+    Compare median total times with a previous run.
+
+    Parameters:
+    -----------
+    records: `dict`
+        List of results
+    baseline_path: `str`
+        JSON results of the previous run
+    threshold: `float`
+        Relative slowdown flagged as a regression
+
+    Returns:
+    --------
+    regressions: `dict`
+        List of cases slower than the baseline by more than threshold.
+    """
+
+    with open(baseline_path, "r") as file:
+        baseline = {case_key(record): record
+                    for record in json.load(file)["results"]}
+
+    regressions = list()
+    for record in records:
+        previous = baseline.get(case_key(record))
+        if previous is None:
+            continue
+        old = previous["phases"]["total"]["median"]
+        new = record["phases"]["total"]["median"]
+        change = (new - old) / old if old else 0.0
+        status = "REGRESSION" if change > threshold else "ok"
+        print(("{} {} {} {} core(s) {} ignore_case={}: {:.4f}s -> {:.4f}s "
+                "({:+.1%}) {}").format(*case_key(record), old, new, change, 
+                                                                    status))
+        if change > threshold:
+            regressions.append({"case": case_key(record), "baseline": old,
+                                "median": new, "change": change})
+    return regressions
+
+def cli(argv=None):
+    """
+    Console entry point, benchmarking as requested by command line 
+    arguments.
+
+    Parameters:
+    -----------
+    argv: `str`
+        List of arguments, defaults to those of the command line
+
+    Returns:
+    --------
+    status: `int`
+        Exit status, 1 if regressions were found against the baseline.
+    """
+
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
+    records = run_matrix(args.files, parse_patterns(args.patterns),
+                            args.algorithms,
+                            args.cores or get_core_counts(mp.cpu_count()),
+                            args.repeat, args.warmup, args.bytes,
+                            not args.case_sensitive)
+    write_json(records, args.output)
+    print("Results written to {}".format(args.output))
+    if args.csv:
+        write_csv(records, args.csv)
+        print("Results written to {}".format(args.csv))
+
+    if args.baseline:
+        regressions = compare_baseline(records, args.baseline,
+                                                            args.threshold)
+        if regressions:
+            print("{} regression(s) found!".format(len(regressions)))
+            return 1
+    return 0
+
+if __name__ == "__main__":
+
+    sys.exit(cli())
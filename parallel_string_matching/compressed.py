@@ -0,0 +1,545 @@
+#!/usr/bin/env python
+
+import io
+import mmap
+import os
+import struct
+import multiprocessing as mp
+from array import array
+from .string_matching import ParallelStringMatching as psm
+from .string_matching import StreamingStringMatching as ssm
+from .string_matching import ParallelPreprocessing as pp
+from .string_matching import DEFAULT_BUFFER_SIZE, DEFAULT_CHUNK_SIZE
+
+# Magic bytes starting the files of each supported compression format,
+# with the deflate method byte for gzip
+COMPRESSIONS = {
+    "gzip": b"\x1f\x8b\x08",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+# bz2 magic is plain ASCII: it is followed by a block size digit, then by
+# the magic of the first block, or of the stream end for empty data
+BZ2_LEVELS = b"123456789"
+BZ2_BLOCK_MAGICS = (b"1AY&SY", b"\x17rE8P\x90")
+MAGIC_SIZE = len(COMPRESSIONS["bz2"]) + 1 + len(BZ2_BLOCK_MAGICS[0])
+
+# Formats made of independently decompressible blocks, when written with
+# block-aware tools: bgzip members and zstd frames
+BLOCK_COMPRESSIONS = ("gzip", "zstd")
+
+# Magic numbers of zstd frames and skippable frames (low 4 bits free)
+ZSTD_MAGIC = 0xFD2FB528
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+# Query searched by pool workers, set by the pool initializer
+worker_query = None
+
+def require_zstandard():
+    """
+    Import the zstandard module, raising an error if it is not installed.
+
+    Returns:
+    --------
+    zstandard: `module`
+        The zstandard module.
+    """
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading zstd input requires zstandard to be "
+                            "installed (pip install zstandard)") from None
+    return zstandard
+
+def detect_magic(header):
+    """
+    Detect the compression format of data from its first bytes.
+
+    Parameters:
+    -----------
+    header: `bytes`
+        First bytes of the data, at least `MAGIC_SIZE` of them when
+        available.
+
+    Returns:
+    --------
+    compression: `str`
+        Compression format, one of `COMPRESSIONS`, or `None` for data
+        that is not compressed.
+    """
+
+    for compression, magic in COMPRESSIONS.items():
+        if not header.startswith(magic):
+            continue
+        if compression == "bz2" and (header[3:4] not in BZ2_LEVELS or 
+                            header[4:MAGIC_SIZE] not in BZ2_BLOCK_MAGICS):
+            continue
+        return compression
+    # Files written by pzstd start with a skippable frame
+    if header[1:4] == b"\x2a\x4d\x18" and header[0] & 0xF0 == 0x50:
+        return "zstd"
+    return None
+
+def detect_compression(path):
+    """
+    Detect the compression format of a file from its magic bytes, whatever
+    its extension.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file.
+
+    Returns:
+    --------
+    compression: `str`
+        Compression format, one of `COMPRESSIONS`, or `None` for a file
+        that is not compressed.
+    """
+
+    with open(path, "rb") as file:
+        return detect_magic(file.read(MAGIC_SIZE))
+
+def decompressing_reader(file, compression):
+    """
+    Wrap a binary file object in a reader of its decompressed data,
+    reading across gzip members, xz streams and zstd frames. Closing the
+    reader leaves the file open.
+
+    Parameters:
+    -----------
+    file:
+        Binary file object, positioned where compressed data starts.
+    compression: `str`
+        Compression format, one of `COMPRESSIONS`.
+
+    Returns:
+    --------
+    reader:
+        Binary file object of decompressed data.
+    """
+
+    if compression == "gzip":
+        import gzip
+        return gzip.GzipFile(fileobj=file, mode="rb")
+    elif compression == "bz2":
+        import bz2
+        return bz2.BZ2File(file)
+    elif compression == "xz":
+        import lzma
+        return lzma.LZMAFile(file)
+    elif compression == "zstd":
+        return require_zstandard().ZstdDecompressor().stream_reader(file,
+                                    read_across_frames=True, closefd=False)
+    raise ValueError("Unknown compression format '{}'".format(compression))
+
+def open_compressed(path, compression=None):
+    """
+    Open a file for reading its decompressed data, detecting the
+    compression format when not given. Files that are not compressed are
+    opened as they are.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file.
+    compression: `str`
+        Compression format, one of `COMPRESSIONS`.
+
+    Returns:
+    --------
+    file:
+        Binary file object, closing the underlying file when closed.
+    """
+
+    if compression is None:
+        compression = detect_compression(path)
+    if compression is None:
+        return open(path, "rb")
+    elif compression == "gzip":
+        import gzip
+        return gzip.open(path, "rb")
+    elif compression == "bz2":
+        import bz2
+        return bz2.open(path, "rb")
+    elif compression == "xz":
+        import lzma
+        return lzma.open(path, "rb")
+    elif compression == "zstd":
+        zstandard = require_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"),
+                                                    read_across_frames=True)
+    raise ValueError("Unknown compression format '{}'".format(compression))
+
+def read_exactly(reader, size=None):
+    """
+    Read from a reader until `size` bytes or the end of data are reached,
+    as decompressing readers may return less than asked for.
+
+    Parameters:
+    -----------
+    reader:
+        Binary file object.
+    size: `int`
+        Number of bytes to read, `None` to read everything.
+
+    Returns:
+    --------
+    data: `bytes`
+        Data read.
+    """
+
+    chunks = list()
+    remaining = size
+    while remaining is None or remaining > 0:
+        chunk = reader.read(DEFAULT_BUFFER_SIZE if remaining is None
+                                    else min(remaining, DEFAULT_BUFFER_SIZE))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if remaining is not None:
+            remaining -= len(chunk)
+    return b"".join(chunks)
+
+def gzip_blocks(data):
+    """
+    List the members of a BGZF file, as written by bgzip, each holding
+    its compressed size in a 'BC' extra subfield.
+
+    Parameters:
+    -----------
+    data: `mmap`
+        Compressed file data.
+
+    Returns:
+    --------
+    blocks: `list`
+        List of [start, end] compressed byte ranges, `None` when a member
+        does not record its size.
+    """
+
+    blocks = list()
+    offset = 0
+    while offset < len(data):
+        # ID1, ID2, deflate method and FEXTRA flag, then XLEN at byte 10
+        if data[offset:offset + 4] != b"\x1f\x8b\x08\x04" or \
+                                                offset + 12 > len(data):
+            return None
+        extra = offset + 12
+        extra_end = extra + struct.unpack_from("<H", data, offset + 10)[0]
+        block_size = None
+        while extra + 4 <= extra_end:
+            subfield_size = struct.unpack_from("<H", data, extra + 2)[0]
+            if data[extra:extra + 2] == b"BC" and subfield_size == 2:
+                block_size = struct.unpack_from("<H", data, extra + 4)[0] + 1
+            extra += 4 + subfield_size
+        if block_size is None or offset + block_size > len(data):
+            return None
+        blocks.append([offset, offset + block_size])
+        offset += block_size
+    return blocks
+
+def zstd_blocks(data):
+    """
+    List the frames of a zstd file, walking frame and block headers.
+
+    Parameters:
+    -----------
+    data: `mmap`
+        Compressed file data.
+
+    Returns:
+    --------
+    blocks: `list`
+        List of [start, end] compressed byte ranges, one per frame,
+        skippable frames included, `None` for malformed data.
+    """
+
+    blocks = list()
+    offset = 0
+    while offset + 8 <= len(data):
+        magic = struct.unpack_from("<I", data, offset)[0]
+        if magic & 0xFFFFFFF0 == ZSTD_SKIPPABLE_MAGIC:
+            end = offset + 8 + struct.unpack_from("<I", data, offset + 4)[0]
+        elif magic == ZSTD_MAGIC:
+            descriptor = data[offset + 4]
+            single_segment = descriptor >> 5 & 1
+            content_size = (single_segment, 2, 4, 8)[descriptor >> 6]
+            dictionary_size = (0, 1, 2, 4)[descriptor & 3]
+            end = offset + 5 + (not single_segment) + dictionary_size + \
+                                                                content_size
+            last = False
+            while not last:
+                if end + 3 > len(data):
+                    return None
+                header = int.from_bytes(data[end:end + 3], "little")
+                last = header & 1
+                block_type = header >> 1 & 3
+                if block_type == 3:
+                    return None
+                # RLE blocks hold a single byte, repeated block size times
+                end += 3 + (1 if block_type == 1 else header >> 3)
+            end += 4 * (descriptor >> 2 & 1)
+        else:
+            return None
+        if end > len(data):
+            return None
+        blocks.append([offset, end])
+        offset = end
+    return blocks if offset == len(data) else None
+
+def find_blocks(path, compression):
+    """
+    List the independently decompressible blocks of a compressed file.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file.
+    compression: `str`
+        Compression format, one of `COMPRESSIONS`.
+
+    Returns:
+    --------
+    blocks: `list`
+        List of [start, end] compressed byte ranges, `None` when the file
+        can only be decompressed sequentially.
+    """
+
+    if compression not in BLOCK_COMPRESSIONS:
+        return None
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if compression == "gzip":
+                return gzip_blocks(data)
+            return zstd_blocks(data)
+
+def plan_blocks(blocks, processors, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Group consecutive blocks in tasks of similar compressed size, the way
+    `ParallelPreprocessing.get_file_segments` splits plain files.
+
+    Parameters:
+    -----------
+    blocks: `list`
+        List of [start, end] compressed byte ranges, in file order.
+    processors: `int`
+        Processor count.
+    chunk_size: `int`
+        Maximum number of compressed bytes per task, unless a single block
+        is larger.
+
+    Returns:
+    --------
+    tasks: `list`
+        List of [start, end] compressed byte ranges, in file order.
+    """
+
+    total = blocks[-1][1] - blocks[0][0]
+    task_size = pp.calculate_task_size(total, processors, chunk_size)
+
+    tasks = list()
+    for start, end in blocks:
+        if tasks and end - tasks[-1][0] <= task_size:
+            tasks[-1][1] = end
+        else:
+            tasks.append([start, end])
+    return tasks
+
+def init_worker(path, compression, pattern, algorithm, args, overlap,
+                                                        mode="all", k=1):
+    """
+    Pool initializer, sending the query to each worker once, instead of
+    with every task.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file.
+    compression: `str`
+        Compression format, one of `BLOCK_COMPRESSIONS`.
+    pattern: `bytes`
+        Pattern to search for.
+    algorithm: `str`
+        Algorithm name, one of `ALGORITHMS`.
+    args:
+        Extra algorithm arguments, as built by `preprocess`.
+    overlap: `int`
+        Number of bytes decompressed past the end of each task, as given
+        by `get_overlap`.
+    mode: `str`
+        Query mode, one of `MODES`.
+    k: `int`
+        Number of matches returned in 'first-k' mode.
+    """
+
+    global worker_query
+    worker_query = (path, compression, pattern, algorithm, args, overlap,
+                                                                    mode, k)
+
+def search_block_task(task):
+    """
+    Decompress and search the blocks of a task, in a pool worker. The
+    start of the following blocks is decompressed too, so matches starting
+    in the task are found whole.
+
+    Parameters:
+    -----------
+    task: `list`
+        [start, end] compressed byte range.
+
+    Returns:
+    --------
+    length: `int`
+        Number of decompressed bytes in the task.
+    result:
+        Result of the query mode, with offsets in the task decompressed
+        data.
+    """
+
+    path, compression, pattern, algorithm, args, overlap, mode, k = \
+                                                                worker_query
+    start, end = task
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = read_exactly(decompressing_reader(
+                        io.BytesIO(file.read(end - start)), compression))
+        file.seek(end)
+        following = read_exactly(decompressing_reader(file, compression),
+                                                overlap) if overlap else b""
+    result = psm().segment_algorithm(pattern, data + following,
+                        [0, len(data)], algorithm, *args, mode=mode, k=k)
+    return len(data), result
+
+def search_blocks(path, pattern, processor_count=2, algorithm="kmp",
+                    args=(), compression="gzip", blocks=None,
+                    chunk_size=DEFAULT_CHUNK_SIZE, mode="all", k=1):
+    """
+    Search a block-compressed file over a pool of processes, each one
+    decompressing and searching its own runs of blocks.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file.
+    pattern: `bytes`
+        Pattern to search for.
+    processor_count: `int`
+        Number of processors used.
+    algorithm: `str`
+        Algorithm name, one of `ALGORITHMS`.
+    args:
+        Extra algorithm arguments, as built by `preprocess`.
+    compression: `str`
+        Compression format, one of `BLOCK_COMPRESSIONS`.
+    blocks: `list`
+        Blocks of the file, as listed by `find_blocks`, listed again when
+        not given.
+    chunk_size: `int`
+        Maximum number of compressed bytes per task.
+    mode: `str`
+        Query mode, one of `MODES`.
+    k: `int`
+        Number of matches returned in 'first-k' mode.
+
+    Returns:
+    --------
+    result:
+        `array` of offsets in the decompressed data in 'all' mode, list of
+        them in 'first-k' mode, number of matches in 'count' mode, `bool`
+        in 'exists' mode.
+    """
+
+    if blocks is None:
+        blocks = find_blocks(path, compression)
+    if not blocks:
+        raise ValueError("'{}' is not block-compressed".format(path))
+    tasks = plan_blocks(blocks, processor_count, chunk_size)
+    overlap = psm.get_overlap(pattern, algorithm, *args)
+
+    # Tasks are collected in file order, to know their decompressed offsets
+    with mp.Pool(processor_count, initializer=init_worker,
+                    initargs=(path, compression, pattern, algorithm, args,
+                                            overlap, mode, k)) as pool:
+        results = pool.imap(search_block_task, tasks)
+        if mode == "count":
+            return sum(count for _, count in results)
+        elif mode == "exists":
+            return any(found for _, found in results)
+
+        matches = array("q") if mode == "all" else list()
+        position = 0
+        for length, result in results:
+            matches.extend(position + i for i in result)
+            if mode == "first-k" and len(matches) >= k:
+                return matches[:k]
+            position += length
+        return matches
+
+def search_compressed(path, pattern, processor_count=1, algorithm="kmp",
+                        ignore_case=True, max_errors=0, edits=True,
+                        compression=None, buffer_size=DEFAULT_BUFFER_SIZE,
+                        chunk_size=DEFAULT_CHUNK_SIZE, mode="all", k=1):
+    """
+    Search a compressed file, over a pool of processes when it is made of
+    several blocks and more than one processor is given, decompressing it
+    as a stream otherwise.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file.
+    pattern: `bytes`
+        Pattern to search for.
+    processor_count: `int`
+        Number of processors used.
+    algorithm: `str`
+        Algorithm name, one of `ALGORITHMS`.
+    ignore_case: `bool`
+        Ignore ASCII letters case.
+    max_errors: `int`
+        Maximum number of errors, for approximate algorithms.
+    edits: `bool`
+        Count insertions and deletions as errors, besides substitutions.
+    compression: `str`
+        Compression format, one of `COMPRESSIONS`, detected when not given.
+    buffer_size: `int`
+        Number of bytes decompressed at a time, when streaming.
+    chunk_size: `int`
+        Maximum number of compressed bytes per parallel task.
+    mode: `str`
+        Query mode, one of `MODES`.
+    k: `int`
+        Number of matches returned in 'first-k' mode.
+
+    Returns:
+    --------
+    result:
+        Sequence of offsets in the decompressed data in 'all' and 'first-k'
+        modes, number of matches in 'count' mode, `bool` in 'exists' mode.
+    """
+
+    from .string_matching import compile_pattern
+
+    if compression is None:
+        compression = detect_compression(path)
+    blocks = find_blocks(path, compression) if processor_count > 1 else None
+    if blocks and len(blocks) > 1:
+        compiled = compile_pattern(pattern, algorithm, ignore_case,
+                                                        max_errors, edits)
+        return search_blocks(path, compiled.pattern, processor_count,
+                                algorithm, compiled.args, compression,
+                                blocks, chunk_size, mode, k)
+
+    streamingSM = ssm()
+    with open_compressed(path, compression) as file:
+        matches = streamingSM.search_stream(pattern, file, algorithm,
+                            buffer_size, ignore_case, max_errors, edits)
+        result = streamingSM.apply_mode(matches, mode, k)
+        matches.close()
+    return result
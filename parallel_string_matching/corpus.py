@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import glob
+import multiprocessing as mp
+from .string_matching import ParallelStringMatching as psm
+from .string_matching import StreamingStringMatching as ssm
+from .string_matching import ParallelPreprocessing as pp
+from .string_matching import DEFAULT_CHUNK_SIZE, compile_pattern
+from .compressed import MAGIC_SIZE, decompressing_reader, detect_compression
+from .compressed import detect_magic
+
+# Query searched by pool workers, set by the pool initializer
+worker_query = None
+
+def walk_corpus(source):
+    """
+    List the files of a corpus.
+
+    Parameters:
+    -----------
+    source: `str`
+        Directory, walked recursively, or glob pattern ('**' matches any
+        number of directories).
+
+    Returns:
+    --------
+    paths: `str`
+        List of file paths, in sorted order.
+    """
+
+    if os.path.isdir(source):
+        paths = list()
+        for root, directories, files in os.walk(source):
+            directories.sort()
+            for name in sorted(files):
+                paths.append(os.path.join(root, name))
+    else:
+        paths = sorted(glob.glob(source, recursive=True))
+    return [path for path in paths if os.path.isfile(path)]
+
+def plan_tasks(paths, processors, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Split a corpus in search tasks of similar size. Files larger than the
+    chunk size are split in segments, one per task, unless compressed,
+    smaller files are packed together.
+
+    Parameters:
+    -----------
+    paths: `str`
+        List of file paths.
+    processors: `int`
+        Processor count.
+    chunk_size: `int`
+        Maximum number of bytes per task.
+
+    Returns:
+    --------
+    tasks: `list`
+        List of tasks, each one a list of (path, segment, whole file)
+        pieces, in corpus order.
+    """
+
+    sizes = [os.path.getsize(path) for path in paths]
+    task_size = pp.calculate_task_size(sum(sizes), processors, chunk_size)
+
+    tasks = list()
+    batch = list()
+    batch_size = 0
+    for path, size in zip(paths, sizes):
+        if size == 0:
+            continue
+        if size > task_size and not detect_compression(path):
+            if batch:
+                tasks.append(batch)
+                batch = list()
+                batch_size = 0
+            for segment in pp.get_file_segments(path, processors, task_size):
+                tasks.append([(path, segment, False)])
+            continue
+        batch.append((path, [0, size], True))
+        batch_size += size
+        if batch_size >= task_size:
+            tasks.append(batch)
+            batch = list()
+            batch_size = 0
+    if batch:
+        tasks.append(batch)
+    return tasks
+
+def init_worker(pattern, algorithm, args, mode="all", k=1,
+                                                        ignore_case=True):
+    """
+    Pool initializer, sending the query to each worker once, instead of
+    with every task.
+
+    Parameters:
+    -----------
+    pattern: `bytes`
+        Pattern to search for.
+    algorithm: `str`
+        Algorithm name, one of `ALGORITHMS`.
+    args:
+        Extra algorithm arguments, as built by `preprocess`.
+    mode: `str`
+        Query mode, one of `MODES`.
+    k: `int`
+        Number of matches returned in 'first-k' mode.
+    ignore_case: `bool`
+        Ignore ASCII letters case, in compressed files.
+    """
+
+    global worker_query
+    worker_query = (pattern, algorithm, args, mode, k, ignore_case)
+
+def search_task(pieces):
+    """
+    Search the pieces of a task, in a pool worker. Whole files are read at
+    once, unless compressed, then decompressed as a stream, segments of
+    large files are memory-mapped.
+
+    Parameters:
+    -----------
+    pieces: `list`
+        List of (path, segment, whole file) pieces.
+
+    Returns:
+    --------
+    results: `list`
+        List of (path, result) pairs, the result being that of the query
+        mode, with file offsets, or the `OSError` raised reading the file.
+    """
+
+    pattern, algorithm, args, mode, k, ignore_case = worker_query
+    parallelSM = psm()
+    results = list()
+    for path, segment, whole in pieces:
+        try:
+            if whole:
+                with open(path, "rb") as file:
+                    data = file.read(MAGIC_SIZE)
+                    compression = detect_magic(data)
+                    if compression:
+                        file.seek(0)
+                        result = search_compressed_file(file, compression,
+                                    pattern, algorithm, ignore_case, mode, k)
+                        results.append((path, result))
+                        continue
+                    data += file.read()
+                result = parallelSM.segment_algorithm(pattern, data,
+                            [0, len(data)], algorithm, *args, mode=mode, k=k)
+            else:
+                result = parallelSM.mmap_algorithm(path, pattern, segment,
+                                        algorithm, *args, mode=mode, k=k)
+        except OSError as error:
+            result = error
+        results.append((path, result))
+    return results
+
+def search_compressed_file(file, compression, pattern, algorithm="kmp",
+                                ignore_case=True, mode="all", k=1):
+    """
+    Search a compressed file as a stream, with constant memory usage.
+
+    Parameters:
+    -----------
+    file:
+        Binary file object of compressed data.
+    compression: `str`
+        Compression format, one of `COMPRESSIONS`.
+    pattern: `bytes`
+        Pattern to search for.
+    algorithm: `str`
+        Algorithm name, one of `ALGORITHMS`.
+    ignore_case: `bool`
+        Ignore ASCII letters case.
+    mode: `str`
+        Query mode, one of `MODES`.
+    k: `int`
+        Number of matches returned in 'first-k' mode.
+
+    Returns:
+    --------
+    result:
+        Result of the query mode, with offsets in the decompressed data.
+    """
+
+    streamingSM = ssm()
+    with decompressing_reader(file, compression) as reader:
+        matches = streamingSM.search_stream(pattern, reader, algorithm,
+                                                ignore_case=ignore_case)
+        result = streamingSM.apply_mode(matches, mode, k)
+        matches.close()
+    return result
+
+def iter_results(source, pattern, processor_count=2, algorithm="kmp",
+                    ignore_case=True, chunk_size=DEFAULT_CHUNK_SIZE,
+                    mode="all", k=1):
+    """
+    Search a corpus over one pool of processes, yielding the result of
+    each file piece in corpus order, as soon as it is available. Closing
+    the generator stops the pool.
+
+    Parameters:
+    -----------
+    source: `str`
+        Directory or glob pattern.
+    pattern: `bytes`
+        Pattern to search for.
+    processor_count: `int`
+        Number of processors used.
+    algorithm: `str`
+        Algorithm name, one of `ALGORITHMS`.
+    ignore_case: `bool`
+        Ignore ASCII letters case.
+    chunk_size: `int`
+        Maximum number of bytes per task.
+    mode: `str`
+        Query mode run on each piece, one of `MODES`.
+    k: `int`
+        Number of matches returned in 'first-k' mode.
+
+    Returns:
+    --------
+    results: `generator`
+        (path, result) pairs; files that could not be read are reported
+        on stderr and skipped.
+    """
+
+    if isinstance(pattern, str):
+        pattern = pattern.encode()
+    tasks = plan_tasks(walk_corpus(source), processor_count, chunk_size)
+    args = compile_pattern(pattern, algorithm, ignore_case).args
+
+    with mp.Pool(processor_count, initializer=init_worker,
+                    initargs=(pattern, algorithm, args, mode, k,
+                                                ignore_case)) as pool:
+        for results in pool.imap(search_task, tasks):
+            for path, result in results:
+                if isinstance(result, OSError):
+                    print("Skipping {}: {}".format(path, result),
+                                                            file=sys.stderr)
+                    continue
+                yield path, result
+
+def search_corpus(source, pattern, processor_count=2, algorithm="kmp",
+                    ignore_case=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Search a corpus, streaming matches in corpus order.
+
+    Parameters:
+    -----------
+    source: `str`
+        Directory or glob pattern.
+    pattern: `bytes`
+        Pattern to search for.
+    processor_count: `int`
+        Number of processors used.
+    algorithm: `str`
+        Algorithm name, one of `ALGORITHMS`.
+    ignore_case: `bool`
+        Ignore ASCII letters case.
+    chunk_size: `int`
+        Maximum number of bytes per task.
+
+    Returns:
+    --------
+    matches: `generator`
+        (path, byte offset) pairs.
+    """
+
+    for path, matches in iter_results(source, pattern, processor_count,
+                                    algorithm, ignore_case, chunk_size):
+        for offset in matches:
+            yield path, offset
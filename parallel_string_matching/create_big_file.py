@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import random
+from bisect import bisect_left
+from collections import Counter
+
+BUFFER_SIZE = 64 * 1024 * 1024
+UNIQUE_SIZE = 64 * 1024 * 1024
+ALPHABET = "abcdefghijklmnopqrstuvwxyz "
+MODES = ("replicate", "random", "zipf")
+SIZE_UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+def create_parser():
+
+    parser = argparse.ArgumentParser(usage="create_big_file.py <options>",
+                                    description=("Create large sample text "
+                                                "files, via replicating the "
+                                                "contents of given .txt file "
+                                                "or generating synthetic "
+                                                "text")
+    )
+
+    parser.add_argument("-f",
+                        "--file",
+                        type=str,
+                        help=("Path to file tha will be replicated "
+                                "to create a large text, also used as "
+                                "vocabulary source on zipf mode"),
+                        default=os.path.join(os.path.split(os.path.abspath(__file__))[0], "../sample_txts/kafka.txt")
+    )
+
+    parser.add_argument("-t",
+                        "--times",
+                        type=int,
+                        help="How many times given file will be replicated"
+    )
+
+    parser.add_argument("-s",
+                        "--size",
+                        type=parse_size,
+                        help=("Target file size in bytes, with optional "
+                            "K, M, G or T suffix (e.g. 2G)")
+    )
+
+    parser.add_argument("-o",
+                        "--output",
+                        type=str,
+                        help=("Path to output file (defaults to "
+                            "sample_txts/<name>_<times or size>.txt)")
+    )
+
+    parser.add_argument("-m",
+                        "--mode",
+                        choices=MODES,
+                        default="replicate",
+                        help=("Replicate given file, or generate random "
+                            "characters or Zipf distributed words")
+    )
+
+    parser.add_argument("--seed",
+                        type=int,
+                        default=0,
+                        help="Random seed, same seed creates the same file"
+    )
+
+    parser.add_argument("--alphabet",
+                        type=str,
+                        default=ALPHABET,
+                        help="Characters used on random mode"
+    )
+
+    parser.add_argument("--exponent",
+                        type=float,
+                        default=1.1,
+                        help="Zipf exponent of word frequencies on zipf mode"
+    )
+
+    parser.add_argument("--pattern",
+                        type=str,
+                        help="Pattern planted in synthetic text"
+    )
+
+    parser.add_argument("--density",
+                        type=float,
+                        default=0,
+                        help=("Pattern occurrences planted at random "
+                            "positions, per MiB")
+    )
+
+    parser.add_argument("--boundary",
+                        type=parse_size,
+                        help=("Also plant the pattern across every multiple "
+                            "of this many bytes (e.g. 8M, the parallel "
+                            "chunk size)")
+    )
+
+    parser.add_argument("--unique_size",
+                        type=parse_size,
+                        default=UNIQUE_SIZE,
+                        help=("Bytes of synthetic text generated, larger "
+                            "files repeat it (default 64M)")
+    )
+
+    return parser
+
+def parse_size(value):
+    """
+    Parse a byte count, with optional binary unit suffix.
+
+    Parameters:
+    -----------
+    value: `str`
+        Byte count, e.g. '4096', '512K' or '2G'
+
+    Returns:
+    --------
+    size: `int`
+        Number of bytes.
+    """
+
+    value = value.strip().upper().rstrip("B")
+    if value and value[-1] in SIZE_UNITS:
+        return int(float(value[:-1]) * SIZE_UNITS[value[-1]])
+    return int(value)
+
+def copy_data(source, destination, offset, count):
+    """
+    Copy bytes from source file to the current position of destination
+    file, inside the kernel when the platform allows it.
+
+    Parameters:
+    -----------
+    source: `int`
+        Source file descriptor
+    destination: `int`
+        Destination file descriptor
+    offset: `int`
+        Source position where copy starts
+    count: `int`
+        Number of bytes copied
+    """
+
+    end = offset + count
+    while offset < end:
+        try:
+            if hasattr(os, "copy_file_range"):
+                copied = os.copy_file_range(source, destination,
+                                                    end - offset, offset)
+            else:
+                copied = os.sendfile(destination, source, offset,
+                                                            end - offset)
+        except OSError:
+            # Unsupported by file system or platform, copy in user space
+            copied = os.write(destination, os.pread(source,
+                                    min(end - offset, BUFFER_SIZE), offset))
+        if copied == 0:
+            raise ValueError("Unexpected end of source file")
+        offset += copied
+
+def fill_file(output, block, size):
+    """
+    Write a block of data, repeated up to the target size. The block is
+    written once, further copies are read back from the output file.
+
+    Parameters:
+    -----------
+    output: `str`
+        Path to output file
+    block: `bytes`
+        Data to be repeated
+    size: `int`
+        Target file size in bytes
+    """
+
+    with open(output, "wb", buffering=0) as file:
+        file.write(block[:size])
+        written = min(len(block), size)
+        if written < size:
+            source = os.open(output, os.O_RDONLY)
+            try:
+                while written < size:
+                    count = min(len(block), size - written)
+                    copy_data(source, file.fileno(), 0, count)
+                    written += count
+            finally:
+                os.close(source)
+
+def get_output_path(name, suffix):
+    """
+    Default output path, inside sample_txts directory.
+    """
+
+    if not os.path.exists("./sample_txts"):
+        os.makedirs("./sample_txts")
+    return os.path.join("./sample_txts", "{0}_{1}.txt".format(name, suffix))
+
+def create_large_file(input_file, replications=None, size=None, output=None):
+    """
+    Create large .txt sample files via replication of input file.
+
+    Parameters:
+    -----------
+    input_file: `str`
+        Path to input file
+    replications: `int`
+        How many times input will be replicated
+    size: `int`
+        Target file size in bytes, instead of a replication count. The last
+        copy of the input is truncated to fit.
+    output: `str`
+        Path to output file, defaults to
+        sample_txts/<input name>_<replications or size>.txt
+    """
+
+    file_name, file_extension = os.path.splitext(os.path.split(input_file)[1])
+    if output is None:
+        output = get_output_path(file_name, replications or size)
+
+    if os.path.exists(output):
+        print("File {0} already exists!".format(output))
+        return
+
+    with open(input_file, "rb") as input:
+        data = input.read()
+    if size is None:
+        size = len(data) * replications
+    if not data:
+        raise ValueError("Input file {} is empty".format(input_file))
+
+    # Whole copies of the input, so the output repeats it exactly
+    block = data * max(1, min(BUFFER_SIZE, size) // len(data))
+    fill_file(output, block, size)
+    print("File {0} created!".format(output))
+
+def random_text(rng, size, alphabet=ALPHABET):
+    """
+    Generate random characters.
+
+    Parameters:
+    -----------
+    rng: `random.Random`
+        Random number generator
+    size: `int`
+        Number of bytes
+    alphabet: `str`
+        ASCII characters used, each drawn with the same probability
+
+    Returns:
+    --------
+    text: `bytearray`
+        Random text.
+    """
+
+    alphabet = alphabet.encode("ascii")
+    table = bytes(alphabet[i % len(alphabet)] for i in range(256))
+    # Bytes past the last whole multiple of the alphabet size are dropped,
+    # so no character is mapped from one more byte value than the others
+    rejected = bytes(range(256 - 256 % len(alphabet), 256))
+    text = bytearray()
+    while len(text) < size:
+        missing = size - len(text)
+        data = rng.getrandbits(8 * missing).to_bytes(missing, "little")
+        text += data.translate(table, rejected)
+    return text
+
+def load_vocabulary(path):
+    """
+    Load words of a text file, most frequent first.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to text file
+
+    Returns:
+    --------
+    words: `bytes`
+        List of unique lowercase words.
+    """
+
+    with open(path, "rb") as file:
+        counts = Counter(file.read().lower().split())
+    return [word for word, count in counts.most_common()]
+
+def zipf_text(rng, size, words, exponent=1.1, line_length=12):
+    """
+    Generate text of words drawn with Zipf distributed frequencies, the
+    word at rank r being drawn with weight 1 / r**exponent.
+
+    Parameters:
+    -----------
+    rng: `random.Random`
+        Random number generator
+    size: `int`
+        Number of bytes
+    words: `bytes`
+        List of words, most frequent first
+    exponent: `float`
+        Zipf exponent
+    line_length: `int`
+        Number of words per line
+
+    Returns:
+    --------
+    text: `bytearray`
+        Random text.
+    """
+
+    cum_weights = list()
+    total = 0
+    for rank in range(1, len(words) + 1):
+        total += 1 / rank**exponent
+        cum_weights.append(total)
+
+    text = bytearray()
+    while len(text) < size:
+        batch = rng.choices(words, cum_weights=cum_weights,
+                                                    k=line_length * 4096)
+        text += b"\n".join(b" ".join(batch[i:i + line_length])
+                            for i in range(0, len(batch), line_length))
+        text += b"\n"
+    del text[size:]
+    return text
+
+def plant_pattern(rng, text, pattern, density=0, boundary=None, 
+                                                            repeat=False):
+    """
+    Overwrite text with pattern occurrences, none overwriting another.
+
+    Parameters:
+    -----------
+    rng: `random.Random`
+        Random number generator
+    text: `bytearray`
+        Text, modified in place
+    pattern: `bytes`
+        Pattern planted
+    density: `float`
+        Occurrences planted at random, non overlapping positions, per MiB
+    boundary: `int`
+        Also plant an occurrence across every multiple of this many bytes,
+        half of the pattern on each side
+    repeat: `bool`
+        The text is repeated in the output file, so an occurrence across
+        its end wraps around to the text start. Otherwise occurrences stop
+        where the text ends.
+
+    Returns:
+    --------
+    planted: `int`
+        Number of occurrences planted.
+    """
+
+    M = len(pattern)
+    N = len(text)
+    if M == 0 or N < M:
+        return 0
+
+    # Starts of planted occurrences, a wrapped one also before the start
+    starts = list()
+    if boundary:
+        last_edge = N if repeat else N - (M - M // 2)
+        for edge in range(boundary, last_edge + 1, boundary):
+            start = edge - M // 2
+            for j in range(M):
+                text[(start + j) % N] = pattern[j]
+            starts.append(start)
+    planted = len(starts)
+    if starts and starts[-1] + M > N:
+        starts.insert(0, starts[-1] - N)
+
+    count = int(round(density * N / 2**20))
+    for start in sorted(rng.randrange(N - M + 1) for i in range(count)):
+        i = bisect_left(starts, start)
+        if ((i == len(starts) or starts[i] - start >= M) and 
+                                    (i == 0 or start - starts[i - 1] >= M)):
+            text[start:start + M] = pattern
+            starts.insert(i, start)
+            planted += 1
+
+    return planted
+
+def create_synthetic_file(output, size, mode="random", seed=0,
+                            alphabet=ALPHABET, source=None, exponent=1.1,
+                            pattern=None, density=0, boundary=None,
+                            unique_size=UNIQUE_SIZE):
+    """
+    Create synthetic sample text, reproducible from a seed. Up to
+    `unique_size` bytes are generated, larger files repeat them with
+    kernel copies; the default repeats far less often than CPU caches fit.
+
+    Parameters:
+    -----------
+    output: `str`
+        Path to output file
+    size: `int`
+        Target file size in bytes
+    mode: `str`
+        'random' characters or 'zipf' distributed words
+    seed: `int`
+        Random seed
+    alphabet: `str`
+        Characters used on random mode
+    source: `str`
+        Path to text file words are taken from on zipf mode
+    exponent: `float`
+        Zipf exponent
+    pattern: `str`
+        Pattern planted in text
+    density: `float`
+        Pattern occurrences planted at random positions, per MiB
+    boundary: `int`
+        Plant pattern across every multiple of this many bytes
+    unique_size: `int`
+        Bytes generated before repeating
+    """
+
+    if os.path.exists(output):
+        print("File {0} already exists!".format(output))
+        return
+
+    rng = random.Random(seed)
+    length = min(size, unique_size)
+    if boundary and size > length:
+        # Repeated text must keep boundaries aligned
+        length = max(boundary, length // boundary * boundary)
+
+    if mode == "random":
+        text = random_text(rng, length, alphabet)
+    elif mode == "zipf":
+        text = zipf_text(rng, length, load_vocabulary(source), exponent)
+    else:
+        raise ValueError("Unknown mode '{}'".format(mode))
+
+    if pattern:
+        planted = plant_pattern(rng, text, pattern.encode(), density,
+                                                    boundary, size > length)
+        print("Planted {} occurrence(s) every {} bytes".format(planted,
+                                                                length))
+
+    fill_file(output, text, size)
+    print("File {0} created!".format(output))
+
+if __name__ == "__main__":
+
+    parser = create_parser()
+    args = parser.parse_args()
+
+    if args.mode == "replicate":
+        if args.times is None and args.size is None:
+            parser.error("replicate mode requires --times or --size")
+        create_large_file(args.file, args.times, args.size, args.output)
+    else:
+        if args.size is None:
+            parser.error("{} mode requires --size".format(args.mode))
+        output = args.output or get_output_path(args.mode, args.size)
+        create_synthetic_file(output, args.size, args.mode, args.seed,
+                                args.alphabet, args.file, args.exponent,
+                                args.pattern, args.density, args.boundary,
+                                args.unique_size)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+
+import time
+import threading
+import multiprocessing as mp
+from .string_matching import ParallelStringMatching as psm
+from .string_matching import MatchResults
+from .search_stats import SearchStats
+
+def estimate_pickled_size(jobs, compiled=None, processor_count=1):
+    """
+    Estimate the number of bytes pickled to send jobs to a pool of 
+    processes, without pickling the text they carry: jobs are pickled with
+    their text arguments emptied, and the length of those is added. The 
+    compiled pattern is pickled once, and counted once per process.
+
+    Parameters:
+    -----------
+    jobs: `tuple`
+        List of jobs, as given to `ParallelStringMatching.run_task`
+    compiled: `CompiledPattern`
+        Compiled pattern sent once to each process
+    processor_count: `int`
+        Number of processors used
+
+    Returns:
+    --------
+    size: `int`
+        Estimated number of pickled bytes, text characters counted as one
+        byte each.
+    """
+
+    import pickle
+
+    size = 0
+    for lower_limit, method, task, kwargs in jobs:
+        emptied = list()
+        for arg in task:
+            if isinstance(arg, (str, bytes, bytearray)):
+                size += len(arg)
+                arg = arg[:0]
+            emptied.append(arg)
+        size += len(pickle.dumps((lower_limit, method, emptied, kwargs)))
+    if compiled is not None:
+        size += processor_count * len(pickle.dumps(compiled))
+    return size
+
+def run_tasks(processor_count, parallelSM, method, tasks, mode="all", k=10,
+                                                compiled=None, stats=None):
+    """
+    Run search tasks over a pool of processes, handing them to processes
+    as they become free. In exists and first-k modes the pool is stopped 
+    as soon as enough matches are found.
+
+    Parameters:
+    -----------
+    processor_count: `int`
+        Number of processors used
+    parallelSM: `ParallelStringMatching`
+        Object whose method is run by the processes
+    method: `str`
+        Name of the search method, accepting `mode` and `k` arguments
+    tasks: `tuple`
+        List of method arguments, the segment being the third one
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    compiled: `CompiledPattern`
+        Compiled pattern sent once to each process, its tables are added
+        to the arguments of every task
+    stats: `SearchStats`
+        Search statistics, filled with pickling, pool start, search and 
+        merge times, and with the statistics of every task, when given
+
+    Returns:
+    --------
+    result:
+        `MatchResults` in text order for all mode (to be closed by the 
+        caller), list of match indices for first-k mode, number of matches
+        for count mode, `bool` for exists mode.
+    """
+
+    timed = stats is not None
+    stats = stats if timed else SearchStats()
+    parallelSM.prepare_sharing()
+    stop = mp.Event()
+    kwargs = {"mode": mode, "k": k}
+    if stats.count_comparisons:
+        kwargs["counter"] = None
+    jobs = [(task[2][0], method, task, kwargs) for task in tasks]
+    if timed:
+        stats.count("pickled_bytes_estimate", estimate_pickled_size(jobs, 
+                                                compiled, processor_count))
+
+    with stats.phase("pool"):
+        pool = mp.Pool(processor_count, initializer=psm.init_worker, 
+                                                initargs=(stop, compiled))
+    # Leaving the pool context terminates workers still searching
+    with pool:
+        imap = pool.imap if mode == "first-k" else pool.imap_unordered
+        if timed:
+            results = stats.collect(imap(parallelSM.run_timed_task, jobs))
+        else:
+            results = imap(parallelSM.run_task, jobs)
+
+        with stats.phase("search"):
+            if mode == "count":
+                return sum(count for _, count in results)
+            elif mode == "exists":
+                for _, found in results:
+                    if found:
+                        stop.set()
+                        return True
+                return False
+            elif mode == "first-k":
+                final_results = list()
+                for _, matches in results:
+                    final_results.extend(matches)
+                    if len(final_results) >= k:
+                        stop.set()
+                        break
+                return final_results[:k]
+
+            results = sorted(results, key=lambda result: result[0])
+        with stats.phase("merge"):
+            return MatchResults(matches for _, matches in results)
+
+def run_threads(thread_count, parallelSM, method, tasks, mode="all", k=10,
+                                                compiled=None, stats=None):
+    """
+    Run search tasks over a pool of threads, in the same way as `run_tasks`.
+    Results stay in this process, so they are neither pickled nor copied 
+    to shared memory. Running threads can not be terminated: in exists and
+    first-k modes they finish their task, and tasks not started yet are 
+    cancelled.
+
+    Parameters:
+    -----------
+    thread_count: `int`
+        Number of threads used
+    parallelSM: `ParallelStringMatching`
+        Object whose method is run by the threads
+    method: `str`
+        Name of the search method, accepting `mode` and `k` arguments
+    tasks: `tuple`
+        List of method arguments
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    compiled: `CompiledPattern`
+        Compiled pattern, its tables are added to the arguments of every 
+        task
+    stats: `SearchStats`
+        Search statistics, filled with search and merge times, and with 
+        the statistics of every task, when given
+
+    Returns:
+    --------
+    result:
+        `MatchResults` in text order for all mode, list of match indices 
+        for first-k mode, number of matches for count mode, `bool` for 
+        exists mode.
+    """
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    timed = stats is not None
+    stats = stats if timed else SearchStats()
+    stop = threading.Event()
+    search = getattr(parallelSM, method)
+    tables = compiled.args if compiled is not None else ()
+
+    def run(task):
+        if stop.is_set():
+            return parallelSM.apply_mode(iter(()), mode, k)
+        if not timed:
+            return search(*task, *tables, mode=mode, k=k)
+        counter = [0] if stats.count_comparisons else None
+        start = time.time()
+        result = search(*task, *tables, mode=mode, k=k, counter=counter)
+        end = time.time()
+        stats.add_task(parallelSM.task_stats(task[2], start, end, result, 
+                                                                    counter))
+        return result
+
+    with ThreadPoolExecutor(thread_count) as executor:
+        futures = [executor.submit(run, task) for task in tasks]
+        try:
+            with stats.phase("search"):
+                if mode == "count":
+                    return sum(future.result() 
+                                    for future in as_completed(futures))
+                elif mode == "exists":
+                    return any(future.result() 
+                                    for future in as_completed(futures))
+                elif mode == "first-k":
+                    final_results = list()
+                    for future in futures:
+                        final_results.extend(future.result())
+                        if len(final_results) >= k:
+                            break
+                    return final_results[:k]
+
+                parts = [future.result() for future in futures]
+            with stats.phase("merge"):
+                return MatchResults(parts)
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,1180 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import locale
+import argparse
+from contextlib import nullcontext, redirect_stdout
+from .string_matching import StringMatching as sm
+from .string_matching import load_text, load_bytes, compare_results
+from .string_matching import ParallelPreprocessing as pp
+from .string_matching import ParallelStringMatching as psm
+from .string_matching import StreamingStringMatching as ssm
+from .string_matching import DEFAULT_BUFFER_SIZE, DEFAULT_CHUNK_SIZE
+from .string_matching import SAMPLE_SIZE
+from .string_matching import ALGORITHMS, MODES, EXECUTORS, APPROXIMATE
+from .string_matching import compile_pattern, case_fold
+from .string_matching import COUNTED, CountingText
+from .search_stats import SearchStats, PROFILERS
+from .executors import run_tasks, run_threads
+import multiprocessing as mp
+
+def create_parser():
+    
+    parser = argparse.ArgumentParser(
+        usage="python3 find_string.py <options>",
+        description=("Search for a pattern inside of a text. "
+                    "Patterns may contain spaces and punctuation "
+                    "(such as 'Darth Vader'); case is ignored unless "
+                    "--case_sensitive is given. gzip, bz2, xz and zstd "
+                    "texts are decompressed on the fly (offsets in "
+                    "decompressed bytes), bgzip and multi-frame zstd ones "
+                    "in parallel with --parallel or --mmap.")
+                   
+    )
+
+    patterns = parser.add_mutually_exclusive_group(required=True)
+    patterns.add_argument("-p", "--pattern",
+                        type=str,
+                        help="Pattern to be searched for in input text"
+    )       
+    patterns.add_argument("--patterns-file",
+                        type=str,
+                        help=("File with one pattern per line, all searched "
+                            "for in a single pass (Aho-Corasick)")
+    )
+
+    parser.add_argument("-t", "--text",
+                        type=str,
+                        dest="input_path",
+                        metavar="TEXT",
+                        help="Absolute path to text where search will occur",
+                        required=True
+    )
+
+    parser.add_argument("-a", "--algorithm",
+                        choices=ALGORITHMS + ("auto",),
+                        default="kmp",
+                        help=("Algorithm used for string search, auto picks "
+                            "the fastest for the pattern and reports it")
+    )              
+
+    parser.add_argument("--max-errors",
+                        type=int,
+                        default=0,
+                        help=("Find approximate matches, with up to this "
+                            "many inserted, deleted or substituted "
+                            "characters (shift_or or bndm algorithms; "
+                            "sequential, parallel, mmap or stream search). "
+                            "Every index where a match starts is reported")
+    )
+    parser.add_argument("--mismatch_only",
+                        action="store_false",
+                        dest="edits",
+                        help=("Count only substituted characters as errors "
+                            "in approximate matching (k-mismatch)")
+    )
+    parser.add_argument("--mode",
+                        choices=MODES,
+                        default="all",
+                        help=("Query mode: all matches, match count only, "
+                            "whether the pattern exists, or the first K "
+                            "matches; exists and first-k stop searching as "
+                            "soon as enough matches are found")
+    )
+    parser.add_argument("-k",
+                        type=int,
+                        help="Number of matches returned in first-k mode",
+                        default=10
+    )
+    parser.add_argument("--parallel",
+                        action="store_true")
+    #                     choices=("sequential", "parallel"),
+    #                     default="parallel",
+    #                     help="Execution mode"
+    # )
+    parser.add_argument("--executor",
+                        choices=EXECUTORS + ("auto",),
+                        default="process",
+                        help=("Run parallel search on processes, or on "
+                            "threads sharing the loaded text without "
+                            "pickling, scanned in place with --bytes or by "
+                            "find and regex (other engines copy their "
+                            "range of a text). Threads only search in parallel "
+                            "with engines releasing the GIL (numpy) or on a "
+                            "free-threaded Python, auto picks them then")
+    )
+    parser.add_argument("--mmap",
+                        action="store_true",
+                        dest="use_mmap",
+                        help=("Parallel search where each worker memory-maps "
+                            "the file and scans its own byte range "
+                            "(offsets in bytes)")
+    )
+    parser.add_argument("--stream",
+                        action="store_true",
+                        help=("Sequential search reading the file in "
+                            "fixed-size buffers, with constant memory usage "
+                            "(offsets in bytes)")
+    )
+    parser.add_argument("--buffer_size",
+                        type=int,
+                        help="Buffer size in bytes used in streaming search",
+                        default=DEFAULT_BUFFER_SIZE
+    )
+    parser.add_argument("--corpus",
+                        action="store_true",
+                        help=("Search every file under a directory, or "
+                            "matching a glob pattern given as text (e.g. "
+                            "'books/**/*.txt'), over one pool of processes; "
+                            "matches are printed as path:offset (offsets "
+                            "in bytes). Implied when text is a directory")
+    )
+    parser.add_argument("--incremental",
+                        action="store_true",
+                        help=("Search only data appended since the last "
+                            "incremental search of the same pattern(s), "
+                            "resuming from a checkpoint file; the whole file "
+                            "is searched again if it was truncated, "
+                            "rewritten or rotated (offsets in bytes)")
+    )
+    parser.add_argument("--checkpoint",
+                        type=str,
+                        help=("Checkpoint file used by incremental search "
+                            "(defaults to <text>.checkpoint.json)")
+    )
+    parser.add_argument("--follow",
+                        action="store_true",
+                        help=("Incremental search that keeps following the "
+                            "file as it grows, until interrupted")
+    )
+    parser.add_argument("--interval",
+                        type=float,
+                        help="Seconds between scans when following a file",
+                        default=1.0
+    )
+    parser.add_argument("--index",
+                        type=str,
+                        help=("Answer the query from a suffix array index "
+                            "built by suffix_index.py (case sensitive, "
+                            "offsets in bytes)")
+    )
+    parser.add_argument("--verify",
+                        action="store_true",
+                        help=("Compare parallel results with a sequential "
+                            "KMP search of the whole text")
+    )
+    parser.add_argument("--chunk_size",
+                        type=int,
+                        help=("Split parallel input in chunks of this many "
+                            "characters, scheduled dynamically over "
+                            "processors (e.g. {}), instead of one segment "
+                            "per processor").format(DEFAULT_CHUNK_SIZE)
+    )
+    parser.add_argument("--case_sensitive",
+                        action="store_false",
+                        dest="ignore_case",
+                        default=None,
+                        help=("Match upper and lower case exactly, instead "
+                            "of ignoring case (index search is always case "
+                            "sensitive)")
+    )
+    parser.add_argument("--bytes",
+                        action="store_true",
+                        dest="use_bytes",
+                        help=("Load the file as raw bytes in one read, "
+                            "instead of decoding it (offsets in bytes); only "
+                            "ASCII case is ignored, so it falls back to text "
+                            "loading when the encoding or pattern requires it")
+    )
+    parser.add_argument("--encoding",
+                        type=str,
+                        help=("Text encoding of the file (defaults to the "
+                            "platform one)")
+    )
+    parser.add_argument("--processor_count",
+                        type=int,
+                        help="Number of processors used in parallel execution",
+                        default=2
+    )                   
+    parser.add_argument("--stats",
+                        choices=("text", "json"),
+                        help=("Print the time of each search phase (load, "
+                            "case fold, compile, segment, pool start, "
+                            "search, merge), an estimate of the bytes "
+                            "pickled for workers, "
+                            "result transfer time, and per worker tasks, "
+                            "time, characters scanned, matches and "
+                            "comparisons; as json, progress and results "
+                            "go to stderr")
+    )
+    parser.add_argument("--profile",
+                        choices=PROFILERS,
+                        nargs="+",
+                        default=(),
+                        help=("Profile function calls (cprofile) or memory "
+                            "allocations (tracemalloc) of the main process, "
+                            "or count characters read by the pure Python "
+                            "engines (comparisons, slower); reported with "
+                            "the --stats output, as text by default")
+    )
+
+    return parser
+
+def main(input_path, pattern, *, processor_count=2, 
+                            algorithm="kmp", parallel=True, use_mmap=False,
+                            stream=False, buffer_size=DEFAULT_BUFFER_SIZE,
+                            verify=False, patterns_file=None, index=None,
+                            chunk_size=None, mode="all", k=10,
+                            use_bytes=False, encoding=None,
+                            ignore_case=None, corpus=False, 
+                            incremental=False, checkpoint=None, 
+                            follow=False, interval=1.0, executor="process",
+                            max_errors=0, edits=True, stats=None, 
+                            profile=()):
+    """
+    Search for pattern in input text.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    pattern: `str`
+        Pattern to look for in text
+    processor_count: `int`
+        Number of processors used in parallel execution
+    algorithm: `str`
+        Algorithm used for string search, one of `ALGORITHMS` or 'auto'
+    parallel: `bool`
+        Execute search with parallel processes
+    use_mmap: `bool`
+        Execute parallel search over a memory-mapped file
+    stream: `bool`
+        Execute sequential search reading the file in buffers
+    buffer_size: `int`
+        Buffer size in bytes used in streaming search
+    verify: `bool`
+        Compare parallel results with sequential KMP search
+    patterns_file: `str`
+        Path to file with patterns searched for instead of `pattern`
+    index: `str`
+        Path to suffix array index of input text
+    chunk_size: `int`
+        Chunk size used for dynamic scheduling of parallel search
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    use_bytes: `bool`
+        Load text as raw bytes, when encoding and pattern allow it
+    encoding: `str`
+        Text encoding of input file
+    ignore_case: `bool`
+        Ignore case when matching, by default in every search but the case
+        sensitive index search
+    corpus: `bool`
+        Search every file of a directory or glob pattern
+    incremental: `bool`
+        Search only data appended since the last incremental search
+    checkpoint: `str`
+        Path to checkpoint file of incremental search
+    follow: `bool`
+        Keep searching data appended to the file, until interrupted
+    interval: `float`
+        Seconds between scans when following the file
+    executor: `str`
+        Executor of parallel search, one of `EXECUTORS` or 'auto'
+    max_errors: `int`
+        Maximum number of errors in approximate matches
+    edits: `bool`
+        Count insertions, deletions and substitutions as errors, instead 
+        of substitutions only
+    stats: `str`
+        Print search statistics, as 'text' or 'json'
+    profile: `str`
+        Profilers run during the search, from `PROFILERS`
+
+    Returns:
+    --------
+    stats: `SearchStats`
+        Search statistics, if stats or profilers were requested. Phases 
+        and tasks are timed in sequential, parallel and mmap search, other
+        searches are only timed as a whole.
+    """
+
+    # Progress goes to stderr when stdout carries the JSON document
+    output = redirect_stdout(sys.stderr) if stats == "json" \
+                                                else nullcontext()
+    with output:
+        if ignore_case is None:
+            # Case is ignored by default, the index only matches it exactly
+            ignore_case = not index
+        corpus = corpus or os.path.isdir(input_path)
+        compression = None
+        if not corpus and os.path.isfile(input_path):
+            from .compressed import detect_compression
+            compression = detect_compression(input_path)
+        if algorithm == "auto" and pattern:
+            sample = None
+            if os.path.isfile(input_path) and not compression:
+                with open(input_path, encoding=encoding, 
+                                                errors="replace") as file:
+                    sample = file.read(SAMPLE_SIZE)
+            algorithm, reason = sm().choose_algorithm(pattern, ignore_case, 
+                                        use_mmap or corpus, max_errors, sample)
+            print("auto selected {} ({})".format(algorithm, reason))
+
+        if compression and (incremental or follow or index or patterns_file):
+            print("Compressed input is searched sequentially, in "
+                                        "parallel, with mmap or streamed!")
+            return
+
+        if max_errors:
+            if incremental or follow or corpus or index or patterns_file:
+                print("Approximate search runs sequential, parallel, mmap or "
+                                                                    "stream!")
+                return
+            if algorithm not in APPROXIMATE:
+                print("Approximate search requires one of: {}".format(
+                                                        ", ".join(APPROXIMATE)))
+                return
+            if max_errors >= len(pattern):
+                print("Maximum errors must be lower than the pattern length!")
+                return
+
+        if patterns_file:
+            from .multi_pattern import load_patterns
+        search_stats = SearchStats(profile) if stats or profile else None
+        with search_stats.measure() if search_stats else nullcontext():
+            if incremental or follow:
+                patterns = (load_patterns(patterns_file) if patterns_file 
+                                                                else [pattern])
+                search_incremental(input_path, patterns, algorithm, buffer_size,
+                                    mode, encoding, ignore_case, checkpoint, 
+                                    follow, interval)
+            elif corpus:
+                search_corpus(input_path, pattern, processor_count, algorithm,
+                                    chunk_size, mode, k, encoding, ignore_case)
+            elif index:
+                search_index(input_path, pattern, index, mode, k, ignore_case)
+            elif patterns_file:
+                search_patterns(input_path, load_patterns(patterns_file), 
+                                        processor_count, parallel, ignore_case)
+            elif stream:
+                search_stream(input_path, pattern, algorithm, buffer_size, 
+                                        mode, k, encoding, ignore_case, 
+                                        max_errors, edits)
+            elif compression:
+                search_compressed(input_path, pattern, processor_count 
+                                        if parallel or use_mmap else 1, 
+                                        algorithm, compression, buffer_size, 
+                                        chunk_size, mode, k, encoding, 
+                                        ignore_case, max_errors, edits)
+            elif use_mmap:
+                search_mmap(input_path, pattern, processor_count, algorithm, 
+                                        verify, chunk_size, mode, k, encoding, 
+                                        ignore_case, max_errors, edits, 
+                                        search_stats)
+            elif parallel:    
+                search_parallel(input_path, pattern, processor_count, algorithm,
+                                        verify, chunk_size, mode, k, use_bytes,
+                                        encoding, ignore_case, executor,
+                                        max_errors, edits, search_stats)
+            else:
+                search_sequential(input_path, pattern, algorithm, mode, k, 
+                                        use_bytes, encoding, ignore_case,
+                                        max_errors, edits, search_stats)
+
+    if search_stats is not None:
+        search_stats.report(stats or "text")
+    return search_stats
+
+def encode_pattern(pattern, encoding=None, ignore_case=True):
+    """
+    Encode pattern for a search over raw file bytes.
+
+    Parameters:
+    -----------
+    pattern: `str`
+        Pattern to look for in text
+    encoding: `str`
+        Text encoding of input file, defaults to the platform one
+    ignore_case: `bool`
+        Ignore case when matching
+
+    Returns:
+    --------
+    pattern: `bytes`
+        Encoded pattern, or `None` if a bytes search could miss matches of
+        a text search: the encoding is not ASCII compatible, or case is 
+        ignored and the pattern has non-ASCII characters with case (only 
+        ASCII case is folded on bytes).
+    """
+
+    encoding = encoding or locale.getpreferredencoding(False)
+    sample = "azAZ09 \n"
+    if sample.encode(encoding) != sample.encode("ascii"):
+        print("Encoding {} is not ASCII compatible!".format(encoding))
+        return None
+    if ignore_case and any(ord(c) > 127 and c.lower() != c.upper() 
+                                                        for c in pattern):
+        print("Pattern has non-ASCII characters with case!")
+        return None
+    try:
+        return pattern.encode(encoding)
+    except UnicodeEncodeError:
+        print("Pattern can not be encoded as {}!".format(encoding))
+        return None
+
+def load_input(input_path, pattern, use_bytes=False, encoding=None,
+                                                        ignore_case=True):
+    """
+    Load input text, as bytes when requested and possible.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    pattern: `str`
+        Pattern to look for in text
+    use_bytes: `bool`
+        Load text as raw bytes
+    encoding: `str`
+        Text encoding of input file
+    ignore_case: `bool`
+        Ignore case when matching
+
+    Returns:
+    --------
+    text: `str` or `bytearray`
+        Input text, as in the file.
+    pattern: `str` or `bytes`
+        Pattern, encoded when text is loaded as bytes.
+    """
+
+    if use_bytes:
+        encoded = encode_pattern(pattern, encoding, ignore_case)
+        if encoded is not None:
+            return load_bytes(input_path, lowercase=False), encoded
+        print("Falling back to text loading!")
+    return load_text(input_path, lowercase=False, encoding=encoding), pattern
+    
+def search_sequential(input_path, pattern, algorithm="kmp", mode="all", k=10,
+                        use_bytes=False, encoding=None, ignore_case=True,
+                        max_errors=0, edits=True, stats=None):
+    """
+    Search for pattern in input text, sequentially.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    pattern: `str`
+        Pattern to look for in text
+    algorithm: `str`
+        Algorithm used for string search, one of `ALGORITHMS`
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    use_bytes: `bool`
+        Load text as raw bytes, when encoding and pattern allow it
+    encoding: `str`
+        Text encoding of input file
+    ignore_case: `bool`
+        Ignore case when matching
+    max_errors: `int`
+        Maximum number of errors in approximate matches
+    edits: `bool`
+        Count insertions and deletions as errors, besides substitutions
+    stats: `SearchStats`
+        Search statistics, filled when given
+    """
+
+    stats = stats if stats is not None else SearchStats()
+    with stats.phase("load"):
+        encoded = None
+        if algorithm == "numpy":
+            encoded = encode_pattern(pattern, encoding, ignore_case)
+            if encoded is None:
+                print("Falling back to text loading!")
+        if encoded is not None:
+            # Bytes loaded straight into an array, offsets are in bytes
+            from .numpy_backend import load_array
+            text = load_array(input_path, lowercase=False)
+            pattern = encoded
+        else:
+            text, pattern = load_input(input_path, pattern, use_bytes and 
+                                algorithm != "numpy", encoding, ignore_case)
+    print("File loaded! Time elapsed: {}".format(stats.phases["load"]))
+
+    print("{} sequential selected!".format(algorithm))
+    if ignore_case:
+        # Timed apart from compilation, which reuses the cached fold
+        with stats.phase("fold"):
+            case_fold(pattern)
+    with stats.phase("compile"):
+        compiled = compile_pattern(pattern, algorithm, ignore_case, 
+                                                        max_errors, edits)
+    searched = text
+    if stats.count_comparisons and algorithm in COUNTED:
+        searched = CountingText(text)
+    start = time.time()
+    with stats.phase("search"):
+        results = compiled.search(searched, mode, k)
+    end = time.time()
+    stats.add_task(psm.task_stats([0, len(text)], start, end, results, 
+                                [searched.reads] if searched is not text 
+                                                                else None))
+    print("{} -> time elapsed: ".format(algorithm), stats.phases["search"])
+    report_results(results, mode)
+
+def search_parallel(input_path, pattern, processor_count, algorithm="kmp",
+                        verify=False, chunk_size=None, mode="all", k=10,
+                        use_bytes=False, encoding=None, ignore_case=True,
+                        executor="process", max_errors=0, edits=True, 
+                        stats=None):
+    """
+    Search for pattern in input text, using parallel processes or threads.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    pattern: `str`
+        Pattern to look for in text
+    processor_count: `int`
+        Number of processors used
+    algorithm: `str`
+        Algorithm used for string search, one of `ALGORITHMS`
+    verify: `bool`
+        Compare results with sequential KMP search
+    chunk_size: `int`
+        Split input in chunks of this size, scheduled dynamically
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    use_bytes: `bool`
+        Load text as raw bytes, when encoding and pattern allow it
+    encoding: `str`
+        Text encoding of input file
+    ignore_case: `bool`
+        Ignore case when matching
+    executor: `str`
+        Run tasks on 'process' or 'thread' workers, or 'auto' to choose by
+        algorithm
+    max_errors: `int`
+        Maximum number of errors in approximate matches, segments overlap 
+        by as many more characters
+    edits: `bool`
+        Count insertions and deletions as errors, besides substitutions
+    stats: `SearchStats`
+        Search statistics, filled when given
+    """
+
+    chunk_size = pp.choose_chunk_size(chunk_size, mode)
+
+    parallelSM = psm()
+    if executor == "auto":
+        executor, reason = parallelSM.choose_executor(algorithm)
+        print("auto selected {} executor ({})".format(executor, reason))
+
+    timer = stats if stats is not None else SearchStats()
+    start = time.time()
+    with timer.phase("load"):
+        text, pattern = load_input(input_path, pattern, use_bytes, encoding,
+                                                                ignore_case)
+    if ignore_case:
+        with timer.phase("fold"):
+            case_fold(pattern)
+    with timer.phase("compile"):
+        compiled = compile_pattern(pattern, algorithm, ignore_case, 
+                                                        max_errors, edits)
+    with timer.phase("segment"):
+        if executor == "thread":
+            # Threads share the loaded text, scanning it between segment 
+            # bounds, in place for bytes or bounded engines
+            if chunk_size:
+                segments = pp.calculate_chunk_size(len(text), chunk_size)
+            else:
+                segments = pp.calculate_segment_size(len(text), 
+                                                            processor_count)
+            method = "buffer_algorithm"
+            tasks = [(text, pattern, seg, algorithm) for seg in segments]
+        else:
+            overlap = parallelSM.get_overlap(pattern, algorithm, 
+                                                            *compiled.args)
+            sliced_text, segments = pp.get_text_segments(text, 
+                                processor_count, overlap + 1, chunk_size)
+            method = "segment_algorithm"
+            tasks = [(pattern, x, y, algorithm) 
+                        for x, y in zip(sliced_text, segments)]
+    end = time.time()
+    print("File loaded and sliced! Time elapsed: {}".format(end - start))
+
+    print("{} parallel with {} {}(s) selected!".format(algorithm, 
+                                                processor_count, executor))
+    start = time.time()
+    if executor == "thread":
+        final_results = run_threads(processor_count, parallelSM, method, 
+                                            tasks, mode, k, compiled, stats)
+    else:
+        final_results = run_tasks(processor_count, parallelSM, method, 
+                                            tasks, mode, k, compiled, stats)
+    end = time.time()
+    print("{} parallel -> time elapsed: ".format(algorithm), end - start)
+    report_results(final_results, mode)
+
+    if verify and mode == "all":
+        verify_results(final_results, pattern, text, ignore_case, 
+                                                        max_errors, edits)
+    if mode == "all":
+        final_results.close()
+
+def report_results(results, mode="all"):
+    """
+    Print search results.
+
+    Parameters:
+    -----------
+    results:
+        Search result for the query mode
+    mode: `str`
+        Query mode, one of `MODES`
+    """
+
+    if mode == "exists":
+        print("Pattern found: ", results)
+    elif mode == "count":
+        print("Matches found: ", results)
+    else:
+        print("Matches found: ", len(results))
+        if mode == "first-k":
+            print("Match indices: ", results)
+
+def search_stream(input_path, pattern, algorithm="kmp",
+                        buffer_size=DEFAULT_BUFFER_SIZE, mode="all", k=10,
+                        encoding=None, ignore_case=True, max_errors=0, 
+                        edits=True):
+    """
+    Search for pattern in input file, sequentially reading it in buffers.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    pattern: `str`
+        Pattern to look for in text
+    algorithm: `str`
+        Algorithm used for string search, one of `ALGORITHMS`
+    buffer_size: `int`
+        Number of bytes read at a time
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    encoding: `str`
+        Text encoding of input file, the pattern is encoded with it
+    ignore_case: `bool`
+        Ignore case when matching
+    max_errors: `int`
+        Maximum number of errors in approximate matches
+    edits: `bool`
+        Count insertions, deletions and substitutions as errors, instead 
+        of substitutions only
+    """
+
+    streamingSM = ssm()
+
+    print("{} streaming with {} byte buffers selected!".format(
+                                                    algorithm, buffer_size))
+    start = time.time()
+    matches = streamingSM.search_file(pattern, input_path, algorithm, 
+                                        buffer_size, ignore_case, max_errors,
+                                        edits, encoding)
+    results = streamingSM.apply_mode(matches, mode, k)
+    matches.close()
+    end = time.time()
+    print("Streaming -> time elapsed: ", end - start)
+    report_results(results, mode)
+
+def search_compressed(input_path, pattern, processor_count=1, 
+                        algorithm="kmp", compression="gzip", 
+                        buffer_size=DEFAULT_BUFFER_SIZE, chunk_size=None,
+                        mode="all", k=10, encoding=None, ignore_case=True,
+                        max_errors=0, edits=True):
+    """
+    Search for pattern in a compressed file, decompressing it on the fly.
+    bgzip files and multi-frame zstd files are searched in parallel, one
+    run of blocks per task, other files are decompressed as a stream.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to compressed text
+    pattern: `str`
+        Pattern to look for in text
+    processor_count: `int`
+        Number of processors used, 1 to decompress as a stream
+    algorithm: `str`
+        Algorithm used for string search, one of `ALGORITHMS`
+    compression: `str`
+        Compression format, one of `COMPRESSIONS`
+    buffer_size: `int`
+        Number of bytes decompressed at a time, when streaming
+    chunk_size: `int`
+        Maximum number of compressed bytes searched per task
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    encoding: `str`
+        Text encoding of input file
+    ignore_case: `bool`
+        Ignore case when matching
+    max_errors: `int`
+        Maximum number of errors in approximate matches
+    edits: `bool`
+        Count insertions, deletions and substitutions as errors, instead 
+        of substitutions only
+    """
+
+    from .compressed import find_blocks, search_blocks, open_compressed
+
+    pattern = encode_pattern(pattern, encoding, ignore_case)
+    if pattern is None:
+        print("Compressed search runs on raw bytes, pattern not searched!")
+        return
+
+    start = time.time()
+    blocks = find_blocks(input_path, compression) if processor_count > 1 \
+                                                                else None
+    if blocks and len(blocks) > 1:
+        print("{} {} blocks parallel with {} core(s) selected!".format(
+                                    algorithm, compression, processor_count))
+        compiled = compile_pattern(pattern, algorithm, ignore_case, 
+                                                        max_errors, edits)
+        results = search_blocks(input_path, pattern, processor_count, 
+                                algorithm, compiled.args, compression, 
+                                blocks, chunk_size or DEFAULT_CHUNK_SIZE, 
+                                mode, k)
+    else:
+        print("{} {} streaming with {} byte buffers selected!".format(
+                                        algorithm, compression, buffer_size))
+        streamingSM = ssm()
+        with open_compressed(input_path, compression) as file:
+            matches = streamingSM.search_stream(pattern, file, algorithm,
+                                        buffer_size, ignore_case, max_errors,
+                                        edits)
+            results = streamingSM.apply_mode(matches, mode, k)
+            matches.close()
+    end = time.time()
+    print("Compressed -> time elapsed: ", end - start)
+    report_results(results, mode)
+
+def search_mmap(input_path, pattern, processor_count, algorithm="kmp",
+                        verify=False, chunk_size=None, mode="all", k=10,
+                        encoding=None, ignore_case=True, max_errors=0, 
+                        edits=True, stats=None):
+    """
+    Search for pattern in input file, using parallel processes that 
+    memory-map the file and scan their own byte range.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    pattern: `str`
+        Pattern to look for in text
+    processor_count: `int`
+        Number of processors used
+    algorithm: `str`
+        Algorithm used for string search, one of `ALGORITHMS`
+    verify: `bool`
+        Compare results with sequential KMP search
+    chunk_size: `int`
+        Split input in chunks of this size, scheduled dynamically
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    encoding: `str`
+        Text encoding of input file, used to encode the pattern
+    ignore_case: `bool`
+        Ignore case when matching
+    max_errors: `int`
+        Maximum number of errors in approximate matches
+    edits: `bool`
+        Count insertions and deletions as errors, besides substitutions
+    stats: `SearchStats`
+        Search statistics, filled when given
+    """
+
+    encoded = encode_pattern(pattern, encoding, ignore_case)
+    if encoded is None:
+        print("Falling back to parallel text search!")
+        search_parallel(input_path, pattern, processor_count, algorithm,
+                            verify, chunk_size, mode, k, False, encoding,
+                            ignore_case, "process", max_errors, edits, stats)
+        return
+    pattern = encoded
+
+    chunk_size = pp.choose_chunk_size(chunk_size, mode)
+
+    parallelSM = psm()
+
+    timer = stats if stats is not None else SearchStats()
+    start = time.time()
+    with timer.phase("segment"):
+        segments = pp.get_file_segments(input_path, processor_count, 
+                                                                chunk_size)
+    if ignore_case:
+        with timer.phase("fold"):
+            case_fold(pattern)
+    with timer.phase("compile"):
+        compiled = compile_pattern(pattern, algorithm, ignore_case, 
+                                                        max_errors, edits)
+    end = time.time()
+    print("File segmented! Time elapsed: {}".format(end - start))
+
+    print("{} mmap parallel with {} core(s) selected!".format(
+                                                algorithm, processor_count))
+    start = time.time()
+    final_results = run_tasks(processor_count, parallelSM, "mmap_algorithm",
+                            [(input_path, pattern, seg, algorithm)
+                            for seg in segments],
+                            mode, k, compiled, stats)
+    end = time.time()
+    print("mmap parallel -> time elapsed: ", end - start)
+    report_results(final_results, mode)
+
+    if verify and mode == "all":
+        with open(input_path, "rb") as file:
+            verify_results(final_results, pattern, file.read(), ignore_case,
+                                                        max_errors, edits)
+    if mode == "all":
+        final_results.close()
+
+def search_corpus(source, pattern, processor_count, algorithm="kmp",
+                        chunk_size=None, mode="all", k=10, encoding=None,
+                        ignore_case=True):
+    """
+    Search for pattern in every file of a corpus, using one pool of 
+    parallel processes. Small files are searched together in one task, 
+    large files are split in segments.
+
+    Parameters:
+    -----------
+    source: `str`
+        Directory or glob pattern
+    pattern: `str`
+        Pattern to look for in text
+    processor_count: `int`
+        Number of processors used
+    algorithm: `str`
+        Algorithm used for string search, one of `ALGORITHMS`
+    chunk_size: `int`
+        Maximum number of bytes searched per task
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    encoding: `str`
+        Text encoding of input files
+    ignore_case: `bool`
+        Ignore case when matching
+    """
+
+    from .corpus import iter_results
+
+    pattern = encode_pattern(pattern, encoding, ignore_case)
+    if pattern is None:
+        print("Corpus search runs on raw file bytes, pattern not searched!")
+        return
+
+    print("{} corpus parallel with {} core(s) selected!".format(
+                                                algorithm, processor_count))
+    start = time.time()
+    results = iter_results(source, pattern, processor_count, algorithm,
+                            ignore_case, chunk_size or DEFAULT_CHUNK_SIZE,
+                            mode, k)
+    matches = 0
+    files = set()
+    found = list()
+    for path, offsets in results:
+        if mode == "exists":
+            if offsets:
+                found.append(path)
+                break
+            continue
+        if mode == "count":
+            matches += offsets
+            if offsets:
+                files.add(path)
+            continue
+        if offsets:
+            files.add(path)
+        matches += len(offsets)
+        if mode == "all":
+            for offset in offsets:
+                print("{}:{}".format(path, offset))
+        elif mode == "first-k":
+            found.extend((path, offset) for offset in offsets)
+            if len(found) >= k:
+                break
+    results.close()
+    end = time.time()
+    print("Corpus parallel -> time elapsed: ", end - start)
+
+    if mode == "exists":
+        report_results(bool(found), mode)
+    elif mode == "first-k":
+        print("Matches found: ", len(found[:k]))
+        print("Match indices: ", found[:k])
+    else:
+        print("Matches found: {} in {} file(s)".format(matches, len(files)))
+
+def search_incremental(input_path, patterns, algorithm="kmp",
+                        buffer_size=DEFAULT_BUFFER_SIZE, mode="all", 
+                        encoding=None, ignore_case=True, checkpoint=None, 
+                        follow=False, interval=1.0):
+    """
+    Search for patterns in data appended to input file since the last
+    incremental search, as recorded in a checkpoint file.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    patterns: `str`
+        List of patterns to look for in text, several patterns are searched
+        for in a single pass (Aho-Corasick)
+    algorithm: `str`
+        Algorithm used for a single pattern, one of `ALGORITHMS`
+    buffer_size: `int`
+        Number of bytes read at a time
+    mode: `str`
+        Query mode, only 'count' changes the output: matches are not printed
+    encoding: `str`
+        Text encoding of input file
+    ignore_case: `bool`
+        Ignore case when matching
+    checkpoint: `str`
+        Path to checkpoint file
+    follow: `bool`
+        Keep searching data appended to the file, until interrupted
+    interval: `float`
+        Seconds between scans when following the file
+    """
+
+    from .incremental import IncrementalSearch
+
+    encoded = [encode_pattern(p, encoding, ignore_case) for p in patterns]
+    if None in encoded:
+        print("Incremental search runs on raw file bytes, "
+                                                "pattern not searched!")
+        return
+    if algorithm == "auto":
+        # Only a patterns file is left unresolved
+        algorithm, reason = sm().choose_algorithm(encoded[0], ignore_case)
+
+    search = IncrementalSearch(input_path, encoded, algorithm, ignore_case,
+                                                    checkpoint, buffer_size)
+    if follow:
+        print("Following {}, interrupt to stop".format(input_path))
+        try:
+            for path, pattern, offset in search.follow(interval):
+                print_match(path, pattern, offset, len(encoded), mode)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    start = time.time()
+    for path, pattern, offset in search.scan():
+        print_match(path, pattern, offset, len(encoded), mode)
+    end = time.time()
+    print("Incremental -> time elapsed: ", end - start)
+    print("Bytes scanned: ", search.scanned)
+    print("Matches found: ", search.found)
+
+def print_match(path, pattern, offset, pattern_count=1, mode="all"):
+    """
+    Print a match of incremental search, as path:offset, followed by the
+    pattern when several are searched for.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to file where the match was found
+    pattern: `bytes`
+        Pattern matched
+    offset: `int`
+        File offset of the match
+    pattern_count: `int`
+        Number of patterns searched for
+    mode: `str`
+        Query mode, nothing is printed in 'count' mode
+    """
+
+    if mode == "count":
+        return
+    if pattern_count > 1:
+        print("{}:{} {}".format(path, offset, 
+                                        pattern.decode(errors="replace")))
+    else:
+        print("{}:{}".format(path, offset))
+
+def search_patterns(input_path, patterns, processor_count=2, parallel=True,
+                                                        ignore_case=True):
+    """
+    Search for multiple patterns in input text, in a single pass.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    patterns: `str`
+        List of patterns to look for in text
+    processor_count: `int`
+        Number of processors used in parallel execution
+    parallel: `bool`
+        Execute search with parallel processes
+    ignore_case: `bool`
+        Ignore case when matching
+    """
+
+    from . import multi_pattern
+
+    start = time.time()
+    text = load_text(input_path, lowercase=False)
+    end = time.time()
+    print("File loaded! Time elapsed: {}".format(end - start))
+
+    start = time.time()
+    matcher = multi_pattern.compile_matcher(patterns, ignore_case, parallel)
+    end = time.time()
+    print("Automaton for {} pattern(s) built! Time elapsed: {}".format(
+                                                len(patterns), end - start))
+
+    if parallel:
+        print("Aho-Corasick parallel with {} core(s) selected!".format(
+                                                            processor_count))
+        sliced_text, segments = pp.get_text_segments(text, processor_count,
+                                                        matcher.max_length)
+        # The automaton is sent once per process, tasks only hold segments
+        with mp.Pool(processor_count, initializer=multi_pattern.init_worker,
+                                                initargs=(matcher,)) as pool:
+            start = time.time()
+            results = pool.starmap(multi_pattern.search_segment, 
+                                    zip(sliced_text, segments))
+            end = time.time()
+
+        final_results = {pattern: list() for pattern in matcher.patterns}
+        for result in results:
+            for pattern, matches in result.items():
+                final_results[pattern].extend(matches)
+    else:
+        print("Aho-Corasick sequential selected!")
+        start = time.time()
+        final_results = matcher.search(text)
+        end = time.time()
+    print("Aho-Corasick -> time elapsed: ", end - start)
+
+    for pattern, matches in final_results.items():
+        print("Matches found for '{}': ".format(pattern), len(matches))
+
+def search_index(input_path, pattern, index_path, mode="all", k=10,
+                                                        ignore_case=False):
+    """
+    Search for pattern using a prebuilt suffix array index.
+
+    Parameters:
+    -----------
+    input_path: `str`
+        Absolute path to text
+    pattern: `str`
+        Pattern to look for in text
+    index_path: `str`
+        Path to suffix array index of input text
+    mode: `str`
+        Query mode, one of `MODES`
+    k: `int`
+        Number of matches returned in first-k mode
+    ignore_case: `bool`
+        Ignore case when matching, not supported by the index
+    """
+
+    from .suffix_index import SuffixArrayIndex
+
+    if ignore_case:
+        print("Suffix array index search is case sensitive!")
+
+    start = time.time()
+    index = SuffixArrayIndex(input_path, index_path)
+    end = time.time()
+    print("Index loaded! Time elapsed: {}".format(end - start))
+
+    start = time.time()
+    if mode == "count":
+        results = index.count(pattern)
+    elif mode == "exists":
+        results = index.count(pattern) > 0
+    else:
+        results = index.locate(pattern)
+        if mode == "first-k":
+            results = results[:k]
+    end = time.time()
+    print("Suffix array -> time elapsed: ", end - start)
+    report_results(results, mode)
+
+def verify_results(results, pattern, text, ignore_case=True, max_errors=0,
+                                                                edits=True):
+    """
+    Compare parallel results with a sequential KMP search of the whole text,
+    or a Shift-Or search for approximate matches.
+
+    Parameters:
+    -----------
+    results: `int`
+        List of match indices found by parallel search
+    pattern: `str`
+        Pattern to look for in text
+    text: `str`
+        Whole input text
+    ignore_case: `bool`
+        Ignore case when matching
+    max_errors: `int`
+        Maximum number of errors in approximate matches
+    edits: `bool`
+        Count insertions and deletions as errors, besides substitutions
+    """
+
+    sequentialSM = sm()
+    if max_errors:
+        expected = sequentialSM.shift_or_algorithm(pattern, text, 
+                                *sequentialSM.preprocess("shift_or", pattern,
+                                            ignore_case, max_errors, edits))
+    else:
+        expected = sequentialSM.kmp_algorithm(pattern, text, 
+                        *sequentialSM.preprocess("kmp", pattern, ignore_case))
+    compare_results(results, expected)
+
+def cli(argv=None):
+    """
+    Console entry point, searching as requested by command line arguments.
+
+    Parameters:
+    -----------
+    argv: `str`
+        List of arguments, defaults to those of the command line
+    """
+
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    main(**vars(args))
+
+if __name__ == "__main__":
+
+    cli()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+
+import os
+import json
+import time
+import zlib
+from .string_matching import StringMatching as sm
+from .string_matching import DEFAULT_BUFFER_SIZE
+from .multi_pattern import MultiPatternMatcher as mpm
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+# Bytes before the checkpoint offset whose checksum is kept, to tell a file
+# rewritten in place from one that was only appended to
+FINGERPRINT_SIZE = 4096
+
+def fingerprint(file, offset):
+    """
+    Checksum of the bytes just before an offset.
+
+    Parameters:
+    -----------
+    file:
+        Binary file object.
+    offset: `int`
+        File offset.
+
+    Returns:
+    --------
+    checksum: `int`
+        CRC32 of up to `FINGERPRINT_SIZE` bytes before offset.
+    """
+
+    start = max(offset - FINGERPRINT_SIZE, 0)
+    file.seek(start)
+    return zlib.crc32(file.read(offset - start))
+
+class IncrementalSearch():
+    """
+    Search of a growing file, such as a log, scanning only the data appended
+    since the previous search. The scanned offset and matcher state are kept
+    in a checkpoint file, per pattern set.
+    """
+
+    def __init__(self, path, patterns, algorithm="kmp", ignore_case=True,
+                        checkpoint=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        Build matcher for the given patterns.
+
+        Parameters:
+        -----------
+        path: `str`
+            Path to input file.
+        patterns: `bytes`
+            List of patterns to search for. A single pattern is searched
+            with the given algorithm, its state being the KMP state (length
+            of the pattern prefix ending the scanned data). Several patterns
+            are searched with an Aho-Corasick automaton, its state being the
+            automaton state.
+        algorithm: `str`
+            Algorithm used for a single pattern, one of `ALGORITHMS`.
+        ignore_case: `bool`
+            Ignore ASCII letters case.
+        checkpoint: `str`
+            Path to checkpoint file, defaults to the input path followed by
+            `CHECKPOINT_SUFFIX`.
+        buffer_size: `int`
+            Number of bytes read at a time.
+        """
+
+        self.path = path
+        self.patterns = [p.encode() if isinstance(p, str) else p
+                                                            for p in patterns]
+        self.ignore_case = ignore_case
+        self.checkpoint = checkpoint or path + CHECKPOINT_SUFFIX
+        self.buffer_size = buffer_size
+        self.key = json.dumps([[p.decode("latin-1") for p in self.patterns],
+                                                                ignore_case])
+        self.scanned = 0
+        self.found = 0
+
+        if not self.patterns or not all(self.patterns):
+            raise ValueError("Patterns must not be empty")
+        if len(self.patterns) == 1:
+            matching = sm()
+            self.pattern = self.patterns[0]
+            self.prefix = (matching.fold_pattern(self.pattern)
+                                        if ignore_case else self.pattern)
+            self.args = matching.preprocess(algorithm, self.pattern,
+                                                                ignore_case)
+            self.search = getattr(matching, "{}_matches".format(algorithm))
+        else:
+            self.automaton = mpm(self.patterns, ignore_case)
+
+    def load_checkpoint(self):
+        """
+        Load the checkpoint of this pattern set.
+
+        Returns:
+        --------
+        record: `dict`
+            Checkpoint with 'inode', 'device', 'offset', 'state',
+            'fingerprint' and 'matches' (found in the file so far) keys, or
+            `None` if there is none.
+        """
+
+        try:
+            with open(self.checkpoint, "r") as file:
+                return json.load(file).get(self.key)
+        except FileNotFoundError:
+            return None
+
+    def save_checkpoint(self, record):
+        """
+        Save the checkpoint of this pattern set, keeping those of others.
+        The file is replaced at once, so an interrupted save leaves the
+        previous checkpoint.
+
+        Parameters:
+        -----------
+        record: `dict`
+            Checkpoint, as returned by `load_checkpoint`.
+        """
+
+        try:
+            with open(self.checkpoint, "r") as file:
+                records = json.load(file)
+        except FileNotFoundError:
+            records = dict()
+        records[self.key] = record
+
+        temporary = self.checkpoint + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(records, file, indent=1)
+        os.replace(temporary, self.checkpoint)
+
+    def check_checkpoint(self, record, file):
+        """
+        Check whether a checkpoint still holds for the file.
+
+        Parameters:
+        -----------
+        record: `dict`
+            Checkpoint, as returned by `load_checkpoint`.
+        file:
+            Input file, opened in binary mode.
+
+        Returns:
+        --------
+        reason: `str`
+            Why the file must be scanned from the start: 'rotated' when the
+            path now names another file, 'truncated' when the file is
+            smaller than the scanned offset, 'rewritten' when the data
+            before the offset changed; `None` if the checkpoint holds.
+        """
+
+        status = os.fstat(file.fileno())
+        if (status.st_ino, status.st_dev) != (record["inode"],
+                                                        record["device"]):
+            return "rotated"
+        if status.st_size < record["offset"]:
+            return "truncated"
+        if fingerprint(file, record["offset"]) != record["fingerprint"]:
+            return "rewritten"
+        return None
+
+    def find_rotated(self, record):
+        """
+        Find the file a checkpoint was taken on, after rotation renamed it
+        inside the same directory (e.g. 'app.log' to 'app.log.1').
+
+        Parameters:
+        -----------
+        record: `dict`
+            Checkpoint, as returned by `load_checkpoint`.
+
+        Returns:
+        --------
+        path: `str`
+            Path to rotated file, or `None` if it was not found.
+        """
+
+        directory = os.path.dirname(self.path) or "."
+        for entry in os.scandir(directory):
+            try:
+                status = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if (status.st_ino, status.st_dev) == (record["inode"],
+                                                        record["device"]):
+                return entry.path
+        return None
+
+    def prefix_state(self, tail):
+        """
+        KMP state at the end of scanned data.
+
+        Parameters:
+        -----------
+        tail: `bytes`
+            Last `len(pattern) - 1` bytes of scanned data, or fewer.
+
+        Returns:
+        --------
+        state: `int`
+            Length of the longest pattern prefix ending the data. Matches
+            crossing into appended data can only start there, so the
+            prefix is all that must be carried over.
+        """
+
+        if self.ignore_case:
+            tail = sm().fold_pattern(tail)
+        for length in range(min(len(tail), len(self.prefix) - 1), 0, -1):
+            if tail[len(tail) - length:] == self.prefix[:length]:
+                return length
+        return 0
+
+    def scan_file(self, path, file, offset=0, state=0):
+        """
+        Scan a file from offset to its end.
+
+        Parameters:
+        -----------
+        path: `str`
+            Path reported with matches.
+        file:
+            Input file, opened in binary mode.
+        offset: `int`
+            File offset where scan starts.
+        state: `int`
+            Matcher state at offset.
+
+        Returns:
+        --------
+        matches: `generator`
+            (path, pattern, file offset) triples, in increasing offset
+            order. The generator returns the file offset and matcher state
+            at the end of the scan.
+        """
+
+        file.seek(offset)
+        if len(self.patterns) == 1:
+            pattern = self.pattern
+            overlap = len(pattern) - 1
+            carry = self.prefix[:state]
+            position = offset - state
+        while True:
+            chunk = file.read(self.buffer_size)
+            if not chunk:
+                break
+            self.scanned += len(chunk)
+            if len(self.patterns) == 1:
+                window = carry + chunk
+                for match in self.search(pattern, window, *self.args):
+                    self.found += 1
+                    yield path, pattern, position + match
+                carry = window[max(len(window) - overlap, 0):] if overlap \
+                                                                    else b""
+                position += len(window) - len(carry)
+            else:
+                found, state = self.automaton.resume(chunk, state)
+                for match, pattern in sorted((offset + i, pattern)
+                                    for pattern, indices in found.items()
+                                    for i in indices):
+                    self.found += 1
+                    yield path, pattern, match
+            offset += len(chunk)
+
+        if len(self.patterns) == 1:
+            state = self.prefix_state(carry)
+        return offset, state
+
+    def scan(self):
+        """
+        Scan data appended to the file since the last checkpoint, and save
+        a new checkpoint. The whole file is scanned if there is no valid
+        checkpoint; after rotation, the rest of the rotated file is scanned
+        first when it is still in the same directory.
+
+        Returns:
+        --------
+        matches: `generator`
+            (path, pattern, file offset) triples.
+        """
+
+        self.scanned = 0
+        self.found = 0
+        with open(self.path, "rb") as file:
+            record = self.load_checkpoint()
+            offset, state, matches = 0, 0, 0
+            if record is not None:
+                reason = self.check_checkpoint(record, file)
+                if reason is None:
+                    offset, state = record["offset"], record["state"]
+                    matches = record["matches"]
+                else:
+                    print("{} was {}, scanning from start".format(self.path,
+                                                                    reason))
+                if reason == "rotated":
+                    rotated = self.find_rotated(record)
+                    if rotated is not None:
+                        with open(rotated, "rb") as old:
+                            yield from self.scan_file(rotated, old,
+                                            record["offset"], record["state"])
+                    matches -= self.found
+
+            offset, state = yield from self.scan_file(self.path, file,
+                                                            offset, state)
+            status = os.fstat(file.fileno())
+            self.save_checkpoint({
+                "inode": status.st_ino,
+                "device": status.st_dev,
+                "offset": offset,
+                "state": state,
+                "fingerprint": fingerprint(file, offset),
+                "matches": matches + self.found
+            })
+
+    def follow(self, interval=1.0):
+        """
+        Scan appended data continuously, until interrupted.
+
+        Parameters:
+        -----------
+        interval: `float`
+            Seconds waited between scans.
+
+        Returns:
+        --------
+        matches: `generator`
+            (path, pattern, file offset) triples.
+        """
+
+        while True:
+            try:
+                yield from self.scan()
+            except FileNotFoundError:
+                # Rotated, new file not created yet
+                pass
+            time.sleep(interval)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+
+from collections import deque
+from functools import lru_cache
+from .string_matching import StringMatching, ParallelStringMatching
+from .string_matching import PATTERN_CACHE_SIZE
+
+# Automaton shared by pool workers, sent once by the initializer
+worker_matcher = None
+
+def load_patterns(path):
+    """
+    Load patterns file, one pattern per line.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to patterns file.
+
+    Returns:
+    --------
+    patterns: `str`
+        List of unique, non empty patterns, in file order.
+    """
+
+    with open(path, "r") as file:
+        lines = file.read().splitlines()
+
+    patterns = list()
+    for line in lines:
+        if line and line not in patterns:
+            patterns.append(line)
+    return patterns
+
+class MultiPatternMatcher():
+    """
+    Aho-Corasick automaton, finding every pattern in a single text pass.
+    """
+
+    def __init__(self, patterns, ignore_case=False):
+        """
+        Build automaton for the given patterns.
+
+        Parameters:
+        -----------
+        patterns: `str`
+            List of patterns to search for.
+        ignore_case: `bool`
+            Match patterns ignoring case. Patterns are folded, and the
+            transitions of each folded character are added for all its 
+            case variants.
+        """
+
+        folding = StringMatching()
+        self.patterns = list(dict.fromkeys(patterns))
+        keys = self.patterns
+        if ignore_case:
+            keys = [folding.fold_pattern(p) for p in self.patterns]
+        # The automaton is built over unique folded keys, results are keyed
+        # by the patterns as given, several of them may share a key
+        self.keys = list(dict.fromkeys(keys))
+        indices = {key: index for index, key in enumerate(self.keys)}
+        self.indices = [indices[key] for key in keys]
+        self.lengths = [len(p) for p in self.keys]
+        self.max_length = max(self.lengths) if self.lengths else 0
+        self.transitions, self.outputs = self.build_automaton(self.keys)
+        if ignore_case and self.keys:
+            fold = folding.build_fold_table(self.keys[0][:0].join(self.keys))
+            for transitions in self.transitions:
+                folding.expand_table(transitions, fold)
+
+    @staticmethod
+    def build_automaton(patterns):
+        """
+        Build Aho-Corasick automaton, with failure links resolved into
+        complete transitions.
+
+        Parameters:
+        -----------
+        patterns: `str`
+            List of patterns to search for.
+
+        Returns:
+        --------
+        transitions: `dict`
+            List with a transition table per state; missing characters go
+            back to the root state.
+        outputs: `int`
+            List with the indices of the patterns ending at each state.
+        """
+
+        # Trie of patterns
+        goto = [dict()]
+        outputs = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append(dict())
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(index)
+
+        # Breadth-first walk setting failure links, each state inherits the
+        # transitions and outputs of its failure state
+        fail = [0] * len(goto)
+        transitions = [None] * len(goto)
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions[state] = dict(transitions[fail[state]])
+            transitions[state].update(goto[state])
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = transitions[fail[state]].get(char, 0)
+                queue.append(child)
+
+        return transitions, outputs
+
+    def search(self, text):
+        """
+        Search for every pattern in text.
+
+        Parameters:
+        -----------
+        text: `str`
+            Text to search in.
+
+        Returns:
+        --------
+        matches: `dict`
+            Pattern to list of indices where matches where found.
+        """
+
+        return self.resume(text)[0]
+
+    def resume(self, text, state=0):
+        """
+        Search for every pattern in text, starting from the automaton state
+        reached at the end of the previous text, so matches crossing from 
+        it into text are found.
+
+        Parameters:
+        -----------
+        text: `str`
+            Text to search in.
+        state: `int`
+            Automaton state to start from.
+
+        Returns:
+        --------
+        matches: `dict`
+            Pattern to list of indices where matches where found, negative
+            for matches starting in the previous text.
+        state: `int`
+            Automaton state at the end of text.
+        """
+
+        transitions = self.transitions
+        outputs = self.outputs
+        lengths = self.lengths
+        found = [list() for i in self.keys]
+
+        for i in range(len(text)):
+            state = transitions[state].get(text[i], 0)
+            for index in outputs[state]:
+                found[index].append(i - lengths[index] + 1)
+
+        if len(self.keys) == len(self.patterns):
+            matches = {pattern: found[index] for pattern, index in 
+                                            zip(self.patterns, self.indices)}
+        else:
+            matches = {pattern: list(found[index]) for pattern, index in 
+                                            zip(self.patterns, self.indices)}
+        return matches, state
+
+class ParallelMultiPatternMatcher(MultiPatternMatcher):
+    """
+    Aho-Corasick automaton adapted for parallel execution.
+    """
+
+    def search(self, text, segment):
+        """
+        Parallel adapted search for every pattern in a text segment.
+
+        Parameters:
+        -----------
+        text: `str`
+            Text segment to search in, overlapping the next segment by the
+            longest pattern length minus one.
+        segment: `int`
+            Segment boundaries
+
+        Returns:
+        --------
+        matches: `dict`
+            Pattern to list of indices where matches where found.
+        """
+
+        shifting = ParallelStringMatching().result_shifting
+        matches = super().search(text)
+        for pattern in matches:
+            matches[pattern] = shifting(matches[pattern], segment[0],
+                                                                segment[1])
+        return matches
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compiled_matchers(patterns, ignore_case, parallel):
+    if parallel:
+        return ParallelMultiPatternMatcher(patterns, ignore_case)
+    return MultiPatternMatcher(patterns, ignore_case)
+
+def compile_matcher(patterns, ignore_case=False, parallel=False):
+    """
+    Get the automaton for a list of patterns, built on first use and kept
+    in a bounded cache, as `compile_pattern` does for single patterns.
+
+    Parameters:
+    -----------
+    patterns: `str`
+        List of patterns to search for.
+    ignore_case: `bool`
+        Match patterns ignoring case.
+    parallel: `bool`
+        Get a `ParallelMultiPatternMatcher`, searching text segments.
+
+    Returns:
+    --------
+    matcher: `MultiPatternMatcher`
+        Automaton shared by every query with the same arguments. It must
+        not be modified.
+    """
+
+    return compiled_matchers(tuple(patterns), bool(ignore_case), 
+                                                            bool(parallel))
+
+def init_worker(matcher):
+    """
+    Pool initializer, sending the automaton to each worker once, instead 
+    of with every task.
+
+    Parameters:
+    -----------
+    matcher: `ParallelMultiPatternMatcher`
+        Automaton searched by `search_segment`.
+    """
+
+    global worker_matcher
+    worker_matcher = matcher
+
+def search_segment(text, segment):
+    """
+    Search a text segment with the automaton of the worker, see 
+    `ParallelMultiPatternMatcher.search`.
+    """
+
+    return worker_matcher.search(text, segment)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLOCK_SIZE = 16 * 1024 * 1024
+
+def require_numpy():
+    """
+    Raise an error if NumPy is not installed.
+    """
+
+    if np is None:
+        raise ImportError("The 'numpy' algorithm requires NumPy to be "
+                            "installed (pip install numpy)")
+
+def load_array(path, lowercase=True):
+    """
+    Load file data as an array of bytes.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file.
+    lowercase: `bool`
+        Convert ASCII upper case letters to lowercase.
+
+    Returns:
+    --------
+    text: `numpy.ndarray`
+        File bytes, as `uint8` values.
+    """
+
+    require_numpy()
+    text = np.fromfile(path, dtype=np.uint8)
+    if lowercase:
+        upper = (text >= ord("A")) & (text <= ord("Z"))
+        text[upper] += ord("a") - ord("A")
+    return text
+
+def as_array(text):
+    """
+    View text as a NumPy array, without copying byte inputs.
+
+    Parameters:
+    -----------
+    text: `str`, `bytes` or buffer
+        Text to convert. Strings are encoded as UTF-32, so array indices
+        match string indices.
+
+    Returns:
+    --------
+    text: `numpy.ndarray`
+        Text characters as `uint32` values, or bytes as `uint8` values.
+    """
+
+    require_numpy()
+    if isinstance(text, np.ndarray):
+        return text
+    if isinstance(text, str):
+        return np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    return np.frombuffer(text, dtype=np.uint8)
+
+def add_offset(matches, offset):
+    """
+    Add an offset to every match of an array, in place, in one vectorized
+    operation.
+
+    Parameters:
+    -----------
+    matches: `array`
+        Match indices, as an `array` of 'q' items or other writable 
+        buffer of 64-bit integers.
+    offset: `int`
+        Offset added to every index.
+    """
+
+    require_numpy()
+    view = np.frombuffer(matches, dtype=np.int64)
+    view += offset
+
+def find_matches(pattern, text, block_size=BLOCK_SIZE, fold=None):
+    """
+    Vectorized string matching.
+
+    Candidate positions are found comparing the whole text with the first
+    and last pattern characters at once, then each remaining pattern
+    character is checked on all candidates together. The text is processed
+    in blocks, so temporary arrays have bounded size. Case insensitive 
+    search checks each position against every case variant of the pattern
+    character, instead of folding the text.
+
+    Parameters:
+    -----------
+    pattern: `str` or `bytes`
+        Pattern to search for.
+    text: `str`, `bytes` or buffer
+        Text to search in.
+    block_size: `int`
+        Number of candidate positions checked at a time.
+    fold: `dict`
+        Case fold table of the pattern, for case insensitive search.
+
+    Returns:
+    --------
+    matches: `numpy.ndarray`
+        Array of indices where matches where found.
+    """
+
+    haystack = as_array(text)
+    needle = as_array(pattern)
+    if isinstance(pattern, str) != (haystack.dtype.itemsize == 4):
+        raise TypeError("Pattern and text must both be str or bytes")
+
+    M = len(needle)
+    N = len(haystack)
+    if M == 0 or N < M:
+        return np.empty(0, dtype=np.int64)
+
+    if fold is None:
+        equal = lambda values, k: values == needle[k]
+    else:
+        variants = dict()
+        for variant, folded in fold.items():
+            code = ord(variant) if isinstance(variant, str) else variant
+            variants.setdefault(folded, []).append(code)
+        accepted = [np.array(variants[fold[char]], dtype=haystack.dtype)
+                    for char in pattern]
+        equal = lambda values, k: np.isin(values, accepted[k])
+
+    positions = N - M + 1
+    matches = list()
+    for start in range(0, positions, block_size):
+        end = min(start + block_size, positions)
+        candidates = np.flatnonzero(
+                            equal(haystack[start:end], 0) &
+                            equal(haystack[start + M - 1:end + M - 1], M - 1)
+        )
+        candidates += start
+        for k in range(1, M - 1):
+            if not len(candidates):
+                break
+            candidates = candidates[equal(haystack[candidates + k], k)]
+        matches.append(candidates)
+
+    return np.concatenate(matches).astype(np.int64)
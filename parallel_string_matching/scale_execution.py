@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+import os
+import time
+import multiprocessing as mp
+from .string_matching import StreamingStringMatching as ssm
+from .benchmark import get_core_counts, summarize, run_matrix, write_json
+
+def execute_streaming(pattern, input_path, repeat=10, warmup=1,
+                                                    algorithm="kmp"):
+    """
+    Execute streaming search repeatedly, reading the file in buffers.
+
+    Parameters:
+    -----------
+    pattern: `str`
+        Pattern to look for in text
+    input_path: `str`
+        Path to text used as haystack
+    repeat: `int`
+        Number of timed iterations
+    warmup: `int`
+        Number of untimed iterations, before timed ones
+    algorithm: `str`
+        Algorithm used on each buffer
+
+    Returns:
+    --------
+    record: `dict`
+        Benchmark result, in the format of `benchmark.run_matrix`.
+    """
+
+    streamingSM = ssm()
+    samples = []
+
+    print("Using streaming {} search!".format(algorithm))
+    for iteration in range(warmup + repeat):
+        start = time.perf_counter()
+        matches = sum(1 for _ in streamingSM.search_file(pattern, input_path,
+                                                                algorithm))
+        elapsed = time.perf_counter() - start
+        if iteration >= warmup:
+            samples.append(elapsed)
+    print("        Streaming median: ", summarize(samples)["median"])
+
+    return {
+        "file": os.path.basename(input_path),
+        "size": os.path.getsize(input_path),
+        "pattern_kind": "word",
+        "pattern": pattern,
+        "algorithm": "stream_" + algorithm,
+        "cores": 1,
+        "repeat": repeat,
+        "matches": matches,
+        "phases": {"search": summarize(samples), "total": summarize(samples)}
+    }
+
+def main():
+    """
+    Test used for scaling analisys data collection.
+    """
+
+    from .create_big_file import create_large_file
+
+    # Incremets the file size in aproximately 200MB
+    base_path = "sample_txts/"
+    files = []
+    for i in range(250, 2001, 250):
+        create_large_file("sample_txts/kafka.txt", i)
+        files.append(os.path.join(base_path, "kafka_{}.txt".format(i)))
+    log_output_file = "results_log.json"
+
+    core_counts = get_core_counts(mp.cpu_count())
+    print("Core counts used in test -> {}".format(core_counts))
+
+    pat = "people"
+    records = run_matrix(files, {"word": pat}, ["naive", "kmp"],
+                                            core_counts, repeat=10)
+    for current_text in files:
+        records.append(execute_streaming(pat, current_text))
+    write_json(records, log_output_file)
+    print("Results written to {}".format(log_output_file))
+
+if __name__ == "__main__":
+
+    ## This script must be executed from project source 
+    ## (string-matching-parallel directory)
+
+    ## Use python3 -m parallel_string_matching.scale_execution
+    main()
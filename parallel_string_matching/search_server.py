@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import json
+import mmap
+import stat
+import time
+import argparse
+import socketserver
+import multiprocessing as mp
+from .string_matching import ParallelStringMatching as psm
+from .string_matching import ParallelPreprocessing as pp
+from .string_matching import ALGORITHMS, compile_pattern
+
+def create_parser():
+
+    parser = argparse.ArgumentParser(
+        usage="python3 search_server.py <options>",
+        description=("Long-lived search server. The text is memory-mapped "
+                    "once by worker processes, each one bound to its own "
+                    "segment, and pattern queries are answered without "
+                    "reloading the file. Queries are read one per line, "
+                    "either as a plain pattern or as a JSON object "
+                    "{\"pattern\": ..., \"algorithm\": ..., "
+                    "\"ignore_case\": false, \"offsets\": true}, and "
+                    "answered with one JSON line each. Case is ignored "
+                    "unless --case_sensitive is given or the query sets "
+                    "\"ignore_case\".")
+    )
+
+    parser.add_argument("-t", "--text",
+                        type=str,
+                        help="Absolute path to text where search will occur",
+                        required=True
+    )
+
+    parser.add_argument("-a", "--algorithm",
+                        choices=ALGORITHMS + ("auto",),
+                        default="kmp",
+                        help=("Default algorithm used for string search, auto "
+                            "picks the fastest for each query")
+    )
+
+    parser.add_argument("--processor_count",
+                        type=int,
+                        help="Number of worker processes",
+                        default=2
+    )
+
+    parser.add_argument("--socket",
+                        type=str,
+                        help=("Path of a Unix socket to listen on, instead of "
+                            "reading queries from stdin")
+    )
+
+    parser.add_argument("--case_sensitive",
+                        action="store_true",
+                        help=("Match upper and lower case exactly by default, "
+                            "instead of ignoring case")
+    )
+
+    return parser
+
+def segment_worker(path, segment, connection):
+    """
+    Worker loop, searching its segment of the memory-mapped text for every
+    query received, until `None` is received. Queries are compiled by the
+    worker and cached, so repeated queries neither rebuild nor receive 
+    lookup tables.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file
+    segment: `int`
+        Byte boundaries of the segment owned by the worker
+    connection: `multiprocessing.connection.Connection`
+        Pipe end used to receive queries and send results
+    """
+
+    parallelSM = psm()
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            text = b""
+        else:
+            text = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mmap, "MADV_WILLNEED") and segment[1] > segment[0]:
+                # Read ahead the segment pages, aligned as madvise requires
+                start = segment[0] - segment[0] % mmap.PAGESIZE
+                text.madvise(mmap.MADV_WILLNEED, start, segment[1] - start)
+
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        pattern, algorithm, ignore_case = request
+        try:
+            compiled = compile_pattern(pattern, algorithm, ignore_case)
+            connection.send(parallelSM.buffer_algorithm(text, pattern, 
+                                    segment, algorithm, *compiled.args))
+        except Exception as error:
+            connection.send(error)
+
+    if isinstance(text, mmap.mmap):
+        text.close()
+    connection.close()
+
+class SearchServer():
+    """
+    Pool of warm worker processes, each bound to a segment of one text.
+    """
+
+    def __init__(self, path, processor_count=2, algorithm="kmp", 
+                                                        ignore_case=True):
+        """
+        Start worker processes.
+
+        Parameters:
+        -----------
+        path: `str`
+            Path to input file
+        processor_count: `int`
+            Number of worker processes
+        algorithm: `str`
+            Default algorithm used for string search
+        ignore_case: `bool`
+            Ignore ASCII letters case in queries not setting it, as 
+            `find_string` does by default
+        """
+
+        self.path = path
+        self.algorithm = algorithm
+        self.ignore_case = ignore_case
+        self.segments = pp.get_file_segments(path, processor_count)
+        self.preprocessing = psm()
+
+        self.workers = []
+        self.connections = []
+        for segment in self.segments:
+            parent_end, worker_end = mp.Pipe()
+            worker = mp.Process(target=segment_worker,
+                                args=(path, segment, worker_end),
+                                daemon=True)
+            worker.start()
+            worker_end.close()
+            self.workers.append(worker)
+            self.connections.append(parent_end)
+
+    def select_algorithm(self, pattern, algorithm=None, ignore_case=False):
+        """
+        Resolve the algorithm used for a query.
+
+        Parameters:
+        -----------
+        pattern: `bytes`
+            Pattern to look for in text
+        algorithm: `str`
+            Requested algorithm, defaults to the server one; 'auto' picks
+            the fastest for the query
+        ignore_case: `bool`
+            Ignore ASCII letters case
+
+        Returns:
+        --------
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+        """
+
+        algorithm = algorithm or self.algorithm
+        if algorithm == "auto":
+            # Workers search memory-mapped segments through buffers
+            algorithm, reason = self.preprocessing.choose_algorithm(pattern,
+                                                    ignore_case, buffer=True)
+        if algorithm not in ALGORITHMS:
+            raise ValueError("Unknown algorithm '{}'".format(algorithm))
+        return algorithm
+
+    def prepare_query(self, pattern, algorithm=None, ignore_case=None):
+        """
+        Validate a query and resolve its settings.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to look for in text
+        algorithm: `str`
+            Algorithm used for string search, defaults to the server one
+        ignore_case: `bool`
+            Ignore ASCII letters case, defaults to the server setting
+
+        Returns:
+        --------
+        pattern: `bytes`
+            Encoded pattern.
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+        ignore_case: `bool`
+            Ignore ASCII letters case.
+        """
+
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+        if not pattern:
+            raise ValueError("Empty pattern")
+        if ignore_case is None:
+            ignore_case = self.ignore_case
+        algorithm = self.select_algorithm(pattern, algorithm, ignore_case)
+        return pattern, algorithm, ignore_case
+
+    def query(self, pattern, algorithm=None, ignore_case=None):
+        """
+        Search for pattern in the text.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to look for in text
+        algorithm: `str`
+            Algorithm used for string search, defaults to the server one
+        ignore_case: `bool`
+            Ignore ASCII letters case, defaults to the server setting
+
+        Returns:
+        --------
+        matches: `int`
+            List of byte offsets where matches where found.
+        """
+
+        return self.run_query(*self.prepare_query(pattern, algorithm, 
+                                                                ignore_case))
+
+    def run_query(self, pattern, algorithm, ignore_case):
+        """
+        Search for pattern in the text, with settings resolved by 
+        `prepare_query`.
+
+        Parameters:
+        -----------
+        pattern: `bytes`
+            Pattern to look for in text
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`
+        ignore_case: `bool`
+            Ignore ASCII letters case
+
+        Returns:
+        --------
+        matches: `int`
+            List of byte offsets where matches where found.
+        """
+
+        for connection in self.connections:
+            connection.send((pattern, algorithm, ignore_case))
+
+        matches = list()
+        errors = list()
+        for connection in self.connections:
+            result = connection.recv()
+            if isinstance(result, Exception):
+                errors.append(result)
+            else:
+                matches.extend(result)
+        if errors:
+            raise errors[0]
+        return matches
+
+    def handle_request(self, line):
+        """
+        Answer a protocol line.
+
+        Parameters:
+        -----------
+        line: `str`
+            Plain pattern, or JSON object with 'pattern' and optional
+            'algorithm', 'ignore_case' and 'offsets' keys
+
+        Returns:
+        --------
+        response: `dict`
+            Query results, or error message.
+        """
+
+        request = {"pattern": line}
+        if line.startswith("{"):
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                return {"error": "Invalid request: {}".format(error)}
+
+        start = time.time()
+        try:
+            pattern, algorithm, ignore_case = self.prepare_query(
+                                request.get("pattern", ""), 
+                                request.get("algorithm"), 
+                                request.get("ignore_case", self.ignore_case))
+            matches = self.run_query(pattern, algorithm, ignore_case)
+        except Exception as error:
+            return {"pattern": request.get("pattern"), "error": str(error)}
+        end = time.time()
+
+        response = {
+            "pattern": request.get("pattern"),
+            "algorithm": algorithm,
+            "matches": len(matches),
+            "elapsed": end - start
+        }
+        if request.get("offsets"):
+            response["offsets"] = matches
+        return response
+
+    def serve_stream(self, input_stream, output_stream):
+        """
+        Answer queries read line by line from a text stream.
+
+        Parameters:
+        -----------
+        input_stream:
+            Text stream queries are read from
+        output_stream:
+            Text stream responses are written to
+        """
+
+        for line in input_stream:
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            output_stream.write(json.dumps(self.handle_request(line)) + "\n")
+            output_stream.flush()
+
+    def serve_socket(self, address):
+        """
+        Answer queries sent to a Unix socket, one connection at a time.
+        A socket left at the address by a previous server is replaced, any
+        other file raises `FileExistsError`.
+
+        Parameters:
+        -----------
+        address: `str`
+            Path of the Unix socket
+        """
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    line = line.decode().rstrip("\r\n")
+                    if not line:
+                        continue
+                    response = json.dumps(server.handle_request(line)) + "\n"
+                    self.wfile.write(response.encode())
+
+        if os.path.exists(address):
+            if not stat.S_ISSOCK(os.stat(address).st_mode):
+                raise FileExistsError("{} exists and is not a socket".format(
+                                                                    address))
+            os.remove(address)
+        with socketserver.UnixStreamServer(address, Handler) as listener:
+            try:
+                listener.serve_forever()
+            finally:
+                os.remove(address)
+
+    def close(self):
+        """
+        Stop worker processes.
+        """
+
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        self.connections = []
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+
+    parser = create_parser()
+    args = parser.parse_args()
+
+    start = time.time()
+    with SearchServer(args.text, args.processor_count, args.algorithm,
+                                not args.case_sensitive) as server:
+        print("Server ready with {} worker(s)! Time elapsed: {}".format(
+                        args.processor_count, time.time() - start),
+                        file=sys.stderr)
+        try:
+            if args.socket:
+                server.serve_socket(args.socket)
+            else:
+                server.serve_stream(sys.stdin, sys.stdout)
+        except KeyboardInterrupt:
+            pass
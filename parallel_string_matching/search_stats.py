@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+
+import io
+import json
+import time
+from contextlib import contextmanager
+
+PROFILERS = ("cprofile", "tracemalloc", "comparisons")
+# Functions and allocation sites kept from profiles
+PROFILE_LINES = 15
+
+class SearchStats():
+    """
+    Timings and counters of one search: wall time of each phase of the
+    pipeline (load, fold, compile, segment, dispatch, search, merge...), and
+    timings, sizes, matches and comparisons of every task, from which
+    per-worker totals and result transfer times are derived.
+    """
+
+    def __init__(self, profilers=()):
+        """
+        Parameters:
+        -----------
+        profilers: `str`
+            Profilers run during the search, from `PROFILERS`: 'cprofile'
+            profiles function calls, 'tracemalloc' traces memory
+            allocations (both in the main process only), 'comparisons'
+            counts text characters read by the engines.
+        """
+
+        self.profilers = tuple(profilers)
+        self.phases = dict()
+        self.counters = dict()
+        self.tasks = list()
+        self.profile = None
+        self.memory = None
+
+    @property
+    def count_comparisons(self):
+        return "comparisons" in self.profilers
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a phase, adding to its time if it was already timed.
+
+        Parameters:
+        -----------
+        name: `str`
+            Phase name.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (self.phases.get(name, 0) +
+                                            time.perf_counter() - start)
+
+    def count(self, name, value):
+        """
+        Add to a counter, such as bytes loaded or sent to workers.
+
+        Parameters:
+        -----------
+        name: `str`
+            Counter name.
+        value: `int`
+            Value added.
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_task(self, stats, received=None):
+        """
+        Record the statistics of a finished task.
+
+        Parameters:
+        -----------
+        stats: `TaskStats`
+            Task statistics, built by the worker.
+        received: `float`
+            Time its result was received by the main process, in seconds
+            since the epoch, if it was sent from another process.
+        """
+
+        task = stats._asdict()
+        task["seconds"] = stats.end - stats.start
+        task["transfer"] = (max(received - stats.end, 0)
+                                            if received is not None else None)
+        self.tasks.append(task)
+
+    def collect(self, results):
+        """
+        Record task statistics of results as they are received from a
+        pool.
+
+        Parameters:
+        -----------
+        results:
+            Iterable of (lower limit, result, `TaskStats`) triples, as
+            returned by `ParallelStringMatching.run_timed_task`.
+
+        Returns:
+        --------
+        results: `generator`
+            (lower limit, result) pairs.
+        """
+
+        for lower_limit, result, stats in results:
+            self.add_task(stats, time.time())
+            yield lower_limit, result
+
+    @contextmanager
+    def measure(self):
+        """
+        Time a whole search as the 'total' phase, running the requested 
+        cProfile and tracemalloc hooks, and keeping the most expensive 
+        functions and allocation sites.
+        """
+
+        # Profilers are imported only when used, they slow down startup
+        profiler = None
+        if "cprofile" in self.profilers:
+            import cProfile
+            profiler = cProfile.Profile()
+        tracing = False
+        if "tracemalloc" in self.profilers:
+            import tracemalloc
+            tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            with self.phase("total"):
+                yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profile = self.profile_functions(profiler)
+            if tracing:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.memory = {
+                    "current": current,
+                    "peak": peak,
+                    "top": [{"location": "{}:{}".format(stat.traceback[0].
+                                    filename, stat.traceback[0].lineno),
+                            "size": stat.size, "count": stat.count}
+                            for stat in snapshot.statistics("lineno")
+                                                        [:PROFILE_LINES]]
+                }
+
+    @staticmethod
+    def profile_functions(profiler):
+        """
+        Most expensive functions of a profile.
+
+        Parameters:
+        -----------
+        profiler: `cProfile.Profile`
+            Finished profiler.
+
+        Returns:
+        --------
+        functions: `dict`
+            Up to `PROFILE_LINES` functions, by decreasing cumulative time,
+            with their call count, own and cumulative time.
+        """
+
+        import pstats
+
+        profile = pstats.Stats(profiler, stream=io.StringIO())
+        functions = sorted(profile.stats.items(),
+                            key=lambda item: item[1][3], reverse=True)
+        return [{"function": "{}:{}({})".format(*function), "calls": calls,
+                    "time": own, "cumulative": cumulative}
+                for function, (_, calls, own, cumulative, _)
+                in functions[:PROFILE_LINES]]
+
+    def workers(self):
+        """
+        Totals of the tasks run by each worker.
+
+        Returns:
+        --------
+        workers: `dict`
+            Worker name to number of tasks, search seconds, characters
+            scanned, matches and comparisons (`None` if not counted).
+        """
+
+        workers = dict()
+        for task in self.tasks:
+            totals = workers.setdefault(task["worker"], {"tasks": 0,
+                        "seconds": 0, "size": 0, "matches": 0,
+                        "comparisons": None})
+            totals["tasks"] += 1
+            totals["seconds"] += task["seconds"]
+            totals["size"] += task["size"]
+            totals["matches"] += task["matches"]
+            if task["comparisons"] is not None:
+                totals["comparisons"] = ((totals["comparisons"] or 0) +
+                                                        task["comparisons"])
+        return workers
+
+    def to_dict(self):
+        """
+        Get statistics as a JSON serializable dictionary.
+
+        Returns:
+        --------
+        stats: `dict`
+            Phases, counters, per-worker totals, tasks (sorted by lower
+            limit), and profiles if any.
+        """
+
+        transfers = [task["transfer"] for task in self.tasks
+                                            if task["transfer"] is not None]
+        counters = dict(self.counters)
+        if transfers:
+            counters["transfer_seconds"] = sum(transfers)
+            counters["transfer_max_seconds"] = max(transfers)
+        stats = {
+            "phases": self.phases,
+            "counters": counters,
+            "workers": self.workers(),
+            "tasks": sorted(self.tasks, key=lambda task: task["lower"])
+        }
+        if self.profile is not None:
+            stats["profile"] = self.profile
+        if self.memory is not None:
+            stats["memory"] = self.memory
+        return stats
+
+    def report(self, output="text"):
+        """
+        Print statistics.
+
+        Parameters:
+        -----------
+        output: `str`
+            'json' for one JSON document, 'text' for tables.
+        """
+
+        stats = self.to_dict()
+        if output == "json":
+            print(json.dumps(stats, indent=1))
+            return
+
+        print("Phase            Seconds")
+        for name, seconds in stats["phases"].items():
+            print("{:<16} {:.6f}".format(name, seconds))
+        for name, value in stats["counters"].items():
+            print("{:<24} {}".format(name, value))
+        if stats["workers"]:
+            print("{:<28} {:>6} {:>10} {:>12} {:>10} {:>14}".format("Worker",
+                    "Tasks", "Seconds", "Size", "Matches", "Comparisons"))
+        for name, totals in stats["workers"].items():
+            print("{:<28} {:>6} {:>10.4f} {:>12} {:>10} {:>14}".format(name,
+                    totals["tasks"], totals["seconds"], totals["size"],
+                    totals["matches"], "-" if totals["comparisons"] is None
+                                                else totals["comparisons"]))
+        for function in stats.get("profile", ()):
+            print("{:>10} {:>10.4f} {:>10.4f}  {}".format(function["calls"],
+                    function["time"], function["cumulative"],
+                    function["function"]))
+        if "memory" in stats:
+            print("Peak traced memory: {} bytes".format(
+                                                    stats["memory"]["peak"]))
+            for site in stats["memory"]["top"]:
+                print("{:>12} {:>8}  {}".format(site["size"], site["count"],
+                                                            site["location"]))
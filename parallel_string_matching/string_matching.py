@@ -0,0 +1,2916 @@
+#!/usr/bin/env python
+
+import math
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import islice, takewhile
+from multiprocessing import current_process
+from threading import current_thread
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    # Python 3.7, results are sent back through the pool instead
+    shared_memory = None
+
+DEFAULT_BUFFER_SIZE = 16 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+# Tasks per processor aimed at when grouping files or compressed blocks in
+# tasks, so work is spread over the pool even for inputs smaller than one
+# chunk per processor
+TASKS_PER_PROCESSOR = 4
+ALGORITHMS = ("naive", "kmp", "boyer_moore", "horspool", "two_way", "numpy",
+                "find", "regex", "shift_or", "bndm")
+# Algorithms supporting approximate matching
+APPROXIMATE = ("shift_or", "bndm")
+MODES = ("all", "count", "exists", "first-k")
+EXECUTORS = ("process", "thread")
+# Engines whose search loop runs with the GIL released, so threads scan
+# segments in parallel. str.find, bytes.find and re hold it.
+GIL_RELEASING = ("numpy",)
+# Engines reading the text in Python code, whose character reads can be 
+# counted. The others scan it in C.
+COUNTED = ("naive", "kmp", "boyer_moore", "horspool", "two_way", 
+                "shift_or", "bndm")
+# Characters of text over which automatic selection times the candidate
+# engines, and the exact engines timed. C-level engines win on CPython,
+# engines skipping text (Horspool, Boyer-Moore) may win on other 
+# interpreters or with long patterns
+SAMPLE_SIZE = 64 * 1024
+SAMPLED = ("find", "regex", "horspool", "boyer_moore", "two_way", "kmp")
+# Engines searching a str in place between two bounds, through a
+# `TextView`. The others read a copy of their window, faster to index
+BOUNDED = ("find", "regex")
+ASCII_LOWERCASE = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+                                    b"abcdefghijklmnopqrstuvwxyz")
+ASCII_UPPERCASE = bytes.maketrans(b"abcdefghijklmnopqrstuvwxyz",
+                                    b"ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# Event shared by pool workers, set when enough matches were found
+stop_event = None
+
+# Compiled pattern shared by pool workers, sent once by the initializer
+worker_pattern = None
+PATTERN_CACHE_SIZE = 256
+
+# Characters lowering to each lowercase character, built on first use.
+# Characters with case are all below U+1F000
+case_variants = None
+CASED_LIMIT = 0x1F000
+
+# Match indices left by a worker in a shared memory block
+SharedMatches = namedtuple("SharedMatches", ["name", "length"])
+
+# Timings and counters of one search task, times being seconds since the 
+# epoch so they compare across processes
+TaskStats = namedtuple("TaskStats", ["worker", "lower", "size", "start", 
+                                        "end", "matches", "comparisons"])
+
+def load_text(path, lowercase=True, encoding=None):
+    """
+    Load text file data.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input text.
+    lowercase: `bool`
+        Convert read text to lowercase.
+    encoding: `str`
+        Text encoding, defaults to the platform one.
+    """
+
+    with open(path, "r", encoding=encoding) as file:
+        text = file.read()
+
+    return text.lower() if lowercase else text
+
+def load_bytes(path, lowercase=True):
+    """
+    Load file data as bytes, read at once into a preallocated buffer.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to input file.
+    lowercase: `bool`
+        Convert ASCII upper case letters to lowercase, in place. Other bytes,
+        including multi-byte characters, are left unchanged.
+
+    Returns:
+    --------
+    text: `bytearray`
+        File data, indices are byte offsets.
+    """
+
+    with open(path, "rb", buffering=0) as file:
+        text = bytearray(os.fstat(file.fileno()).st_size)
+        with memoryview(text) as view:
+            size = 0
+            while size < len(text):
+                count = file.readinto(view[size:])
+                if not count:
+                    break
+                size += count
+    del text[size:]
+
+    if lowercase:
+        # Folded a block at a time, so only one block is copied at once
+        for start in range(0, len(text), DEFAULT_BUFFER_SIZE):
+            end = start + DEFAULT_BUFFER_SIZE
+            text[start:end] = text[start:end].translate(ASCII_LOWERCASE)
+    return text
+
+def get_case_variants():
+    """
+    Map lowercase characters to the other characters lowering to them, 
+    such as 'K' and the Kelvin sign for 'k'.
+
+    Returns:
+    --------
+    variants: `dict`
+        Lowercase character to list of characters.
+    """
+
+    global case_variants
+    if case_variants is None:
+        case_variants = dict()
+        for code in range(CASED_LIMIT):
+            char = chr(code)
+            lower = char.lower()
+            if lower != char and len(lower) == 1:
+                case_variants.setdefault(lower, []).append(char)
+    return case_variants
+
+def compare_results(list_a, list_b):
+    """
+    Compare two lists.
+
+    Parameters:
+    -----------
+    list_a: `list``
+        First list.
+    list_b: `list`
+        Second list
+    """
+
+    if (len(list_a)== len(list_b) and 
+        len(list_a) == sum(
+                        [1 for i, j in zip(list_a, list_b) if i == j])
+    ): 
+        print ("Lists are dentical") 
+    else : 
+        print ("Lists are not identical") 
+
+class FoldedText():
+    """
+    Read-only view of a text, folding case of the characters read, so
+    case insensitive search needs no folded copy of the text.
+    """
+
+    def __init__(self, text, fold):
+        """
+        Parameters:
+        -----------
+        text: `str`
+            Text to search in.
+        fold: `dict`
+            Case fold table built by `StringMatching.build_fold_table`.
+        """
+
+        self.text = text
+        self.fold = fold.get
+
+    def __len__(self):
+        return len(self.text)
+
+    def __getitem__(self, index):
+        return self.fold(self.text[index])
+
+class CountingText():
+    """
+    Read-only view of a text, counting the characters read by a search. 
+    Every character read is compared at least once, against the pattern or
+    a lookup table, so reads measure the work of the search loop.
+    """
+
+    def __init__(self, text):
+        """
+        Parameters:
+        -----------
+        text: `str`
+            Text to search in.
+        """
+
+        self.text = text
+        self.reads = 0
+
+    def __len__(self):
+        return len(self.text)
+
+    def __getitem__(self, index):
+        item = self.text[index]
+        self.reads += len(item) if isinstance(index, slice) else 1
+        return item
+
+    def __iter__(self):
+        for char in self.text:
+            self.reads += 1
+            yield char
+
+class TextView():
+    """
+    Read-only window of a str, searched in place without copying it, as
+    `memoryview` does for bytes. Indices are relative to the window start.
+    """
+
+    def __init__(self, text, start=0, end=None):
+        """
+        Parameters:
+        -----------
+        text: `str`
+            Whole text.
+        start: `int`
+            Index of the first character of the window.
+        end: `int`
+            Index past the last character of the window, defaults to the
+            text length.
+        """
+
+        self.text = text
+        self.start = start
+        self.end = len(text) if end is None else end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return self.text[self.start + start:self.start + stop:step]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("window index out of range")
+        return self.text[self.start + index]
+
+    def find(self, sub, start=0, end=None):
+        end = len(self) if end is None else min(end, len(self))
+        index = self.text.find(sub, self.start + start, self.start + end)
+        return index - self.start if index != -1 else -1
+
+class StringMatching():
+    """
+    String matching algorithms.
+    """
+
+    def naive_algorithm(self, pattern, text, fold=None):
+        """
+        Naive algorithm for string searching.
+
+        List form of `naive_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.naive_matches(pattern, text, fold))
+
+    def naive_matches(self, pattern, text, fold=None):
+        """
+        Naive algorithm for string searching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+        
+        if fold is not None:
+            pattern = self.fold_pattern(pattern)
+            text = FoldedText(text, fold)
+        M = len(pattern) 
+        N = len(text)
+
+        for i in range(N - M + 1): 
+        
+            j = 0
+
+            while(j < M): 
+                if (text[i + j] != pattern[j]): 
+                    break
+                j += 1
+
+            if (j == M): 
+                yield i
+
+    def kmp_algorithm(self, pattern, text, lps, fold=None):
+        """
+        Knuth-Morris-Pratt string matching algorithm.
+
+        List form of `kmp_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.kmp_matches(pattern, text, lps, fold))
+
+    def kmp_matches(self, pattern, text, lps, fold=None):
+        """
+        Knuth-Morris-Pratt string matching algorithm. The text is read 
+        once, in order, so case is folded as characters are read.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        lps: `int`
+            Longest prefix that is also a suffix table.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+            
+        if fold is not None:
+            pattern = self.fold_pattern(pattern)
+            text = map(fold.get, text)
+        M = len(pattern) 
+    
+        j = 0 
+        for i, char in enumerate(text): 
+            while j != 0 and pattern[j] != char: 
+                j = lps[j-1] 
+
+            if pattern[j] == char: 
+                j += 1
+                if j == M: 
+                    yield i-M+1
+                    j = lps[j-1] 
+
+    def build_lps(self, pattern):
+        """
+        Build longest prefix that is also a suffix lookup table, for
+        KMP string matching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        Returns:
+        ----------
+        lps: `int`
+            List of longest prefix that is also a suffix for each substring 
+            length.
+
+        """
+
+
+        length = 0 
+        M = len(pattern) 
+
+        lps = [0]*M
+        lps[0] 
+        i = 1
+
+        while i < M: 
+            if pattern[i] == pattern[length]: 
+                length += 1
+                lps[i] = length
+                i += 1
+            else: 
+
+                if length != 0: 
+                    length = lps[length-1] 
+                else: 
+                    lps[i] = 0
+                    i += 1
+        
+        return lps
+
+    def boyer_moore_algorithm(self, pattern, text, bad_character, 
+                                                    good_suffix, fold=None):
+        """
+        Boyer-Moore string matching algorithm, with bad character and good 
+        suffix rules.
+
+        List form of `boyer_moore_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.boyer_moore_matches(pattern, text, bad_character,
+                                                        good_suffix, fold))
+
+    def boyer_moore_matches(self, pattern, text, bad_character, 
+                                                    good_suffix, fold=None):
+        """
+        Boyer-Moore string matching algorithm, with bad character and good 
+        suffix rules.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        bad_character: `dict`
+            Last occurrence of each pattern character.
+        good_suffix: `int`
+            Good suffix shifts, indexed by mismatch position plus one.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+
+        if fold is not None:
+            pattern = self.fold_pattern(pattern)
+            text = FoldedText(text, fold)
+        M = len(pattern)
+        N = len(text)
+
+        s = 0
+        while s <= N - M:
+            j = M - 1
+            while j >= 0 and pattern[j] == text[s + j]:
+                j -= 1
+
+            if j < 0:
+                yield s
+                s += good_suffix[0]
+            else:
+                s += max(good_suffix[j + 1], 
+                            j - bad_character.get(text[s + j], -1))
+
+    def build_bad_character_table(self, pattern, fold=None):
+        """
+        Build bad character table, for Boyer-Moore string matching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for, case folded if `fold` is given.
+        fold: `dict`
+            Case fold table, every case variant gets the entry of its
+            folded character.
+        Returns:
+        ----------
+        bad_character: `dict`
+            Index of the last occurrence of each pattern character.
+        """
+
+        bad_character = dict()
+        for i in range(len(pattern)):
+            bad_character[pattern[i]] = i
+        return self.expand_table(bad_character, fold)
+
+    def build_good_suffix_table(self, pattern):
+        """
+        Build good suffix table (strong rule), for Boyer-Moore string 
+        matching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        Returns:
+        ----------
+        shift: `int`
+            List of shifts, indexed by mismatch position plus one; the 
+            first entry is the shift after a full match.
+        """
+
+        M = len(pattern)
+        shift = [0] * (M + 1)
+        border = [0] * (M + 1)
+
+        # Borders of each pattern suffix, shifts for the cases where the 
+        # matched suffix occurs again in the pattern
+        i = M
+        j = M + 1
+        border[i] = j
+        while i > 0:
+            while j <= M and pattern[i - 1] != pattern[j - 1]:
+                if shift[j] == 0:
+                    shift[j] = j - i
+                j = border[j]
+            i -= 1
+            j -= 1
+            border[i] = j
+
+        # Shifts for the cases where only part of the matched suffix is a
+        # prefix of the pattern
+        j = border[0]
+        for i in range(M + 1):
+            if shift[i] == 0:
+                shift[i] = j
+            if i == j:
+                j = border[j]
+        return shift
+
+    def horspool_algorithm(self, pattern, text, shift, fold=None):
+        """
+        Boyer-Moore-Horspool string matching algorithm.
+
+        List form of `horspool_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.horspool_matches(pattern, text, shift, fold))
+
+    def horspool_matches(self, pattern, text, shift, fold=None):
+        """
+        Boyer-Moore-Horspool string matching algorithm.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        shift: `dict`
+            Shift for each pattern character, by its last occurrence
+            (ignoring the last position).
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+
+        M = len(pattern)
+        N = len(text)
+
+        s = 0
+        if fold is None:
+            last = pattern[M - 1]
+            while s <= N - M:
+                char = text[s + M - 1]
+                if char == last and text[s:s + M] == pattern:
+                    yield s
+                s += shift.get(char, M)
+            return
+
+        # Shifts are keyed on every case variant, only candidate windows
+        # are folded
+        get = fold.get
+        target = list(self.fold_pattern(pattern))
+        last = target[M - 1]
+        while s <= N - M:
+            char = text[s + M - 1]
+            if get(char) == last and list(map(get, text[s:s + M])) == target:
+                yield s
+            s += shift.get(char, M)
+
+    def build_horspool_table(self, pattern, fold=None):
+        """
+        Build shift table, for Boyer-Moore-Horspool string matching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for, case folded if `fold` is given.
+        fold: `dict`
+            Case fold table, every case variant gets the shift of its
+            folded character.
+        Returns:
+        ----------
+        shift: `dict`
+            Shift for each character of the pattern, except the last one.
+        """
+
+        M = len(pattern)
+        shift = dict()
+        for i in range(M - 1):
+            shift[pattern[i]] = M - 1 - i
+        return self.expand_table(shift, fold)
+
+    def two_way_algorithm(self, pattern, text, factorization, fold=None):
+        """
+        Crochemore-Perrin Two-Way string matching algorithm.
+
+        List form of `two_way_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.two_way_matches(pattern, text, factorization, fold))
+
+    def two_way_matches(self, pattern, text, factorization, fold=None):
+        """
+        Crochemore-Perrin Two-Way string matching algorithm.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        factorization: `tuple`
+            Critical position, period and whether the period is shared by
+            the whole pattern.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+
+        if fold is not None:
+            pattern = self.fold_pattern(pattern)
+            text = FoldedText(text, fold)
+        M = len(pattern)
+        N = len(text)
+        critical, period, periodic = factorization
+
+        j = 0
+        if periodic:
+            memory = -1
+            while j <= N - M:
+                i = max(critical, memory) + 1
+                while i < M and pattern[i] == text[i + j]:
+                    i += 1
+                if i >= M:
+                    i = critical
+                    while i > memory and pattern[i] == text[i + j]:
+                        i -= 1
+                    if i <= memory:
+                        yield j
+                    j += period
+                    memory = M - period - 1
+                else:
+                    j += i - critical
+                    memory = -1
+        else:
+            period = max(critical + 1, M - critical - 1) + 1
+            while j <= N - M:
+                i = critical + 1
+                while i < M and pattern[i] == text[i + j]:
+                    i += 1
+                if i >= M:
+                    i = critical
+                    while i >= 0 and pattern[i] == text[i + j]:
+                        i -= 1
+                    if i < 0:
+                        yield j
+                    j += period
+                else:
+                    j += i - critical
+
+    def build_two_way_factorization(self, pattern):
+        """
+        Build critical factorization, for Two-Way string matching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        Returns:
+        ----------
+        factorization: `tuple`
+            Critical position, period and whether the pattern is periodic.
+        """
+
+        def maximal_suffix(reverse):
+            # Position before the maximal suffix and its period, for the 
+            # given character ordering
+            M = len(pattern)
+            ms = -1
+            j = 0
+            k = period = 1
+            while j + k < M:
+                a = pattern[j + k]
+                b = pattern[ms + k]
+                if (a > b) if reverse else (a < b):
+                    j += k
+                    k = 1
+                    period = j - ms
+                elif a == b:
+                    if k != period:
+                        k += 1
+                    else:
+                        j += period
+                        k = 1
+                else:
+                    ms = j
+                    j = ms + 1
+                    k = period = 1
+            return ms, period
+
+        critical, period = maximal_suffix(False)
+        critical_reverse, period_reverse = maximal_suffix(True)
+        if critical_reverse > critical:
+            critical, period = critical_reverse, period_reverse
+
+        periodic = (pattern[:critical + 1] == 
+                    pattern[period:period + critical + 1])
+        return critical, period, periodic
+
+    def shift_or_algorithm(self, pattern, text, masks, max_errors=0, 
+                                                    edits=True, fold=None):
+        """
+        Shift-Or (Baeza-Yates-Gonnet) string matching algorithm, with
+        Wu-Manber approximate matching.
+
+        List form of `shift_or_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.shift_or_matches(pattern, text, masks, max_errors,
+                                                                edits, fold))
+
+    def shift_or_matches(self, pattern, text, masks, max_errors=0, 
+                                                    edits=True, fold=None):
+        """
+        Shift-Or (Baeza-Yates-Gonnet) string matching algorithm, in its 
+        Shift-And form: bit i of the state is set when the last i + 1 text
+        characters match the pattern prefix of that length. Set bits mark 
+        matching states, so the state never grows past the pattern length
+        and Python integers fit patterns of any length, one machine word 
+        for patterns up to 64 characters.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        masks: `dict`
+            Bit mask of pattern positions holding each character.
+        max_errors: `int`
+            Maximum number of errors in approximate matches.
+        edits: `bool`
+            Count insertions, deletions and substitutions as errors 
+            (k-edit), instead of substitutions only (k-mismatch).
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search. Masks already hold every case variant.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+
+        M = len(pattern)
+        if M == 0:
+            return
+        if max_errors:
+            if edits:
+                masks = self.reverse_masks(masks, M)
+            yield from self.approximate_matches(M, text, masks, max_errors,
+                                                                    edits)
+            return
+
+        get = masks.get
+        high = 1 << (M - 1)
+        state = 0
+        for i, char in enumerate(text):
+            state = ((state << 1) | 1) & get(char, 0)
+            if state & high:
+                yield i - M + 1
+
+    def build_shift_or_masks(self, pattern, fold=None):
+        """
+        Build character masks, for Shift-Or string matching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for, case folded if `fold` is given.
+        fold: `dict`
+            Case fold table, every case variant gets the mask of its
+            folded character.
+        Returns:
+        ----------
+        masks: `dict`
+            Mask of each pattern character, with bit i set if the character
+            is at position i.
+        """
+
+        masks = dict()
+        for i, char in enumerate(pattern):
+            masks[char] = masks.get(char, 0) | (1 << i)
+        return self.expand_table(masks, fold)
+
+    @staticmethod
+    def reverse_masks(masks, length):
+        """
+        Mirror character masks, giving the masks of the reversed pattern.
+
+        Parameters:
+        -----------
+        masks: `dict`
+            Character masks of a pattern.
+        length: `int`
+            Pattern length.
+        Returns:
+        ----------
+        masks: `dict`
+            Character masks of the reversed pattern.
+        """
+
+        return {char: int(format(mask, "0{}b".format(length))[::-1], 2)
+                for char, mask in masks.items()}
+
+    def approximate_matches(self, length, text, masks, max_errors, 
+                                                                edits=True):
+        """
+        Wu-Manber approximate string matching, running one Shift-And state
+        per number of errors d: a pattern prefix matches with up to d 
+        errors if it matches with d - 1 errors one character earlier 
+        (substitution), one text character earlier (insertion) or one 
+        pattern character earlier (deletion).
+
+        k-mismatch matches have the pattern length, so they are found 
+        scanning forward. k-edit matches vary in length, so the text is 
+        scanned backwards with the reversed pattern, and matches are 
+        reported where they start, as exact ones.
+
+        Parameters:
+        -----------
+        length: `int`
+            Pattern length.
+        text: `str`
+            Text to search in.
+        masks: `dict`
+            Character masks of the pattern for k-mismatch, of the reversed
+            pattern for k-edit.
+        max_errors: `int`
+            Maximum number of errors, lower than the pattern length.
+        edits: `bool`
+            Count insertions, deletions and substitutions as errors, 
+            instead of substitutions only.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where approximate matches start, in increasing order.
+        """
+
+        M = length
+        if max_errors >= M:
+            raise ValueError("Maximum errors must be lower than the pattern "
+                                                                    "length")
+        get = masks.get
+        high = 1 << (M - 1)
+        full = (1 << M) - 1
+        errors = range(1, max_errors + 1)
+
+        if not edits:
+            states = [0] * (max_errors + 1)
+            for i, char in enumerate(text):
+                mask = get(char, 0)
+                previous = states[0]
+                states[0] = ((previous << 1) | 1) & mask
+                for d in errors:
+                    current = states[d]
+                    states[d] = ((((current << 1) | 1) & mask) | 
+                                        (previous << 1) | 1) & full
+                    previous = current
+                if states[max_errors] & high:
+                    yield i - M + 1
+            return
+
+        # Pattern suffixes may be deleted at the end of the text
+        states = [(1 << d) - 1 for d in range(max_errors + 1)]
+        starts = list()
+        for i in range(len(text) - 1, -1, -1):
+            mask = get(text[i], 0)
+            previous = states[0]
+            states[0] = ((previous << 1) | 1) & mask
+            for d in errors:
+                current = states[d]
+                states[d] = ((((current << 1) | 1) & mask) | 
+                                (previous << 1) | previous |
+                                (states[d - 1] << 1) | 1) & full
+                previous = current
+            if states[max_errors] & high:
+                starts.append(i)
+        yield from reversed(starts)
+
+    def bndm_algorithm(self, pattern, text, masks, max_errors=0, 
+                                                    edits=True, fold=None):
+        """
+        Backward Nondeterministic DAWG Matching algorithm.
+
+        List form of `bndm_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.bndm_matches(pattern, text, masks, max_errors,
+                                                                edits, fold))
+
+    def bndm_matches(self, pattern, text, masks, max_errors=0, edits=True,
+                                                                fold=None):
+        """
+        Backward Nondeterministic DAWG Matching algorithm: each window is
+        read backwards, tracking with bit-parallelism the pattern factors 
+        matching the characters read. The window shifts past the last 
+        pattern prefix seen, or by the whole pattern length when the 
+        characters read are no pattern factor.
+
+        Skipping relies on exact factors, so approximate matches are found
+        by the Wu-Manber automaton, as with Shift-Or.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        masks: `dict`
+            Bit mask of reversed pattern positions holding each character.
+        max_errors: `int`
+            Maximum number of errors in approximate matches.
+        edits: `bool`
+            Count insertions, deletions and substitutions as errors 
+            (k-edit), instead of substitutions only (k-mismatch).
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search. Masks already hold every case variant.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+
+        M = len(pattern)
+        N = len(text)
+        if M == 0:
+            return
+        if max_errors:
+            if not edits:
+                masks = self.reverse_masks(masks, M)
+            yield from self.approximate_matches(M, text, masks, max_errors,
+                                                                    edits)
+            return
+
+        get = masks.get
+        high = 1 << (M - 1)
+        full = (1 << M) - 1
+        s = 0
+        while s <= N - M:
+            j = M
+            last = M
+            state = full
+            while state:
+                state &= get(text[s + j - 1], 0)
+                j -= 1
+                if state & high:
+                    if j > 0:
+                        last = j
+                    else:
+                        yield s
+                        break
+                state = (state << 1) & full
+            s += last
+
+    def build_bndm_masks(self, pattern, fold=None):
+        """
+        Build character masks, for BNDM string matching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for, case folded if `fold` is given.
+        fold: `dict`
+            Case fold table, every case variant gets the mask of its
+            folded character.
+        Returns:
+        ----------
+        masks: `dict`
+            Mask of each pattern character, with bit M - 1 - i set if the
+            character is at position i.
+        """
+
+        return self.build_shift_or_masks(pattern[::-1], fold)
+
+    def fold_pattern(self, pattern):
+        """
+        Fold pattern case: characters are lowercased, for bytes only ASCII
+        letters are.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to fold.
+        Returns:
+        ----------
+        pattern: `str`
+            Folded pattern, of the same length and type.
+        """
+
+        if isinstance(pattern, str):
+            return "".join(char.lower() if len(char.lower()) == 1 else char
+                            for char in pattern)
+        return bytes(pattern).translate(ASCII_LOWERCASE)
+
+    def build_fold_table(self, pattern):
+        """
+        Build case fold table, for case insensitive string matching. 
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        Returns:
+        ----------
+        fold: `dict`
+            Folded character for every case variant of the pattern 
+            characters. Other characters are not in the table, so looking
+            them up gives `None`, which is never equal to a pattern 
+            character.
+        """
+
+        fold = dict()
+        for char in pattern:
+            if isinstance(pattern, str):
+                folded = self.fold_pattern(char)
+                fold[char] = fold[folded] = folded
+                for variant in get_case_variants().get(folded, ()):
+                    fold[variant] = folded
+            else:
+                folded = ASCII_LOWERCASE[char]
+                for variant in (char, folded, ASCII_UPPERCASE[char]):
+                    fold[variant] = folded
+        return fold
+
+    @staticmethod
+    def expand_table(table, fold=None):
+        """
+        Give every case variant the entry of its folded character.
+
+        Parameters:
+        -----------
+        table: `dict`
+            Lookup table keyed by folded pattern characters, updated in 
+            place.
+        fold: `dict`
+            Case fold table, nothing is done if `None`.
+
+        Returns:
+        ----------
+        table: `dict`
+            Expanded table.
+        """
+
+        if fold is not None:
+            for variant, folded in fold.items():
+                if folded in table:
+                    table[variant] = table[folded]
+        return table
+
+    def numpy_algorithm(self, pattern, text, fold=None):
+        """
+        Vectorized string matching, with NumPy (optional dependency).
+
+        List form of `numpy_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        # Imported here, so NumPy is only loaded when this algorithm is used
+        from .numpy_backend import find_matches
+        return find_matches(pattern, text, fold=fold).tolist()
+
+    def numpy_matches(self, pattern, text, fold=None):
+        """
+        Vectorized string matching, with NumPy (optional dependency).
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in, may also be bytes, a buffer or a `uint8`
+            array.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `iterator`
+            Indices where matches where found, in increasing order.
+        """
+
+        return iter(StringMatching.numpy_algorithm(self, pattern, text, fold))
+
+    def find_algorithm(self, pattern, text, period, fold=None):
+        """
+        String matching with the C-level `find` method of the text.
+
+        List form of `find_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.find_matches(pattern, text, period, fold))
+
+    def find_matches(self, pattern, text, period, fold=None):
+        """
+        String matching with the C-level `find` method of the text. After
+        a match the search resumes one pattern period later, so 
+        overlapping matches are found too. Case insensitive search, and 
+        buffers without `find` (such as `memoryview`), use a compiled 
+        regular expression instead.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        period: `int`
+            Smallest pattern period, minimum distance between matches.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+
+        if fold is not None or not hasattr(text, "find"):
+            yield from self.regex_matches(pattern, text, 
+                                self.build_regex(pattern, fold), period)
+            return
+
+        i = text.find(pattern)
+        while i != -1:
+            yield i
+            i = text.find(pattern, i + period)
+
+    def regex_algorithm(self, pattern, text, expression, period, fold=None):
+        """
+        String matching with a compiled regular expression.
+
+        List form of `regex_matches`, which documents the parameters.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        return list(self.regex_matches(pattern, text, expression, period, 
+                                                                    fold))
+
+    def regex_matches(self, pattern, text, expression, period, fold=None):
+        """
+        String matching with a compiled regular expression. Patterns that
+        can not overlap (period equal to length) are found with 
+        `finditer`, others by searching again one period after each match,
+        as lookahead expressions lose the literal prefix scan.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in, or any buffer.
+        expression: `re.Pattern`
+            Compiled expression, as built by `build_regex`.
+        period: `int`
+            Smallest pattern period, minimum distance between matches.
+        fold: `dict`
+            Case fold table, already applied by `expression`.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+
+        start = 0
+        end = len(text)
+        if isinstance(text, TextView):
+            # A window of a str is searched between its bounds
+            text, start, end = text.text, text.start, text.end
+
+        if period >= len(pattern):
+            for match in expression.finditer(text, start, end):
+                yield match.start() - start
+            return
+
+        match = expression.search(text, start, end)
+        while match is not None:
+            yield match.start() - start
+            match = expression.search(text, match.start() + period, end)
+
+    def build_period(self, pattern):
+        """
+        Build smallest pattern period, for find and regex string matching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        Returns:
+        ----------
+        period: `int`
+            Pattern length minus its longest border.
+        """
+
+        return len(pattern) - self.build_lps(pattern)[-1]
+
+    def build_regex(self, pattern, fold=None):
+        """
+        Compile pattern as a regular expression. With a fold table, each
+        character becomes a class of its case variants, matching exactly 
+        what the other engines match.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        fold: `dict`
+            Case fold table.
+        Returns:
+        ----------
+        expression: `re.Pattern`
+            Compiled expression.
+        """
+
+        escape = lambda char: re.escape(char if isinstance(char, str) 
+                                                        else bytes([char]))
+        empty = pattern[:0]
+        if fold is None:
+            return re.compile(re.escape(pattern))
+
+        variants = dict()
+        for variant, folded in fold.items():
+            variants.setdefault(folded, []).append(escape(variant))
+        parts = list()
+        for char in self.fold_pattern(pattern):
+            options = sorted(variants[char])
+            if len(options) == 1:
+                parts.append(options[0])
+            else:
+                open_class, close_class = (("[", "]") if isinstance(empty, 
+                                                str) else (b"[", b"]"))
+                parts.append(open_class + empty.join(options) + close_class)
+        return re.compile(empty.join(parts))
+
+    def choose_algorithm(self, pattern, ignore_case=False, buffer=False,
+                                                max_errors=0, sample=None):
+        """
+        Choose the fastest algorithm for a search. Given a sample of the 
+        text, the candidate engines (`SAMPLED`, or `APPROXIMATE` for 
+        approximate search) are timed over it and the fastest is chosen, 
+        see `time_algorithms`. Otherwise it is chosen by heuristics, 
+        measured on CPython: C-level engines are always faster than the 
+        Python ones, even Horspool with long patterns. A literal regular
+        expression scans as fast as `find` and yields dense matches faster,
+        but overlapping patterns need repeated searches, where `find` 
+        calls are cheaper. Case insensitive search, and buffers without
+        `find`, need the regular expression.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        ignore_case: `bool`
+            Case insensitive search.
+        buffer: `bool`
+            Text is a buffer such as `memoryview`, without `find` method.
+        max_errors: `int`
+            Maximum number of errors, approximate search requires Shift-Or
+            or BNDM.
+        sample: `str`
+            Start of the text, of the pattern type, up to `SAMPLE_SIZE` 
+            characters. Heuristics are used when it is shorter than the 
+            pattern.
+
+        Returns:
+        ----------
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+        reason: `str`
+            Why the algorithm was chosen.
+        """
+
+        if sample is not None and len(sample) >= len(pattern):
+            candidates = APPROXIMATE if max_errors else SAMPLED
+            if buffer:
+                candidates = [c for c in candidates if c != "find"]
+            timings = self.time_algorithms(pattern, sample, candidates, 
+                                                    ignore_case, max_errors)
+            algorithm = min(timings, key=timings.get)
+            return algorithm, ("fastest on a {} character sample, {:.2f} ms"
+                        .format(len(sample), timings[algorithm] * 1000))
+
+        if max_errors:
+            return "shift_or", "approximate search, Wu-Manber automaton"
+        if ignore_case:
+            return "regex", "case insensitive, regex with case classes"
+        if buffer:
+            return "regex", "buffer text has no find method"
+        if self.build_period(pattern) < len(pattern):
+            return "find", "pattern may overlap itself, find loop"
+        return "regex", "pattern can not overlap itself, regex finditer"
+
+    def time_algorithms(self, pattern, sample, algorithms=SAMPLED, 
+                                            ignore_case=False, max_errors=0):
+        """
+        Time algorithms counting the matches of a pattern in a sample of 
+        the text. Lookup tables are built before timing, as they are built 
+        once per search.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        sample: `str`
+            Sample of the text, such as its first `SAMPLE_SIZE` characters.
+        algorithms: `str`
+            List of algorithm names, from `ALGORITHMS`.
+        ignore_case: `bool`
+            Case insensitive search.
+        max_errors: `int`
+            Maximum number of errors in approximate matches.
+
+        Returns:
+        ----------
+        timings: `dict`
+            Algorithm name to search time, in seconds.
+        """
+
+        timings = dict()
+        for algorithm in algorithms:
+            args = self.preprocess(algorithm, pattern, ignore_case, 
+                                                                max_errors)
+            search = getattr(self, "{}_matches".format(algorithm))
+            start = time.perf_counter()
+            self.apply_mode(search(pattern, sample, *args), "count")
+            timings[algorithm] = time.perf_counter() - start
+        return timings
+
+    def suffix_array_range(self, pattern, text, suffix_array):
+        """
+        Binary search for the suffixes starting with pattern, in 
+        O(m log N) time.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Indexed text.
+        suffix_array: `int`
+            Start indices of the text suffixes, in lexicographic order.
+
+        Returns:
+        --------
+        bounds: `tuple`
+            First and past-the-last suffix array positions of suffixes
+            starting with pattern.
+        """
+
+        M = len(pattern)
+
+        low, high = 0, len(suffix_array)
+        while low < high:
+            middle = (low + high) // 2
+            if text[suffix_array[middle]:suffix_array[middle] + M] < pattern:
+                low = middle + 1
+            else:
+                high = middle
+        lower_bound = low
+
+        high = len(suffix_array)
+        while low < high:
+            middle = (low + high) // 2
+            if text[suffix_array[middle]:suffix_array[middle] + M] == pattern:
+                low = middle + 1
+            else:
+                high = middle
+        return lower_bound, low
+
+    def index_count(self, pattern, text, suffix_array):
+        """
+        Count pattern occurrences using a suffix array.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Indexed text.
+        suffix_array: `int`
+            Start indices of the text suffixes, in lexicographic order.
+
+        Returns:
+        --------
+        count: `int`
+            Number of matches.
+        """
+
+        lower_bound, upper_bound = self.suffix_array_range(pattern, text,
+                                                                suffix_array)
+        return upper_bound - lower_bound
+
+    def index_algorithm(self, pattern, text, suffix_array):
+        """
+        Locate pattern occurrences using a suffix array.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Indexed text.
+        suffix_array: `int`
+            Start indices of the text suffixes, in lexicographic order.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        lower_bound, upper_bound = self.suffix_array_range(pattern, text,
+                                                                suffix_array)
+        return sorted(suffix_array[lower_bound:upper_bound])
+
+    def preprocess(self, algorithm, pattern, ignore_case=False, 
+                                                max_errors=0, edits=True):
+        """
+        Build the lookup tables needed by the given algorithm.
+
+        Parameters:
+        -----------
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+        pattern: `str`
+            Pattern to search for.
+        ignore_case: `bool`
+            Build tables for case insensitive search, on the folded 
+            pattern, and add the case fold table as last argument.
+        max_errors: `int`
+            Maximum number of errors in approximate matches, for 
+            `APPROXIMATE` algorithms.
+        edits: `bool`
+            Count insertions, deletions and substitutions as errors, 
+            instead of substitutions only.
+
+        Returns:
+        ----------
+        args: `tuple`
+            Extra arguments passed to the algorithm after the text.
+        """
+
+        fold = None
+        if ignore_case:
+            fold, pattern = case_fold(pattern)
+
+        if algorithm == "kmp":
+            args = (self.build_lps(pattern),)
+        elif algorithm == "boyer_moore":
+            args = (self.build_bad_character_table(pattern, fold), 
+                    self.build_good_suffix_table(pattern))
+        elif algorithm == "horspool":
+            args = (self.build_horspool_table(pattern, fold),)
+        elif algorithm == "two_way":
+            args = (self.build_two_way_factorization(pattern),)
+        elif algorithm == "find":
+            args = (self.build_period(pattern),)
+        elif algorithm == "regex":
+            args = (self.build_regex(pattern, fold), 
+                    self.build_period(pattern))
+        elif algorithm == "shift_or":
+            args = (self.build_shift_or_masks(pattern, fold), max_errors,
+                    edits)
+        elif algorithm == "bndm":
+            args = (self.build_bndm_masks(pattern, fold), max_errors, edits)
+        else:
+            args = ()
+        if max_errors and algorithm not in APPROXIMATE:
+            raise ValueError("Approximate matching requires one of {}".format(
+                                                    ", ".join(APPROXIMATE)))
+        if max_errors >= max(len(pattern), 1):
+            raise ValueError("Maximum errors must be lower than the pattern "
+                                                                    "length")
+        return args + (fold,) if ignore_case else args
+
+    @staticmethod
+    def get_overlap(pattern, algorithm=None, *args):
+        """
+        Number of characters a segment scan extends past the segment end,
+        so matches starting in the segment are found whole.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+        args:
+            Extra algorithm arguments, as built by `preprocess`.
+
+        Returns:
+        ----------
+        overlap: `int`
+            `len(pattern) - 1`, plus the maximum number of errors for
+            approximate matching, as insertions make matches longer.
+        """
+
+        overlap = max(len(pattern) - 1, 0)
+        if algorithm in APPROXIMATE:
+            overlap += args[1]
+        return overlap
+
+    def search(self, algorithm, pattern, text, *args, mode="all", k=1):
+        """
+        Search for pattern with the given algorithm and query mode.
+
+        Parameters:
+        -----------
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text to search in.
+        args:
+            Extra algorithm arguments, as built by `preprocess`.
+        mode: `str`
+            Query mode, one of `MODES`.
+        k: `int`
+            Number of matches returned in 'first-k' mode.
+
+        Returns:
+        --------
+        result:
+            List of indices in 'all' and 'first-k' modes, number of 
+            matches in 'count' mode, `bool` in 'exists' mode.
+        """
+
+        matches = getattr(self, "{}_matches".format(algorithm))(pattern, 
+                                                                text, *args)
+        return self.apply_mode(matches, mode, k)
+
+    @staticmethod
+    def apply_mode(matches, mode="all", k=1):
+        """
+        Consume matches according to query mode, stopping as soon as the
+        mode allows it. 'count' mode keeps no match objects.
+
+        Parameters:
+        -----------
+        matches: `iterator`
+            Indices where matches where found, in increasing order.
+        mode: `str`
+            Query mode, one of `MODES`.
+        k: `int`
+            Number of matches returned in 'first-k' mode.
+
+        Returns:
+        --------
+        result:
+            List of indices in 'all' and 'first-k' modes, number of 
+            matches in 'count' mode, `bool` in 'exists' mode.
+        """
+
+        if mode == "count":
+            return sum(1 for _ in matches)
+        elif mode == "exists":
+            return next(iter(matches), None) is not None
+        elif mode == "first-k":
+            return list(islice(matches, k))
+        return list(matches)
+
+class CompiledPattern():
+    """
+    Pattern with the lookup tables of one algorithm, built once, similar 
+    to the result of `re.compile`. Use `compile_pattern` to share them 
+    between queries.
+    """
+
+    def __init__(self, pattern, algorithm="kmp", ignore_case=False,
+                                                max_errors=0, edits=True):
+        """
+        Build lookup tables.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+        ignore_case: `bool`
+            Case insensitive search.
+        max_errors: `int`
+            Maximum number of errors in approximate matches.
+        edits: `bool`
+            Count insertions, deletions and substitutions as errors, 
+            instead of substitutions only.
+        """
+
+        self.pattern = pattern
+        self.algorithm = algorithm
+        self.ignore_case = ignore_case
+        self.max_errors = max_errors
+        self.edits = edits
+        self.args = StringMatching().preprocess(algorithm, pattern, 
+                                            ignore_case, max_errors, edits)
+
+    def matches(self, text):
+        """
+        Search for pattern in text.
+
+        Parameters:
+        -----------
+        text: `str`
+            Text to search in.
+
+        Returns:
+        --------
+        matches: `generator`
+            Indices where matches where found, in increasing order.
+        """
+
+        return getattr(StringMatching(), "{}_matches".format(
+                        self.algorithm))(self.pattern, text, *self.args)
+
+    def search(self, text, mode="all", k=1):
+        """
+        Search for pattern in text, with the given query mode.
+
+        Parameters:
+        -----------
+        text: `str`
+            Text to search in.
+        mode: `str`
+            Query mode, one of `MODES`.
+        k: `int`
+            Number of matches returned in 'first-k' mode.
+
+        Returns:
+        --------
+        result:
+            List of indices in 'all' and 'first-k' modes, number of 
+            matches in 'count' mode, `bool` in 'exists' mode.
+        """
+
+        return StringMatching.apply_mode(self.matches(text), mode, k)
+
+    def __repr__(self):
+        return "CompiledPattern({!r}, {!r}, ignore_case={}, "\
+                "max_errors={})".format(self.pattern, self.algorithm, 
+                                        self.ignore_case, self.max_errors)
+
+# Compiled patterns of the latest queries, keyed by pattern, algorithm and
+# flags. Each process has its own cache
+compiled_patterns = lru_cache(maxsize=PATTERN_CACHE_SIZE)(CompiledPattern)
+
+def compile_pattern(pattern, algorithm="kmp", ignore_case=False, 
+                                                max_errors=0, edits=True):
+    """
+    Get the compiled pattern for a query, built on first use and kept in a
+    bounded cache, the least recently used pattern being evicted first.
+
+    Parameters:
+    -----------
+    pattern: `str`
+        Pattern to search for.
+    algorithm: `str`
+        Algorithm name, one of `ALGORITHMS`.
+    ignore_case: `bool`
+        Case insensitive search.
+    max_errors: `int`
+        Maximum number of errors in approximate matches.
+    edits: `bool`
+        Count insertions, deletions and substitutions as errors, instead 
+        of substitutions only.
+
+    Returns:
+    --------
+    compiled: `CompiledPattern`
+        Compiled pattern, shared by every query with the same arguments.
+        Its tables must not be modified.
+    """
+
+    return compiled_patterns(pattern, algorithm, bool(ignore_case), 
+                                        int(max_errors), bool(edits))
+
+# Case fold tables and folded forms of the latest patterns, keyed by 
+# pattern. Each process has its own cache
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def folded_patterns(pattern):
+    matching = StringMatching()
+    return matching.build_fold_table(pattern), matching.fold_pattern(pattern)
+
+def case_fold(pattern):
+    """
+    Get the case fold table and the folded form of a pattern, built on 
+    first use and kept in a bounded cache, so compiling the pattern for 
+    another algorithm does not fold it again.
+
+    Parameters:
+    -----------
+    pattern: `str` or `bytes`
+        Pattern to fold, other buffers are read as `bytes`.
+
+    Returns:
+    --------
+    fold: `dict`
+        Case fold table, as built by `StringMatching.build_fold_table`. 
+        It is shared and must not be modified.
+    pattern: `str` or `bytes`
+        Folded pattern.
+    """
+
+    if not isinstance(pattern, (str, bytes)):
+        pattern = bytes(pattern)
+    return folded_patterns(pattern)
+
+class StreamingStringMatching(StringMatching):
+    """
+    String matching over fixed-size buffers, for inputs larger than memory.
+    """
+
+    def search_stream(self, pattern, stream, algorithm="kmp",
+                        buffer_size=DEFAULT_BUFFER_SIZE, ignore_case=True,
+                        max_errors=0, edits=True, encoding=None):
+        """
+        Search for pattern in a binary stream, one buffer at a time.
+
+        The last bytes of each buffer that could still start a match, as
+        many as `get_overlap`, are carried over to the next one, so matches
+        crossing buffer boundaries are found exactly once.
+
+        Parameters:
+        -----------
+        pattern: `bytes`
+            Pattern to search for, `str` patterns are encoded.
+        stream:
+            Binary file object to read from.
+        algorithm: `str`
+            Algorithm used on each buffer, one of `ALGORITHMS`.
+        buffer_size: `int`
+            Number of bytes read at a time.
+        ignore_case: `bool`
+            Ignore ASCII letters case.
+        max_errors: `int`
+            Maximum number of errors, for approximate algorithms.
+        edits: `bool`
+            Count insertions and deletions as errors, besides substitutions.
+        encoding: `str`
+            Text encoding of the stream, used for `str` patterns, defaults 
+            to UTF-8.
+
+        Returns:
+        --------
+        matches: `generator`
+            Stream offsets where matches where found.
+        """
+
+        if isinstance(pattern, str):
+            pattern = pattern.encode(encoding or "utf-8")
+        compiled = compile_pattern(pattern, algorithm, ignore_case,
+                                                        max_errors, edits)
+        overlap = self.get_overlap(pattern, algorithm, *compiled.args)
+
+        carry = b""
+        position = 0
+        while True:
+            chunk = stream.read(buffer_size)
+            if not chunk:
+                break
+
+            window = carry + chunk
+            owned = max(len(window) - overlap, 0)
+            for match in takewhile(lambda i: i < owned,
+                                                compiled.matches(window)):
+                yield position + match
+
+            carry = window[owned:]
+            position += owned
+
+        # Approximate matches may be shorter than the carried bytes
+        if algorithm in APPROXIMATE:
+            for match in compiled.matches(carry):
+                yield position + match
+
+    def search_file(self, pattern, path, algorithm="kmp",
+                        buffer_size=DEFAULT_BUFFER_SIZE, ignore_case=True,
+                        max_errors=0, edits=True, encoding=None):
+        """
+        Search for pattern in a file, one buffer at a time. Compressed
+        files are decompressed on the fly.
+
+        Parameters:
+        -----------
+        pattern: `bytes`
+            Pattern to search for, `str` patterns are encoded.
+        path: `str`
+            Path to input file, plain or in one of `COMPRESSIONS`.
+        algorithm: `str`
+            Algorithm used on each buffer, one of `ALGORITHMS`.
+        buffer_size: `int`
+            Number of bytes read at a time.
+        ignore_case: `bool`
+            Ignore ASCII letters case.
+        max_errors: `int`
+            Maximum number of errors, for approximate algorithms.
+        edits: `bool`
+            Count insertions and deletions as errors, besides substitutions.
+        encoding: `str`
+            Text encoding of the file, used for `str` patterns, defaults to
+            UTF-8.
+
+        Returns:
+        --------
+        matches: `generator`
+            Offsets in the (decompressed) file where matches where found.
+        """
+
+        from .compressed import open_compressed
+
+        with open_compressed(path) as file:
+            yield from self.search_stream(pattern, file, algorithm, 
+                                            buffer_size, ignore_case,
+                                            max_errors, edits, encoding)
+
+class ParallelStringMatching(StringMatching):
+    """
+    String matching algorithms adapted for parallel execution.
+    """
+
+    def result_shifting(self, matches, lower_limit, upper_limit=None):
+        """
+        Shift parallel results to match original text indices.
+
+        Parameters:
+        -----------
+        matches: `int`
+            Array of string matches indices
+        lower_limit: `int`
+            Lower segment limit
+        upper_limit: `int`
+            Upper segment limit, matches starting at or after it belong to 
+            the next segment and are dropped
+        
+        Returns:
+        ----------
+        matches: `int`
+            Corrected array of string matches indices
+        """
+
+        matches[:] = [i + lower_limit for i in matches]
+        if upper_limit is not None:
+            del matches[bisect_left(matches, upper_limit):]
+        return matches
+
+    def naive_algorithm(self, pattern, text, segment, fold=None):
+        """
+        Parallel adapted naive algorithm for string searching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().naive_algorithm(pattern, text, fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def kmp_algorithm(self, pattern, text, segment, lps, fold=None):
+        """
+        Parallel adapted KMP algorithm for string searching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        lps: `int`
+            Longest prefix that is also a suffix table.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().kmp_algorithm(pattern, text, lps, fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def boyer_moore_algorithm(self, pattern, text, segment, bad_character,
+                                                    good_suffix, fold=None):
+        """
+        Parallel adapted Boyer-Moore algorithm for string searching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        bad_character: `dict`
+            Last occurrence of each pattern character.
+        good_suffix: `int`
+            Good suffix shifts, indexed by mismatch position plus one.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().boyer_moore_algorithm(pattern, text, bad_character,
+                                                        good_suffix, fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def horspool_algorithm(self, pattern, text, segment, shift, fold=None):
+        """
+        Parallel adapted Horspool algorithm for string searching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        shift: `dict`
+            Shift for each pattern character, by its last occurrence
+            (ignoring the last position).
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().horspool_algorithm(pattern, text, shift, fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def two_way_algorithm(self, pattern, text, segment, factorization, 
+                                                                fold=None):
+        """
+        Parallel adapted Two-Way algorithm for string searching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        factorization: `tuple`
+            Critical position, period and whether the period is shared by
+            the whole pattern.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().two_way_algorithm(pattern, text, factorization,
+                                                                    fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def numpy_algorithm(self, pattern, text, segment, fold=None):
+        """
+        Parallel adapted vectorized algorithm for string searching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().numpy_algorithm(pattern, text, fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def find_algorithm(self, pattern, text, segment, period, fold=None):
+        """
+        Parallel adapted find loop for string searching.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        period: `int`
+            Smallest pattern period, minimum distance between matches.
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().find_algorithm(pattern, text, period, fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def regex_algorithm(self, pattern, text, segment, expression, period,
+                                                                fold=None):
+        """
+        Parallel adapted regular expression search.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        expression: `re.Pattern`
+            Compiled expression, as built by `build_regex`.
+        period: `int`
+            Smallest pattern period, minimum distance between matches.
+        fold: `dict`
+            Case fold table, already applied by `expression`.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().regex_algorithm(pattern, text, expression, period,
+                                                                    fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def shift_or_algorithm(self, pattern, text, segment, masks, 
+                                    max_errors=0, edits=True, fold=None):
+        """
+        Parallel adapted Shift-Or algorithm for string searching. Text 
+        must extend `max_errors` characters further than for exact search.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        masks: `dict`
+            Bit mask of pattern positions holding each character.
+        max_errors: `int`
+            Maximum number of errors in approximate matches.
+        edits: `bool`
+            Count insertions, deletions and substitutions as errors 
+            (k-edit), instead of substitutions only (k-mismatch).
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search. Masks already hold every case variant.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().shift_or_algorithm(pattern, text, masks, 
+                                                    max_errors, edits, fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def bndm_algorithm(self, pattern, text, segment, masks, max_errors=0,
+                                                    edits=True, fold=None):
+        """
+        Parallel adapted BNDM algorithm for string searching. Text must 
+        extend `max_errors` characters further than for exact search.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries [lower, upper]: matches are shifted by the 
+            lower limit, those starting at or after the upper one are 
+            dropped.
+        masks: `dict`
+            Bit mask of reversed pattern positions holding each character.
+        max_errors: `int`
+            Maximum number of errors in approximate matches.
+        edits: `bool`
+            Count insertions, deletions and substitutions as errors 
+            (k-edit), instead of substitutions only (k-mismatch).
+        fold: `dict`
+            Case fold table built by `build_fold_table`, for case 
+            insensitive search. Masks already hold every case variant.
+
+        Returns:
+        --------
+        matches: `int`
+            List of indices where mathces where found.
+        """
+
+        matches = super().bndm_algorithm(pattern, text, masks, max_errors,
+                                                                edits, fold)
+        return self.result_shifting(matches, segment[0], segment[1])
+
+    def segment_algorithm(self, pattern, text, segment, algorithm, *args, 
+                                            mode="all", k=1, counter=None):
+        """
+        Parallel adapted search with any algorithm and query mode.
+
+        Parameters:
+        -----------
+        pattern: `str`
+            Pattern to search for.
+        text: `str`
+            Text segment to search in.
+        segment: `int`
+            Segment boundaries
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+        args:
+            Extra algorithm arguments, as built by `preprocess`.
+        mode: `str`
+            Query mode, one of `MODES`.
+        k: `int`
+            Number of matches returned in 'first-k' mode.
+        counter: `list`
+            One-item list, incremented by the number of text characters 
+            read, for engines in `COUNTED`.
+
+        Returns:
+        --------
+        result:
+            Compact `array` of indices in 'all' mode, list of indices in 
+            'first-k' mode, number of matches in 'count' mode, `bool` in 
+            'exists' mode.
+        """
+
+        if counter is not None and algorithm in COUNTED:
+            text = CountingText(text)
+        size = segment[1] - segment[0]
+        matches = getattr(self, "{}_matches".format(algorithm))(pattern, 
+                                                                text, *args)
+        owned = takewhile(lambda i: i < size, matches)
+        if mode == "all":
+            result = self.shift_array(array("q", owned), segment[0])
+        else:
+            result = self.apply_mode((i + segment[0] for i in owned), 
+                                                                mode, k)
+        if isinstance(text, CountingText):
+            counter[0] += text.reads
+        return result
+
+    @staticmethod
+    def shift_array(matches, offset):
+        """
+        Shift segment matches to text indices, adding the segment offset 
+        once over the whole array.
+
+        Parameters:
+        -----------
+        matches: `array`
+            Compact array of segment indices, of 'q' items.
+        offset: `int`
+            Lower segment limit.
+
+        Returns:
+        --------
+        matches: `array`
+            The array of text indices, shifted in place with NumPy, or a 
+            new array shifted in C otherwise.
+        """
+
+        if not offset or not matches:
+            return matches
+        from .numpy_backend import np, add_offset
+        if np is None:
+            return array("q", map(offset.__add__, matches))
+        add_offset(matches, offset)
+        return matches
+
+    @staticmethod
+    def choose_executor(algorithm):
+        """
+        Choose between processes and threads for a parallel search. Threads
+        share the loaded text, without forking, pickling segments or 
+        sending results back, but only run Python code in parallel on a 
+        free-threaded interpreter, or in engines releasing the GIL.
+
+        Parameters:
+        -----------
+        algorithm: `str`
+            Algorithm name, one of `ALGORITHMS`.
+
+        Returns:
+        ----------
+        executor: `str`
+            Executor name, one of `EXECUTORS`.
+        reason: `str`
+            Why the executor was chosen.
+        """
+
+        if not getattr(sys, "_is_gil_enabled", lambda: True)():
+            return "thread", "free-threaded interpreter"
+        if algorithm in GIL_RELEASING:
+            return "thread", "{} releases the GIL".format(algorithm)
+        return "process", "{} holds the GIL".format(algorithm)
+
+    @staticmethod
+    def init_worker(event, compiled=None):
+        """
+        Pool initializer, sharing the stop event and the compiled pattern 
+        with workers, so lookup tables are sent once per worker instead 
+        of once per task.
+
+        Parameters:
+        -----------
+        event: `multiprocessing.Event`
+            Event set when enough matches were found.
+        compiled: `CompiledPattern`
+            Compiled pattern, whose tables are added to every task.
+        """
+
+        global stop_event, worker_pattern
+        stop_event = event
+        worker_pattern = compiled
+        # Forked workers inherit profilers run by the parent, which would
+        # slow them down. tracemalloc is only tracing if it was imported
+        sys.setprofile(None)
+        tracing = sys.modules.get("tracemalloc")
+        if tracing is not None and tracing.is_tracing():
+            tracing.stop()
+
+    def run_task(self, task):
+        """
+        Run a search task, for pools mapping a single argument such as
+        `imap_unordered`. Tasks started after the stop event was set are
+        skipped.
+
+        Parameters:
+        -----------
+        task: `tuple`
+            Segment lower limit, name of the search method, its arguments
+            and its keyword arguments. The tables of the worker compiled 
+            pattern, if any, are added to the arguments.
+
+        Returns:
+        --------
+        result: `tuple`
+            Segment lower limit and method result, so results can be
+            merged in text order.
+        """
+
+        lower_limit, method, args, kwargs = task
+        if stop_event is not None and stop_event.is_set():
+            return lower_limit, self.apply_mode(iter(()), 
+                                kwargs.get("mode", "all"), kwargs.get("k", 1))
+        if worker_pattern is not None:
+            args = args + worker_pattern.args
+        result = getattr(self, method)(*args, **kwargs)
+        if isinstance(result, array):
+            result = self.share_matches(result)
+        return lower_limit, result
+
+    def run_timed_task(self, task):
+        """
+        Run a search task as `run_task`, also timing it. Text characters 
+        read are counted when the task keyword arguments hold a `counter`.
+
+        Parameters:
+        -----------
+        task: `tuple`
+            Segment lower limit, name of the search method, its arguments
+            and its keyword arguments, the segment being the third 
+            argument.
+
+        Returns:
+        --------
+        result: `tuple`
+            Segment lower limit, method result and `TaskStats`.
+        """
+
+        lower_limit, method, args, kwargs = task
+        if "counter" in kwargs:
+            kwargs = dict(kwargs, counter=[0])
+        start = time.time()
+        lower_limit, result = self.run_task((lower_limit, method, args, 
+                                                                    kwargs))
+        end = time.time()
+        return lower_limit, result, self.task_stats(args[2], start, end, 
+                                            result, kwargs.get("counter"))
+
+    @staticmethod
+    def task_stats(segment, start, end, result, counter=None):
+        """
+        Build the statistics of a search task.
+
+        Parameters:
+        -----------
+        segment: `int`
+            Segment boundaries [start, end].
+        start: `float`
+            Time the task started, in seconds since the epoch.
+        end: `float`
+            Time the task ended, in seconds since the epoch.
+        result:
+            Task result, for any query mode.
+        counter: `list`
+            Counter of text characters read, if they were counted.
+
+        Returns:
+        --------
+        stats: `TaskStats`
+            Task statistics, the worker being named after the process, or
+            the thread in the main process.
+        """
+
+        if isinstance(result, SharedMatches):
+            matches = result.length
+        elif isinstance(result, (bool, int)):
+            matches = int(result)
+        else:
+            matches = len(result)
+        worker = current_process().name
+        if worker == "MainProcess":
+            worker = current_thread().name
+        return TaskStats(worker, segment[0], segment[1] - segment[0], start,
+                            end, matches, counter[0] if counter else None)
+
+    @staticmethod
+    def share_matches(matches):
+        """
+        Copy match indices into a new shared memory block, so they are not
+        pickled back to the parent process. The block is released by the
+        `MatchResults` it is added to.
+
+        Parameters:
+        -----------
+        matches: `array`
+            Compact array of match indices
+
+        Returns:
+        --------
+        matches: `SharedMatches`
+            Name of the shared memory block and number of matches, or the
+            array itself if it is empty or shared memory is unavailable.
+        """
+
+        if shared_memory is None or not len(matches):
+            return matches
+
+        data = memoryview(matches).cast("B")
+        block = shared_memory.SharedMemory(create=True, size=len(data))
+        block.buf[:len(data)] = data
+        block.close()
+        return SharedMatches(block.name, len(matches))
+
+    @staticmethod
+    def prepare_sharing():
+        """
+        Start the shared memory tracker before creating a pool, so workers
+        and parent share it and blocks created by workers outlive them.
+        """
+
+        if shared_memory is not None:
+            resource_tracker.ensure_running()
+
+    def mmap_algorithm(self, path, pattern, segment, algorithm, *args, 
+                                            mode="all", k=1, counter=None):
+        """
+        Memory-mapped string search over a byte range of a file.
+
+        The worker maps the file itself and scans a zero-copy view of its
+        segment, so only the path, the segment boundaries and the pattern
+        are sent to it, and only the match offsets are sent back.
+
+        Parameters:
+        -----------
+        path: `str`
+            Path to input file.
+        pattern: `bytes`
+            Pattern to search for.
+        segment: `int`
+            Byte boundaries [start, end] of the segment. The scan extends 
+            `len(pattern) - 1` bytes past the end.
+        algorithm: `str`
+            Algorithm used on the segment, one of `ALGORITHMS`.
+        args:
+            Extra algorithm arguments, as built by `preprocess`.
+        mode: `str`
+            Query mode, one of `MODES`.
+        k: `int`
+            Number of matches returned in 'first-k' mode.
+        counter: `list`
+            Counter of text characters read, see `segment_algorithm`.
+
+        Returns:
+        --------
+        matches: `int`
+            List of file offsets where matches where found, or the result
+            of the query mode.
+        """
+
+        if segment[1] <= segment[0]:
+            return self.apply_mode(iter(()), mode, k)
+
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self.buffer_algorithm(mm, pattern, segment, algorithm, 
+                                    *args, mode=mode, k=k, counter=counter)
+
+    def buffer_algorithm(self, buffer, pattern, segment, algorithm, *args,
+                                            mode="all", k=1, counter=None):
+        """
+        String search over a range of an already loaded or mapped buffer,
+        through a zero-copy view. A str is searched in place by the 
+        `BOUNDED` engines, the others read a copy of the range.
+
+        Parameters:
+        -----------
+        buffer:
+            Object supporting the buffer protocol, such as a `mmap`, or 
+            `str`.
+        pattern: `bytes`
+            Pattern to search for, `str` for a `str` buffer.
+        segment: `int`
+            Boundaries [start, end] of the segment. The scan extends 
+            `len(pattern) - 1` characters past the end.
+        algorithm: `str`
+            Algorithm used on the segment, one of `ALGORITHMS`.
+        args:
+            Extra algorithm arguments, as built by `preprocess`.
+        mode: `str`
+            Query mode, one of `MODES`.
+        k: `int`
+            Number of matches returned in 'first-k' mode.
+        counter: `list`
+            Counter of text characters read, see `segment_algorithm`.
+
+        Returns:
+        --------
+        matches: `int`
+            List of buffer offsets where matches where found, or the result
+            of the query mode.
+        """
+
+        if segment[1] <= segment[0]:
+            return self.apply_mode(iter(()), mode, k)
+
+        upper_limit = ParallelPreprocessing.get_scan_limit(segment, 
+                        len(buffer), self.get_overlap(pattern, algorithm, 
+                                                                    *args))
+        if isinstance(buffer, str):
+            if algorithm in BOUNDED:
+                window = TextView(buffer, segment[0], upper_limit)
+            else:
+                window = buffer[segment[0]:upper_limit]
+            return self.segment_algorithm(pattern, window, segment, 
+                            algorithm, *args, mode=mode, k=k, counter=counter)
+
+        view = memoryview(buffer)[segment[0]:upper_limit]
+        try:
+            return self.segment_algorithm(pattern, view, segment, algorithm,
+                                    *args, mode=mode, k=k, counter=counter)
+        finally:
+            view.release()
+
+class MatchResults():
+    """
+    Match indices merged from parallel segments, kept in their compact 
+    arrays or shared memory blocks instead of a list.
+    """
+
+    def __init__(self, parts=()):
+        """
+        Create merged results.
+
+        Parameters:
+        -----------
+        parts:
+            Match arrays or `SharedMatches`, in text order.
+        """
+
+        self.parts = list()
+        self.blocks = list()
+        self.offsets = [0]
+        for part in parts:
+            self.append(part)
+
+    def append(self, part):
+        """
+        Add the matches of the next segment.
+
+        Parameters:
+        -----------
+        part:
+            Match array or `SharedMatches` left by a worker.
+        """
+
+        if isinstance(part, SharedMatches):
+            block = shared_memory.SharedMemory(name=part.name)
+            self.blocks.append(block)
+            part = block.buf.cast("q")[:part.length]
+        if not len(part):
+            return
+        self.parts.append(part)
+        self.offsets.append(self.offsets[-1] + len(part))
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    def __iter__(self):
+        for part in self.parts:
+            yield from part
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            if indices.step != 1:
+                return array("q", (self[i] for i in indices))
+            result = array("q")
+            start, stop = indices.start, indices.stop
+            for i in range(bisect_right(self.offsets, start) - 1, 
+                                                        len(self.parts)):
+                if self.offsets[i] >= stop:
+                    break
+                result.extend(self.parts[i][max(start - self.offsets[i], 0):
+                                            stop - self.offsets[i]])
+            return result
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("match index out of range")
+        i = bisect_right(self.offsets, index) - 1
+        return self.parts[i][index - self.offsets[i]]
+
+    def tolist(self):
+        """
+        Get matches as a list.
+        """
+
+        return list(self)
+
+    def close(self):
+        """
+        Release shared memory blocks.
+        """
+
+        for part in self.parts:
+            if isinstance(part, memoryview):
+                part.release()
+        self.parts = list()
+        self.offsets = [0]
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ParallelPreprocessing():
+    """
+    Preprocessing steps, preparing input to parallel workflow.
+    """
+
+    @staticmethod
+    def calculate_segment_size(length, processors):
+        """
+        Calculate segments sizes to be treated by parallel string 
+        search algorithm.
+
+        Each segment owns the matches starting inside its boundaries. The 
+        remainder of the division is spread over the first segments, so 
+        sizes differ by at most one.
+
+        Parameters:
+        -----------
+        length: `int`
+            Input text length
+        processors: `int`
+            Processor count
+
+        Returns:
+        ----------
+        segments: 
+            Array of with segment boundaries
+        """
+        
+        seg_size, add = divmod(length, processors)
+
+        segments = []
+        lower_limit = 0
+        for i in range(processors):
+            upper_limit = lower_limit + seg_size + (1 if i < add else 0)
+            segments.append([lower_limit, upper_limit])
+            lower_limit = upper_limit
+
+        return segments
+
+    @staticmethod
+    def choose_chunk_size(chunk_size=None, mode="all"):
+        """
+        Choose the chunk size of a parallel search.
+
+        Parameters:
+        -----------
+        chunk_size: `int`
+            Requested chunk size, `None` for one segment per processor
+        mode: `str`
+            Query mode, one of `MODES`
+
+        Returns:
+        ----------
+        chunk_size: `int`
+            Requested chunk size, or `DEFAULT_CHUNK_SIZE` when none was 
+            requested for a query mode stopping early.
+        """
+
+        if mode in ("exists", "first-k") and not chunk_size:
+            # Small chunks let the search stop early, when enough is found
+            return DEFAULT_CHUNK_SIZE
+        return chunk_size
+
+    @staticmethod
+    def calculate_chunk_size(length, chunk_size):
+        """
+        Calculate fixed-size chunks, scheduled dynamically over processors
+        so a slow or match-dense chunk does not hold up the others.
+
+        Parameters:
+        -----------
+        length: `int`
+            Input text length
+        chunk_size: `int`
+            Chunk size
+
+        Returns:
+        ----------
+        segments: 
+            Array of with chunk boundaries
+        """
+
+        return [[i, min(i + chunk_size, length)] 
+                for i in range(0, length, chunk_size)]
+
+    @staticmethod
+    def calculate_task_size(length, processors, chunk_size):
+        """
+        Calculate the size of tasks grouping pieces of input, such as
+        small files or compressed blocks, aiming at `TASKS_PER_PROCESSOR`
+        tasks per processor.
+
+        Parameters:
+        -----------
+        length: `int`
+            Total input size
+        processors: `int`
+            Processor count
+        chunk_size: `int`
+            Maximum task size
+
+        Returns:
+        ----------
+        size: `int`
+            Task size, at least 1.
+        """
+
+        return max(min(chunk_size, math.ceil(
+                        length / (processors * TASKS_PER_PROCESSOR))), 1)
+
+    @staticmethod
+    def get_scan_limit(segment, length, overlap):
+        """
+        Get upper limit of the range scanned for a segment.
+
+        A segment is scanned `overlap` characters past its end, so matches
+        starting inside it and crossing its end are found. With an overlap 
+        of `len(pattern) - 1` no match starting past the segment end fits 
+        in the scanned range.
+
+        Parameters:
+        -----------
+        segment: `int`
+            Segment boundaries
+        length: `int`
+            Input text length
+        overlap: `int`
+            Number of characters scanned past the segment end
+
+        Returns:
+        ----------
+        upper_limit: `int`
+            Upper limit of scanned range
+        """
+
+        if segment[1] <= segment[0]:
+            return segment[1]
+        return min(segment[1] + overlap, length)
+    
+    @staticmethod
+    def get_text_segments(text, processors, pattern_length=1, 
+                                                            chunk_size=None):
+        """
+        Get text segments.
+        
+        Parameters:
+        -----------
+        text: `str`
+            Input text.
+        processors: `int`
+            Processor count.
+        pattern_length: `int`
+            Length of searched pattern, segments overlap by 
+            `pattern_length - 1` characters.
+        chunk_size: `int`
+            Split text in chunks of this size instead of one segment per 
+            processor.
+        Returns:
+        ----------
+        sliced_text: `str`
+            Input text sliced in overlapping segments
+        segments: `int`
+            Array with boundaries for segments
+        """
+
+        if chunk_size:
+            segments = ParallelPreprocessing.calculate_chunk_size(len(text),
+                                                                chunk_size)
+        else:
+            segments = ParallelPreprocessing.calculate_segment_size(
+                                                                len(text), 
+                                                                processors
+            )
+        overlap = max(pattern_length - 1, 0)
+        sliced_text = []
+        for seg in segments:
+            upper_limit = ParallelPreprocessing.get_scan_limit(
+                                                seg, len(text), overlap)
+            sliced_text.append(text[seg[0]:upper_limit])
+        
+        return sliced_text, segments
+
+    @staticmethod
+    def get_file_segments(path, processors, chunk_size=None):
+        """
+        Get byte segments of a file, without loading it into memory.
+
+        Parameters:
+        -----------
+        path: `str`
+            Path to input file.
+        processors: `int`
+            Processor count.
+        chunk_size: `int`
+            Split file in chunks of this size instead of one segment per 
+            processor.
+        Returns:
+        ----------
+        segments: `int`
+            Array with byte boundaries for segments
+        """
+
+        if chunk_size:
+            return ParallelPreprocessing.calculate_chunk_size(
+                                                    os.path.getsize(path), 
+                                                    chunk_size
+            )
+        return ParallelPreprocessing.calculate_segment_size(
+                                                    os.path.getsize(path), 
+                                                    processors
+        )
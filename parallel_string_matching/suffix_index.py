@@ -0,0 +1,509 @@
+#!/usr/bin/env python
+
+import os
+import mmap
+import time
+import heapq
+import struct
+import argparse
+import multiprocessing as mp
+from array import array
+from .string_matching import StringMatching as sm
+from .string_matching import ParallelPreprocessing as pp
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INDEX_MAGIC = b"SMSA"
+INDEX_VERSION = 1
+# Magic, version, item size and indexed text length
+INDEX_HEADER = struct.Struct("<4sBBxxQ")
+# Suffixes are first sorted by an integer key packing their first 
+# characters in base 257, each byte as its value plus one and bytes past 
+# the text end as zero, so shorter suffixes sort first. 257 ** 7 fits in
+# a signed 64-bit integer
+INITIAL_DEPTH = 7
+KEY_BASE = 257
+BLOCK_SIZE = 16 * 1024 * 1024
+
+def create_parser():
+
+    parser = argparse.ArgumentParser(
+        usage="python3 suffix_index.py <options>",
+        description=("Build a suffix array index for a text file, used by "
+                    "find_string.py --index to answer queries without "
+                    "scanning the text.")
+    )
+
+    parser.add_argument("-t", "--text",
+                        type=str,
+                        help="Path to text to be indexed",
+                        required=True
+    )
+
+    parser.add_argument("-o", "--output",
+                        type=str,
+                        help="Path to index file (defaults to <text>.sa)"
+    )
+
+    parser.add_argument("--processor_count",
+                        type=int,
+                        help="Number of processors used to build the index",
+                        default=2
+    )
+
+    return parser
+
+def open_text(path):
+    """
+    Memory-map a text file read-only.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to text file.
+
+    Returns:
+    --------
+    text: `mmap.mmap` or `bytes`
+        Mapped text, or empty bytes for an empty file.
+    """
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def index_dtype(length):
+    """
+    NumPy integer type of suffix positions and ranks for a text.
+
+    Parameters:
+    -----------
+    length: `int`
+        Indexed text length.
+
+    Returns:
+    --------
+    dtype: `numpy.dtype`
+        `int32`, or `int64` for texts of 2 GiB or more.
+    """
+
+    return np.int32 if length < 2**31 else np.int64
+
+def prefix_keys(text, start, end, depth=INITIAL_DEPTH):
+    """
+    Integer sort keys of the suffixes starting in a range, packing their 
+    first `depth` characters. Suffixes with equal keys share their first
+    `depth` characters.
+
+    Parameters:
+    -----------
+    text: `bytes`
+        Indexed text.
+    start: `int`
+        First suffix start index.
+    end: `int`
+        Range upper limit.
+    depth: `int`
+        Number of characters packed, at most `INITIAL_DEPTH`.
+
+    Returns:
+    --------
+    keys: `array`
+        Keys of the suffixes in the range, a `numpy.ndarray` when NumPy is
+        installed.
+    """
+
+    if np is not None:
+        keys = np.zeros(end - start, dtype=np.int64)
+        for low in range(start, end, BLOCK_SIZE):
+            high = min(low + BLOCK_SIZE, end)
+            chunk = np.frombuffer(text[low:high + depth - 1], dtype=np.uint8)
+            data = np.zeros(high - low + depth - 1, dtype=np.int64)
+            data[:len(chunk)] = chunk
+            data[:len(chunk)] += 1
+            block = keys[low - start:high - start]
+            for j in range(depth):
+                block *= KEY_BASE
+                block += data[j:j + high - low]
+        return keys
+
+    # Keys are rolled from the end of the range, dropping the last packed
+    # character and adding the one in front
+    keys = array("q", [0]) * (end - start)
+    key = 0
+    for j in range(end, end + depth):
+        key = key * KEY_BASE + (text[j] + 1 if j < len(text) else 0)
+    power = KEY_BASE ** (depth - 1)
+    for i in range(end - 1, start - 1, -1):
+        key = (text[i] + 1) * power + key // KEY_BASE
+        keys[i - start] = key
+    return keys
+
+def sort_segment(path, segment, depth=INITIAL_DEPTH):
+    """
+    Sort the suffixes starting inside a segment by their first characters,
+    in a worker process.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to text file.
+    segment: `int`
+        Segment boundaries
+    depth: `int`
+        Number of characters compared, at most `INITIAL_DEPTH`.
+
+    Returns:
+    --------
+    positions: `array`
+        Suffix start indices of the segment, ordered by their prefixes, a 
+        `numpy.ndarray` when NumPy is installed.
+    """
+
+    text = open_text(path)
+    keys = prefix_keys(text, segment[0], segment[1], depth)
+    if np is not None:
+        order = np.argsort(keys, kind="stable")
+        return (order + segment[0]).astype(index_dtype(len(text)))
+
+    positions = sorted(range(segment[0], segment[1]),
+                        key=lambda i: keys[i - segment[0]])
+    return array("q", positions)
+
+def merge_runs(text, runs, depth=INITIAL_DEPTH):
+    """
+    Merge runs of suffixes sorted by their first characters.
+
+    Parameters:
+    -----------
+    text: `bytes`
+        Indexed text.
+    runs: `array`
+        List of runs left by `sort_segment`, emptied once merged so they
+        are released.
+    depth: `int`
+        Number of characters the runs are ordered by.
+
+    Returns:
+    --------
+    suffix_array: `array`
+        Start indices of the text suffixes, ordered by their prefixes.
+    boundary: `bytearray`
+        Whether each suffix array entry starts a group of suffixes with 
+        equal prefixes, a `numpy.ndarray` of `bool` when NumPy is 
+        installed.
+    """
+
+    if np is not None:
+        suffix_array = np.concatenate(runs) if runs else \
+                                np.zeros(0, dtype=index_dtype(len(text)))
+        runs.clear()
+        keys = prefix_keys(text, 0, len(text), depth)
+        keys = keys[suffix_array]
+        # The stable sort finds the sorted runs and merges them. Sorting
+        # keys by value gives them in the same order, without a copy
+        order = np.argsort(keys, kind="stable")
+        suffix_array = suffix_array[order]
+        del order
+        keys.sort()
+        boundary = np.ones(len(keys), dtype=bool)
+        boundary[1:] = keys[1:] != keys[:-1]
+        return suffix_array, boundary
+
+    keys = prefix_keys(text, 0, len(text), depth)
+    suffix_array = array("q", heapq.merge(*runs, key=keys.__getitem__))
+    runs.clear()
+    boundary = bytearray(len(suffix_array))
+    for j in range(len(suffix_array)):
+        boundary[j] = j == 0 or (keys[suffix_array[j]] != 
+                                                keys[suffix_array[j - 1]])
+    return suffix_array, boundary
+
+def refine_suffix_array(suffix_array, boundary, depth=INITIAL_DEPTH):
+    """
+    Complete the ordering of suffixes sorted by their first `depth`
+    characters, by prefix doubling: suffixes still tied on `h` characters
+    are sorted by the rank of the suffix `h` characters ahead, which orders
+    them on `2h` characters. Only tied groups are visited on each round, 
+    and ranks are kept in an integer array.
+
+    Parameters:
+    -----------
+    suffix_array: `array`
+        Suffix start indices, ordered by their first `depth` characters.
+        Sorted in place.
+    boundary: `bytearray`
+        Whether each suffix array entry starts a group of suffixes with
+        equal prefixes, as left by `merge_runs`. Modified.
+    depth: `int`
+        Number of characters the input is ordered by.
+
+    Returns:
+    --------
+    suffix_array: `array`
+        Start indices of the text suffixes, in lexicographic order.
+    """
+
+    if np is not None:
+        return refine_ranks(suffix_array, boundary, depth)
+
+    N = len(suffix_array)
+    rank = array("q", [0]) * N
+
+    # Each suffix is ranked by the first position of its group, groups of
+    # more than one suffix still need sorting
+    groups = list()
+    start = 0
+    for j in range(1, N + 1):
+        if j == N or boundary[j]:
+            for i in suffix_array[start:j]:
+                rank[i] = start
+            if j - start > 1:
+                groups.append((start, j))
+            start = j
+
+    h = depth
+    while groups:
+        key = lambda i: rank[i + h] if i + h < N else -1
+        updates = list()
+        next_groups = list()
+        for start, end in groups:
+            members = sorted(suffix_array[start:end], key=key)
+            suffix_array[start:end] = array("q", members)
+
+            group_start = start
+            for j in range(start + 1, end + 1):
+                if (j == end or key(members[j - start]) != 
+                                    key(members[group_start - start])):
+                    updates.append((group_start, j))
+                    if j - group_start > 1:
+                        next_groups.append((group_start, j))
+                    group_start = j
+
+        # Ranks change only after the whole round, as keys use old ranks
+        for start, end in updates:
+            for i in suffix_array[start:end]:
+                rank[i] = start
+        groups = next_groups
+        h *= 2
+
+    return suffix_array
+
+def refine_ranks(suffix_array, boundary, depth=INITIAL_DEPTH):
+    """
+    Vectorized `refine_suffix_array`, over NumPy arrays. Tied groups are
+    sorted in batches of about `BLOCK_SIZE` suffixes, by group and rank of
+    the suffix `h` characters ahead, so temporary arrays stay small next 
+    to the suffix array and the ranks.
+
+    Parameters:
+    -----------
+    suffix_array: `numpy.ndarray`
+        Suffix start indices, ordered by their first `depth` characters.
+        Sorted in place.
+    boundary: `numpy.ndarray`
+        Whether each suffix array entry starts a group of equal prefixes.
+        Modified.
+    depth: `int`
+        Number of characters the input is ordered by.
+
+    Returns:
+    --------
+    suffix_array: `numpy.ndarray`
+        Start indices of the text suffixes, in lexicographic order.
+    """
+
+    N = len(suffix_array)
+    rank = np.zeros(N, dtype=suffix_array.dtype)
+    # Suffix array slots still tied, and the first slot of their group
+    slots = np.arange(N, dtype=suffix_array.dtype)
+
+    h = depth
+    while True:
+        # Ranks change only after the whole round, as keys use old ranks
+        starts = np.where(boundary, slots, 0)
+        np.maximum.accumulate(starts, out=starts)
+        for low in range(0, len(slots), BLOCK_SIZE):
+            rank[suffix_array[slots[low:low + BLOCK_SIZE]]] = \
+                                                starts[low:low + BLOCK_SIZE]
+
+        # Groups of more than one suffix still need sorting
+        tied = boundary
+        tied[:-1] &= boundary[1:]
+        np.logical_not(tied, out=tied)
+        slots = slots[tied]
+        starts = starts[tied]
+        del tied
+        if not len(slots):
+            break
+
+        boundary = np.ones(len(slots), dtype=bool)
+        low = 0
+        while low < len(slots):
+            # Batches end with a group
+            high = int(np.searchsorted(starts, 
+                            starts[min(low + BLOCK_SIZE, len(slots)) - 1], 
+                            side="right"))
+            members = suffix_array[slots[low:high]]
+            group = starts[low:high]
+            following = np.full(high - low, -1, dtype=rank.dtype)
+            inside = members < N - h
+            following[inside] = rank[members[inside] + h]
+            order = np.lexsort((following, group))
+            suffix_array[slots[low:high]] = members[order]
+            following = following[order]
+            boundary[low + 1:high] = ((group[1:] != group[:-1]) | 
+                                        (following[1:] != following[:-1]))
+            low = high
+        del starts
+        h *= 2
+
+    return suffix_array
+
+def build_suffix_array(path, processor_count=2):
+    """
+    Build suffix array for a text file. Each segment of the text is sorted
+    by prefix in a worker process, sorted segments are merged and the
+    order of suffixes with equal prefixes is refined by prefix doubling.
+
+    Parameters:
+    -----------
+    path: `str`
+        Path to text file.
+    processor_count: `int`
+        Number of processors used.
+
+    Returns:
+    --------
+    suffix_array: `array`
+        Start indices of the text suffixes, in lexicographic order, a 
+        `numpy.ndarray` when NumPy is installed.
+    """
+
+    segments = pp.get_file_segments(path, processor_count)
+    with mp.Pool(processor_count) as pool:
+        runs = pool.starmap(sort_segment, [(path, seg) for seg in segments])
+
+    # Runs are released once merged
+    return refine_suffix_array(*merge_runs(open_text(path), runs))
+
+def save_index(suffix_array, text_length, output):
+    """
+    Save suffix array in binary format: a fixed header followed by the
+    start indices, stored with 4 bytes each when the text allows it.
+
+    Parameters:
+    -----------
+    suffix_array: `array`
+        Start indices of the text suffixes, in lexicographic order.
+    text_length: `int`
+        Indexed text length.
+    output: `str`
+        Path to index file.
+    """
+
+    typecode = "I" if text_length < 2**32 else "Q"
+    if np is not None and isinstance(suffix_array, np.ndarray):
+        data = suffix_array.astype(np.uint32 if typecode == "I" 
+                                                            else np.uint64)
+    else:
+        data = array(typecode, suffix_array)
+    with open(output, "wb") as file:
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION,
+                                        data.itemsize, text_length))
+        data.tofile(file)
+
+class SuffixArrayIndex():
+    """
+    Suffix array index of a text file, answering count and locate queries
+    in O(m log N) time.
+    """
+
+    def __init__(self, text_path, index_path=None):
+        """
+        Load index, mapping both text and index files into memory.
+
+        Parameters:
+        -----------
+        text_path: `str`
+            Path to indexed text file.
+        index_path: `str`
+            Path to index file, defaults to <text_path>.sa
+        """
+
+        self.text = open_text(text_path)
+        self.index_path = index_path or text_path + ".sa"
+
+        with open(self.index_path, "rb") as file:
+            header = file.read(INDEX_HEADER.size)
+            magic, version, itemsize, text_length = INDEX_HEADER.unpack(header)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError("{} is not a suffix array index".format(
+                                                            self.index_path))
+            if text_length != len(self.text):
+                raise ValueError("Index {} does not match text {}".format(
+                                                self.index_path, text_path))
+            if text_length == 0:
+                self.suffix_array = []
+                return
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        typecode = "I" if itemsize == 4 else "Q"
+        self.suffix_array = memoryview(self.data)[INDEX_HEADER.size:].cast(
+                                                                    typecode)
+
+    def count(self, pattern):
+        """
+        Count pattern occurrences.
+
+        Parameters:
+        -----------
+        pattern: `bytes`
+            Pattern to search for.
+
+        Returns:
+        --------
+        count: `int`
+            Number of matches.
+        """
+
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+        return sm().index_count(pattern, self.text, self.suffix_array)
+
+    def locate(self, pattern):
+        """
+        Locate pattern occurrences.
+
+        Parameters:
+        -----------
+        pattern: `bytes`
+            Pattern to search for.
+
+        Returns:
+        --------
+        matches: `int`
+            List of byte offsets where matches where found.
+        """
+
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+        return sm().index_algorithm(pattern, self.text, self.suffix_array)
+
+if __name__ == "__main__":
+
+    parser = create_parser()
+    args = parser.parse_args()
+    output = args.output or args.text + ".sa"
+
+    start = time.time()
+    suffix_array = build_suffix_array(args.text, args.processor_count)
+    end = time.time()
+    print("Suffix array built! Time elapsed: {}".format(end - start))
+
+    save_index(suffix_array, os.path.getsize(args.text), output)
+    print("Index {} created!".format(output))
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from parallel_string_matching.string_matching import StringMatching
+
+# Engines finding every exact match, run by the tests taking `engine`
+ENGINES = ["naive", "kmp", "boyer_moore", "horspool", "two_way", "numpy",
+            "find", "regex", "shift_or", "bndm"]
+# Self-overlapping patterns find matches closer than the pattern length
+PATTERNS = ["a", "aa", "aaa", "ab", "abab", "aab", "aba", "abaab", "baa",
+            "abcabc", "cabbac", "a b", "a,a"]
+ALPHABETS = ["ab", "abc", "ab ", "a,b ", "abcdefgh"]
+
+def find_all(pattern, text):
+    return [i for i in range(len(text) - len(pattern) + 1)
+                                    if text[i:i + len(pattern)] == pattern]
+
+def generate_cases(seed, count=200, alphabets=ALPHABETS, patterns=PATTERNS,
+                                            text_length=80, pattern_length=8):
+    rng = random.Random(seed)
+    for _ in range(count):
+        alphabet = rng.choice(alphabets)
+        text = "".join(rng.choice(alphabet)
+                                for _ in range(rng.randint(0, text_length)))
+        if patterns and rng.random() < 0.4:
+            pattern = rng.choice(patterns)
+        else:
+            pattern = "".join(rng.choice(alphabet)
+                                for _ in range(rng.randint(1, pattern_length)))
+        yield text, pattern
+
+def run_engine(engine, pattern, text, ignore_case=False, max_errors=0,
+                                                                edits=True):
+    sm = StringMatching()
+    args = sm.preprocess(engine, pattern, ignore_case, max_errors, edits)
+    return list(getattr(sm, "{}_algorithm".format(engine))(pattern, text,
+                                                                    *args))
+
+@pytest.fixture
+def brute_force():
+    """
+    Start indices of every exact match, by comparing each text slice.
+    """
+
+    return find_all
+
+@pytest.fixture
+def cases():
+    """
+    Random (text, pattern) pairs, reproducible from a seed, over small
+    alphabets so matches are dense and often overlap.
+    """
+
+    return generate_cases
+
+@pytest.fixture
+def search():
+    """
+    Search with the list form of an engine, after building its tables.
+    """
+
+    return run_engine
+
+@pytest.fixture(params=ENGINES)
+def engine(request):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    return request.param
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from parallel_string_matching.string_matching import StringMatching
+from parallel_string_matching.string_matching import ParallelStringMatching
+from parallel_string_matching.string_matching import ParallelPreprocessing
+
+ENGINES = ["shift_or", "bndm"]
+ALPHABETS = ["ab", "abc", "acgt"]
+
+def mismatches(pattern, text, max_errors):
+    M = len(pattern)
+    return [i for i in range(len(text) - M + 1)
+            if sum(a != b for a, b in zip(pattern, text[i:i + M])) 
+                                                            <= max_errors]
+
+def edit_starts(pattern, text, max_errors):
+    """
+    Start indices of the substrings within max_errors edits of pattern,
+    by dynamic programming: row t holds the edit distances between 
+    pattern prefixes and the t characters read from the start.
+    """
+
+    M = len(pattern)
+    starts = list()
+    for i in range(len(text)):
+        row = list(range(M + 1))
+        best = row[M]
+        for t in range(i, min(i + M + max_errors, len(text))):
+            previous, row = row, [t - i + 1]
+            for p in range(1, M + 1):
+                row.append(min(previous[p] + 1, row[p - 1] + 1,
+                        previous[p - 1] + (pattern[p - 1] != text[t])))
+            best = min(best, row[M])
+        if best <= max_errors:
+            starts.append(i)
+    return starts
+
+@pytest.fixture
+def error_cases(cases):
+    """
+    Random (text, pattern, max_errors) cases, with fewer errors than the
+    pattern length.
+    """
+
+    def generate(seed, count=200):
+        rng = random.Random(seed)
+        for text, pattern in cases(seed, count, ALPHABETS, None, 60, 8):
+            yield text, pattern, rng.randint(0, len(pattern) - 1)
+    return generate
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_exact(engine, error_cases, search, brute_force):
+    for text, pattern, _ in error_cases(1, 400):
+        assert search(engine, pattern, text) == brute_force(pattern, text), \
+                                                                (text, pattern)
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_long_pattern(engine, search, brute_force):
+    pattern = "ab" * 40 + "c"
+    text = "x" + pattern + pattern[:-1] + "c" + "ab" * 50
+    assert search(engine, pattern, text) == brute_force(pattern, text)
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_k_mismatch(engine, error_cases, search):
+    for text, pattern, k in error_cases(2):
+        assert search(engine, pattern, text, max_errors=k, edits=False) == \
+                            mismatches(pattern, text, k), (text, pattern, k)
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_k_edit(engine, error_cases, search):
+    for text, pattern, k in error_cases(3):
+        assert search(engine, pattern, text, max_errors=k) == \
+                            edit_starts(pattern, text, k), (text, pattern, k)
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_ignore_case(engine, error_cases, search):
+    for text, pattern, k in error_cases(4, 100):
+        upper = text.upper()
+        assert search(engine, pattern, upper, True, k) == \
+                                                edit_starts(pattern, text, k)
+
+@pytest.mark.parametrize("edits", [True, False])
+def test_segments_extend_by_max_errors(edits, error_cases, search):
+    psm = ParallelStringMatching()
+    for text, pattern, k in error_cases(5):
+        args = psm.preprocess("shift_or", pattern, False, k, edits)
+        overlap = psm.get_overlap(pattern, "shift_or", *args)
+        matches = list()
+        for segment in ParallelPreprocessing.calculate_segment_size(
+                                                                len(text), 4):
+            upper_limit = ParallelPreprocessing.get_scan_limit(segment, 
+                                                        len(text), overlap)
+            matches.extend(psm.segment_algorithm(pattern, 
+                        text[segment[0]:upper_limit], segment, "shift_or", 
+                        *args))
+        assert matches == search("shift_or", pattern, text, False, k, edits)
+
+def test_max_errors_lower_than_pattern_length():
+    with pytest.raises(ValueError):
+        StringMatching().preprocess("shift_or", "ab", max_errors=2)
+    with pytest.raises(ValueError):
+        StringMatching().preprocess("kmp", "abc", max_errors=1)
@@ -0,0 +1,75 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from parallel_string_matching.async_search import search_async
+
+def chunked(data, seed):
+    """
+    Asynchronous iterable of random sized chunks, empty ones included.
+    """
+
+    async def chunks():
+        rng = random.Random(seed)
+        start = 0
+        while start < len(data):
+            size = rng.choice([0, 1, 2, 3, 5, 8, 40])
+            yield data[start:start + size]
+            start += size
+    return chunks()
+
+def collect(source, patterns, **kwargs):
+    async def run():
+        return [match async for match in search_async(source, patterns,
+                                                                **kwargs)]
+    return asyncio.run(run())
+
+def test_matches_across_windows(engine, cases, search):
+    for seed, (text, pattern) in enumerate(cases(1, 60, text_length=150)):
+        data, encoded = text.encode(), pattern.encode()
+        assert collect(chunked(data, seed), encoded, engine=engine) == \
+                            search(engine, encoded, data), (text, pattern)
+
+def test_reader_buffers(cases, brute_force):
+    async def run(data, pattern, buffer_size):
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        stream.feed_eof()
+        return [match async for match in search_async(stream, pattern,
+                                            "kmp", buffer_size=buffer_size)]
+
+    for text, pattern in cases(2, 40, text_length=150):
+        data = text.encode()
+        for buffer_size in (1, 3, 16):
+            assert asyncio.run(run(data, pattern, buffer_size)) == \
+                                        brute_force(pattern.encode(), data)
+
+@pytest.mark.parametrize("engine", ["shift_or", "bndm"])
+def test_approximate(engine, cases, search):
+    for seed, (text, pattern) in enumerate(cases(3, 60, ["ab", "abc"],
+                                                        None, 150, 6)):
+        data, encoded = text.encode(), pattern.encode()
+        max_errors = len(pattern) // 3
+        assert collect(chunked(data, seed), encoded, engine=engine,
+                        max_errors=max_errors) == search(engine, encoded,
+                                    data, False, max_errors), (text, pattern)
+
+def test_executor_offload(cases, brute_force):
+    with ThreadPoolExecutor(2) as executor:
+        for seed, (text, pattern) in enumerate(cases(4, 30, text_length=150)):
+            data = text.encode()
+            assert collect(chunked(data, seed), pattern, engine="find",
+                            executor=executor, offload_size=4) == \
+                                    brute_force(pattern.encode(), data)
+
+def test_patterns(cases, brute_force):
+    patterns = ["ab", "bab", "aaa"]
+    for seed, (text, _) in enumerate(cases(5, 40, text_length=150)):
+        data = text.encode()
+        expected = sorted((offset, index, pattern)
+                            for index, pattern in enumerate(patterns)
+                            for offset in brute_force(pattern.encode(), data))
+        assert collect(chunked(data, seed), patterns) == [(pattern, offset)
+                                        for offset, _, pattern in expected]
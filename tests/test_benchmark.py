@@ -0,0 +1,84 @@
+import json
+import statistics
+
+import pytest
+
+from parallel_string_matching import benchmark
+
+@pytest.mark.parametrize("samples, fraction, expected", [
+                ([3.0], 0.95, 3.0), ([1.0, 2.0], 0.5, 1.0),
+                ([1.0, 2.0], 0.95, 2.0), ([4.0, 1.0, 3.0, 2.0], 0.5, 2.0),
+                (list(range(20, 0, -1)), 0.95, 19),
+                (list(range(1, 101)), 0.95, 95), ([5, 1, 3], 0.0, 1)])
+def test_percentile(samples, fraction, expected):
+    assert benchmark.percentile(samples, fraction) == expected
+
+def test_summarize():
+    samples = [0.4, 0.1, 0.3, 0.2, 1.0]
+    summary = benchmark.summarize(samples)
+    assert summary == {"median": 0.3, "p95": 1.0,
+                        "stddev": statistics.stdev(samples),
+                        "mean": statistics.mean(samples), "min": 0.1,
+                        "max": 1.0}
+    assert benchmark.summarize([0.5])["stddev"] == 0.0
+
+def record(median, cores=1, algorithm="kmp"):
+    return {"file": "text.txt", "pattern_kind": "word",
+            "algorithm": algorithm, "cores": cores, "loader": "text",
+            "ignore_case": True, "phases": {"total": {"median": median}}}
+
+def test_compare_baseline(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"results": [record(1.0), record(1.0, 2),
+                                                record(0.0, 4)]}))
+    records = [record(1.05), record(1.5, 2), record(0.1, 4),
+                                                record(9.0, 1, "horspool")]
+    regressions = benchmark.compare_baseline(records, str(path), 0.10)
+    assert [regression["case"][3] for regression in regressions] == [2]
+    assert regressions[0]["change"] == pytest.approx(0.5)
+    assert capsys.readouterr().out.count("REGRESSION") == 1
+    # Cases missing from the baseline are not compared
+    assert benchmark.compare_baseline(records, str(path), 0.01)[0]["case"] \
+                                            == benchmark.case_key(records[0])
+
+@pytest.mark.parametrize("baseline_median, status", [(10**6, 0), (0.0, 0),
+                                                        (10**-12, 1)])
+def test_cli_threshold_exit(tmp_path, baseline_median, status):
+    text = tmp_path / "text.txt"
+    text.write_text("people of the people " * 50)
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": [{"file": "text.txt",
+                "pattern_kind": "word", "algorithm": "kmp", "cores": 1,
+                "loader": "text", "ignore_case": True,
+                "phases": {"total": {"median": baseline_median}}}]}))
+    output = tmp_path / "current.json"
+    assert benchmark.cli(["-f", str(text), "-c", "1", "-p", "word", "-r",
+                    "2", "-w", "0", "-o", str(output), "--baseline",
+                    str(baseline)]) == status
+    results = json.loads(output.read_text())["results"]
+    assert results[0]["matches"] == 2 * 50
+
+def test_run_once_times_search_only(tmp_path):
+    text = tmp_path / "text.txt"
+    text.write_text("people of the people " * 50)
+    compiled = benchmark.compile_pattern("people", "kmp", True)
+    benchmark.psm.prepare_sharing()
+    for cores in (1, 2):
+        with benchmark.mp.Pool(2, initializer=benchmark.psm.init_worker,
+                                        initargs=(None, compiled)) as pool:
+            timings, matches = benchmark.run_once(str(text), compiled, cores,
+                                                                        pool)
+        assert matches == 100
+        assert {"load", "search"} <= set(timings) and "compile" not in timings
+
+def test_run_once_approximate_segments(tmp_path):
+    text = tmp_path / "text.txt"
+    text.write_text("peoxple pexople " * 40)
+    compiled = benchmark.compile_pattern("people", "shift_or", True, 1)
+    benchmark.psm.prepare_sharing()
+    with benchmark.mp.Pool(4, initializer=benchmark.psm.init_worker,
+                                        initargs=(None, compiled)) as pool:
+        # Insertions make matches longer than the pattern
+        counts = [benchmark.run_once(str(text), compiled, cores, pool)[1]
+                                                for cores in range(1, 14)]
+    assert counts == [80] * 13
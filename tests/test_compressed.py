@@ -0,0 +1,126 @@
+import bz2
+import gzip
+import lzma
+import random
+import struct
+import zlib
+
+import pytest
+
+from parallel_string_matching import compressed, search
+from parallel_string_matching.string_matching import StringMatching
+
+PATTERNS = [b"ab", b"abab", b"aab", b"abbabaab"]
+
+def chunks(text, seed):
+    rng = random.Random(seed)
+    start = 0
+    while start < len(text):
+        size = rng.choice([0, 1, 2, 3, 5, 8, 40])
+        yield text[start:start + size]
+        start += size
+
+def bgzf_block(data):
+    deflate = zlib.compressobj(6, zlib.DEFLATED, -15)
+    body = deflate.compress(data) + deflate.flush()
+    size = 12 + 6 + len(body) + 8
+    header = b"\x1f\x8b\x08\x04" + bytes(6) + struct.pack("<H", 6) + \
+                                        b"BC" + struct.pack("<HH", 2, size - 1)
+    return header + body + struct.pack("<II", zlib.crc32(data), len(data))
+
+def bgzf(text, seed):
+    # bgzip ends files with an empty block
+    return b"".join(bgzf_block(chunk) for chunk in chunks(text, seed)) + \
+                                                            bgzf_block(b"")
+
+def zstd_frames(text, seed):
+    zstandard = pytest.importorskip("zstandard")
+    rng = random.Random(seed)
+    frames = list()
+    for chunk in chunks(text, seed):
+        compressor = zstandard.ZstdCompressor(
+                                    write_content_size=rng.random() < 0.5,
+                                    write_checksum=rng.random() < 0.5)
+        frames.append(compressor.compress(chunk))
+        if rng.random() < 0.2:
+            skipped = bytes(rng.randint(0, 5))
+            frames.append(struct.pack("<II", compressed.ZSTD_SKIPPABLE_MAGIC,
+                                                    len(skipped)) + skipped)
+    return b"".join(frames)
+
+def random_text(seed, size=600):
+    rng = random.Random(seed)
+    return bytes(rng.choice(b"ab") for _ in range(size))
+
+@pytest.fixture(params=["bgzf", "zstd"])
+def block_file(request, tmp_path):
+    text = random_text(1)
+    data = (bgzf if request.param == "bgzf" else zstd_frames)(text, 2)
+    path = tmp_path / "text.{}".format(request.param)
+    path.write_bytes(data)
+    return str(path), text, "gzip" if request.param == "bgzf" else "zstd"
+
+def test_find_blocks(block_file):
+    path, text, compression = block_file
+    blocks = compressed.find_blocks(path, compression)
+    assert blocks and len(blocks) > 10
+    assert blocks[0][0] == 0
+    assert all(a[1] == b[0] for a, b in zip(blocks, blocks[1:]))
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("algorithm", ["kmp", "find"])
+def test_matches_cross_blocks(block_file, pattern, algorithm, brute_force):
+    path, text, compression = block_file
+    expected = brute_force(pattern, text)
+    for chunk_size in (1, 16, 10**6):
+        matches = compressed.search_compressed(path, pattern, 3, algorithm,
+                                    ignore_case=False, chunk_size=chunk_size)
+        assert list(matches) == expected
+
+def test_modes(block_file, brute_force):
+    path, text, compression = block_file
+    expected = brute_force(b"abab", text)
+    search = lambda mode, k=1: compressed.search_compressed(path, b"abab", 
+                    2, ignore_case=False, chunk_size=1, mode=mode, k=k)
+    assert search("count") == len(expected)
+    assert search("exists") is True
+    assert list(search("first-k", 5)) == expected[:5]
+    assert compressed.search_compressed(path, b"ba" * 20, 2, 
+                        ignore_case=False, chunk_size=1, mode="exists") is \
+                        bool(brute_force(b"ba" * 20, text))
+
+def test_approximate(block_file):
+    path, text, compression = block_file
+    parallel = compressed.search_compressed(path, b"abbab", 2, "shift_or",
+                        ignore_case=False, max_errors=1, chunk_size=1)
+    sm = StringMatching()
+    expected = sm.shift_or_algorithm(b"abbab", text, 
+                                *sm.preprocess("shift_or", b"abbab", False, 1))
+    assert list(parallel) == expected
+
+@pytest.mark.parametrize("compress", [gzip.compress, bz2.compress, 
+                                        lzma.compress])
+def test_streamed_formats(tmp_path, compress, brute_force):
+    text = random_text(3) + b"ABAB abab"
+    path = tmp_path / "text"
+    path.write_bytes(compress(text))
+    assert compressed.find_blocks(str(path), 
+                        compressed.detect_compression(str(path))) is None
+    for processors in (1, 2):
+        matches = compressed.search_compressed(str(path), b"abab", 
+                                        processors, buffer_size=7)
+        assert list(matches) == brute_force(b"abab", text.lower())
+
+@pytest.mark.parametrize("text", [b"BZh is a plain text file mentioning people",
+                                    b"BZh9 people", b"\x1f\x8bpeople"])
+def test_plain_text_with_magic_prefix(tmp_path, text, brute_force):
+    path = tmp_path / "text.txt"
+    path.write_bytes(text)
+    assert compressed.detect_compression(str(path)) is None
+    assert list(search(str(path), "people")) == brute_force(b"people", text)
+
+@pytest.mark.parametrize("text", [b"", b"people"])
+def test_bz2_detected(tmp_path, text):
+    path = tmp_path / "text"
+    path.write_bytes(bz2.compress(text))
+    assert compressed.detect_compression(str(path)) == "bz2"
@@ -0,0 +1,64 @@
+import gzip
+import os
+
+import pytest
+
+from parallel_string_matching.corpus import plan_tasks, search_corpus
+from parallel_string_matching.corpus import walk_corpus
+
+PATTERN = b"abab"
+
+@pytest.fixture
+def corpus(tmp_path, cases):
+    """
+    Directory of files from empty to a few hundred bytes, in nested
+    directories, with a gzip compressed one.
+    """
+
+    files = dict()
+    for i, (text, _) in enumerate(cases(1, 12, ["ab", "ab "], None, 300)):
+        name = os.path.join("sub" if i % 3 else "", "{:02}.txt".format(i))
+        files[name] = (text * (i % 4)).encode()
+    files["empty.txt"] = b""
+    for name, data in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(data)
+    (tmp_path / "sub" / "packed.gz").write_bytes(gzip.compress(
+                                                    files["sub/01.txt"] * 3))
+    files["sub/packed.gz"] = files["sub/01.txt"] * 3
+    return str(tmp_path), files
+
+@pytest.mark.parametrize("processors", [1, 2, 3])
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 10**6])
+def test_tasks_cover_corpus(corpus, processors, chunk_size):
+    source, files = corpus
+    paths = walk_corpus(source)
+    tasks = plan_tasks(paths, processors, chunk_size)
+    pieces = [piece for task in tasks for piece in task]
+    order = [paths.index(path) for path, _, _ in pieces]
+    assert order == sorted(order)
+    for path in paths:
+        name = os.path.relpath(path, source)
+        segments = [segment for piece, segment, _ in pieces if piece == path]
+        if not files[name]:
+            assert segments == []
+            continue
+        # Segments are in order, and cover the file exactly once
+        assert segments[0][0] == 0
+        assert segments[-1][1] == os.path.getsize(path)
+        assert all(a[1] == b[0] for a, b in zip(segments, segments[1:]))
+    for task in tasks:
+        # Split files are alone in their task, packed ones are whole
+        assert len(task) == 1 or all(whole for _, _, whole in task)
+
+@pytest.mark.parametrize("algorithm", ["kmp", "horspool", "find"])
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 10**6])
+def test_matches_brute_force(corpus, brute_force, algorithm, chunk_size):
+    source, files = corpus
+    expected = [(os.path.join(source, name), offset)
+                    for name in sorted(files, key=lambda name:
+                                        os.path.join(source, name))
+                    for offset in brute_force(PATTERN, files[name])]
+    assert list(search_corpus(source, PATTERN, 3, algorithm, False,
+                                                    chunk_size)) == expected
@@ -0,0 +1,63 @@
+import random
+import re
+
+import pytest
+
+from parallel_string_matching.create_big_file import plant_pattern
+from parallel_string_matching.create_big_file import create_synthetic_file
+from parallel_string_matching.create_big_file import random_text as generate
+
+# Pattern characters are not in the text alphabet, and the pattern can not
+# overlap itself, so every occurrence found was planted
+PATTERN = b"xyzw"
+
+def random_text(seed, size):
+    rng = random.Random(seed)
+    return bytearray(rng.choice(b"ab") for _ in range(size))
+
+@pytest.mark.parametrize("repeat", [False, True])
+@pytest.mark.parametrize("boundary", [None, 7, 50, 1000])
+@pytest.mark.parametrize("density", [0, 5000, 10**6])
+def test_planted_count(brute_force, repeat, boundary, density):
+    for seed, size in enumerate((3, 4, 5, 99, 100, 1001)):
+        text = random_text(seed, size)
+        planted = plant_pattern(random.Random(seed), text, PATTERN, density,
+                                                            boundary, repeat)
+        # Occurrences wrapped around the end start in the first copy
+        found = brute_force(PATTERN, text + text if repeat else text)
+        assert planted == len([i for i in found if i < size]), (seed, size)
+        if boundary and size >= len(PATTERN):
+            last_edge = size if repeat else size - 2
+            for edge in range(boundary, last_edge + 1, boundary):
+                assert edge - 2 in found
+
+def test_synthetic_file(brute_force, tmp_path, capsys):
+    path = str(tmp_path / "text")
+    create_synthetic_file(path, 10000, alphabet="ab", seed=1,
+                            pattern=PATTERN.decode(), density=2000,
+                            boundary=64, unique_size=1000)
+    with open(path, "rb") as file:
+        data = file.read()
+    planted, length = map(int, re.search(r"Planted (\d+) occurrence\(s\) "
+                            r"every (\d+) bytes", capsys.readouterr().out)
+                                                                .groups())
+    assert len(data) == 10000 and length == 960
+    found = brute_force(PATTERN, data)
+    assert len([i for i in found if i < length]) == planted
+    # Boundaries stay aligned in every copy of the text
+    assert all(edge - 2 in found for edge in range(64, 10000 - 1, 64))
+
+@pytest.mark.parametrize("alphabet", ["ab", "abc", "0123456789 ,.",
+                                            "abcdefghijklmnopqrstuvwxyz"])
+def test_random_text_uniform(alphabet):
+    size = 500000
+    text = generate(random.Random(1), size, alphabet)
+    assert len(text) == size
+    assert text == generate(random.Random(1), size, alphabet)
+    expected = size / len(alphabet)
+    # Within 4 standard deviations, which a modulo mapping of random bytes
+    # exceeds by far for the last characters of 13 and 26 letter alphabets
+    for char in alphabet.encode():
+        assert abs(text.count(char) - expected) < 4 * expected ** 0.5, \
+                                                                    chr(char)
+    assert generate(random.Random(1), 0, alphabet) == bytearray()
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from parallel_string_matching.string_matching import StringMatching
+
+# Case pairs folded together by `str.lower`, the Kelvin sign to 'k'
+FOLDED = "aAäÄéÉkKK"
+
+def test_matches_brute_force(engine, cases, search, brute_force):
+    for text, pattern in cases(1, 300, pattern_length=10):
+        assert search(engine, pattern, text) == brute_force(pattern, text), \
+                                                                (text, pattern)
+
+def test_buffers(engine, cases, search, brute_force):
+    for text, pattern in cases(2, 100):
+        data, pattern = text.encode(), pattern.encode()
+        expected = brute_force(pattern, data)
+        assert search(engine, pattern, data) == expected, (text, pattern)
+        assert search(engine, pattern, memoryview(data)) == expected
+
+def test_modes_match_all(engine, cases, search):
+    sm = StringMatching()
+    for text, pattern in cases(6, 100):
+        expected = search(engine, pattern, text)
+        args = sm.preprocess(engine, pattern)
+        matches = lambda: getattr(sm, "{}_matches".format(engine))(pattern,
+                                                                text, *args)
+        assert sm.apply_mode(matches()) == expected
+        assert sm.apply_mode(matches(), "count") == len(expected)
+        assert sm.apply_mode(matches(), "exists") is bool(expected)
+        for k in (1, 2, 5):
+            assert sm.apply_mode(matches(), "first-k", k) == expected[:k]
+
+def test_ignore_case(engine, cases, search, brute_force):
+    rng = random.Random(3)
+    for text, pattern in cases(3, 100):
+        text = "".join(c.upper() if rng.random() < 0.5 else c for c in text)
+        pattern = "".join(c.upper() if rng.random() < 0.5 else c
+                                                            for c in pattern)
+        assert search(engine, pattern, text, True) == brute_force(
+                                            pattern.lower(), text.lower())
+
+def test_ignore_case_non_ascii(engine, cases, search, brute_force):
+    for text, pattern in cases(4, 100, [FOLDED], None, 40, 4):
+        assert search(engine, pattern, text, True) == brute_force(
+                            pattern.lower(), text.lower()), (text, pattern)
+
+def test_ignore_case_bytes_ascii_only(engine, cases, search, brute_force):
+    # Bytes are folded as ASCII, UTF-8 sequences of other letters must match
+    for text, pattern in cases(5, 100, [FOLDED], None, 40, 4):
+        data, encoded = text.encode(), pattern.encode()
+        folded = bytes(b + 32 if 65 <= b <= 90 else b for b in data)
+        expected = brute_force(bytes(b + 32 if 65 <= b <= 90 else b
+                                                for b in encoded), folded)
+        assert search(engine, encoded, data, True) == expected, (text,
+                                                                    pattern)
+
+@pytest.mark.parametrize("pattern", ["a", "ab", "aba", "abaab", "zzzaz",
+                                        "abcabcab", "baaaab", "GCAGAGAG"])
+def test_two_way_factorization(pattern, search, brute_force):
+    sm = StringMatching()
+    text = pattern * 3 + pattern[:-1] + "x" + pattern
+    assert search("two_way", pattern, text) == brute_force(pattern, text)
+    critical, period = sm.build_two_way_factorization(pattern)[:2]
+    # Critical is the position before the maximal suffix
+    assert -1 <= critical < len(pattern) - 1
+    assert 0 < period <= len(pattern)
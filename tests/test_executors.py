@@ -0,0 +1,109 @@
+import pickle
+
+import pytest
+
+from parallel_string_matching import find_string
+from parallel_string_matching.executors import estimate_pickled_size
+from parallel_string_matching.search_stats import SearchStats
+from parallel_string_matching.string_matching import compile_pattern
+
+PATTERN = "abab"
+EXECUTORS = ["process", "thread"]
+
+@pytest.fixture
+def text_file(tmp_path, cases):
+    text = "".join(text for text, _ in cases(1, 40, ["ab", "ab "]))
+    path = tmp_path / "text.txt"
+    path.write_text(text, encoding="utf-8")
+    return str(path), text
+
+@pytest.fixture
+def reported(monkeypatch):
+    """
+    Results reported by `search_parallel`, listed before they are closed.
+    """
+
+    results = list()
+    def report(result, mode="all"):
+        results.append(list(result) if mode in ("all", "first-k")
+                                                                else result)
+    monkeypatch.setattr(find_string, "report_results", report)
+    return results
+
+def search(path, executor, **kwargs):
+    kwargs = dict({"algorithm": "kmp", "encoding": "utf-8",
+                        "ignore_case": False, "executor": executor}, **kwargs)
+    find_string.search_parallel(path, PATTERN, 3, **kwargs)
+
+@pytest.mark.parametrize("use_bytes", [False, True])
+@pytest.mark.parametrize("algorithm", ["kmp", "horspool", "find", "regex"])
+def test_threads_match_processes(text_file, reported, brute_force, algorithm,
+                                                                use_bytes):
+    path, text = text_file
+    for executor in EXECUTORS:
+        search(path, executor, algorithm=algorithm, use_bytes=use_bytes)
+    assert reported == [brute_force(PATTERN, text)] * 2
+
+@pytest.mark.parametrize("executor", EXECUTORS)
+def test_chunks_match_segments(text_file, reported, brute_force, executor):
+    path, text = text_file
+    for chunk_size in (None, 1, 3, 7, 100):
+        search(path, executor, chunk_size=chunk_size)
+    assert reported == [brute_force(PATTERN, text)] * 5
+
+@pytest.mark.parametrize("executor", EXECUTORS)
+def test_modes_match_all(text_file, reported, brute_force, executor):
+    path, text = text_file
+    expected = brute_force(PATTERN, text)
+    for mode, k in (("count", 10), ("exists", 10), ("first-k", 1),
+                        ("first-k", 7), ("first-k", len(expected) + 1)):
+        search(path, executor, mode=mode, k=k, chunk_size=5)
+    assert reported == [len(expected), True, expected[:1], expected[:7],
+                                                                    expected]
+    find_string.search_parallel(path, "ba" * 50, 3, executor=executor,
+                                                                mode="exists")
+    assert reported[-1] is False
+
+@pytest.mark.parametrize("ignore_case", [False, True])
+@pytest.mark.parametrize("executor", EXECUTORS)
+def test_stats(text_file, reported, brute_force, executor, ignore_case):
+    path, text = text_file
+    stats = SearchStats(["comparisons"])
+    search(path, executor, chunk_size=16, stats=stats, 
+                                                    ignore_case=ignore_case)
+    report = stats.to_dict()
+    assert set(report) == {"phases", "counters", "workers", "tasks"}
+    assert {"load", "compile", "segment", "search", "merge"} <= \
+                                                    set(report["phases"])
+    assert ("fold" in report["phases"]) == ignore_case
+    chunks = -(-len(text) // 16)
+    assert len(report["tasks"]) == chunks
+    assert [task["lower"] for task in report["tasks"]] == \
+                                            list(range(0, len(text), 16))
+    workers = report["workers"].values()
+    assert 1 <= len(workers) <= 3
+    assert sum(worker["tasks"] for worker in workers) == chunks
+    assert sum(worker["size"] for worker in workers) == len(text)
+    assert sum(worker["matches"] for worker in workers) == \
+                                            len(brute_force(PATTERN, text))
+    assert all(worker["comparisons"] >= worker["size"] for worker in workers)
+    if executor == "process":
+        assert "pool" in report["phases"]
+        assert report["counters"]["pickled_bytes_estimate"] > len(text)
+        assert "transfer_seconds" in report["counters"]
+    else:
+        assert "pickled_bytes_estimate" not in report["counters"]
+
+@pytest.mark.parametrize("text", ["ab" * 500, b"ab" * 500])
+def test_estimate_pickled_size(text):
+    compiled = compile_pattern(text[:4], "kmp")
+    kwargs = {"mode": "all", "k": 10}
+    jobs = [(lower, "segment_algorithm",
+                    (text[:4], text[lower:lower + 300], [lower, lower + 250],
+                                                            "kmp"), kwargs)
+                    for lower in range(0, len(text), 250)]
+    pickled = sum(len(pickle.dumps(job)) for job in jobs)
+    estimate = estimate_pickled_size(jobs)
+    assert abs(estimate - pickled) <= 10 * len(jobs)
+    assert estimate_pickled_size(jobs, compiled, 3) == estimate + \
+                                                3 * len(pickle.dumps(compiled))
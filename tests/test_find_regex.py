@@ -0,0 +1,53 @@
+import pytest
+
+from parallel_string_matching.string_matching import StringMatching
+from parallel_string_matching.string_matching import SAMPLED, APPROXIMATE
+
+ENGINES = ["find", "regex"]
+# Regular expression metacharacters must be matched literally
+ALPHABETS = ["ab", "a.b*", "ab(|)", "a[b]\\", "aÄäé É"]
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_metacharacters(engine, cases, search, brute_force):
+    for text, pattern in cases(1, 300, ALPHABETS, None, 80, 6):
+        assert search(engine, pattern, text) == brute_force(pattern, text), \
+                                                                (text, pattern)
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_ignore_case_matches_table_engines(engine, cases, search):
+    for text, pattern in cases(3, 200, ALPHABETS, None, 80, 6):
+        text = text.swapcase() if len(text) % 2 else text
+        assert search(engine, pattern, text, True) == search("kmp", pattern,
+                                                        text, True)
+
+def test_choose_algorithm(cases, search):
+    sm = StringMatching()
+    for text, pattern in cases(4, 200, ALPHABETS, None, 80, 6):
+        for ignore_case in (False, True):
+            algorithm, reason = sm.choose_algorithm(pattern, ignore_case)
+            assert reason
+            assert search(algorithm, pattern, text, ignore_case) == \
+                                    search("kmp", pattern, text, ignore_case)
+    assert sm.choose_algorithm("aa")[0] == "find"
+    assert sm.choose_algorithm("ab")[0] == "regex"
+    assert sm.choose_algorithm("ab", buffer=True)[0] == "regex"
+    assert sm.choose_algorithm("abc", max_errors=1)[0] == "shift_or"
+
+def test_choose_algorithm_sample(cases, search):
+    sm = StringMatching()
+    for text, pattern in cases(5, 50, ALPHABETS, None, 80, 6):
+        if len(text) < len(pattern):
+            continue
+        algorithm, reason = sm.choose_algorithm(pattern, sample=text)
+        assert algorithm in SAMPLED and "sample" in reason
+        assert search(algorithm, pattern, text) == search("kmp", pattern,
+                                                                        text)
+        data = text.encode()
+        algorithm, _ = sm.choose_algorithm(pattern.encode(), buffer=True,
+                                                    sample=memoryview(data))
+        assert algorithm in SAMPLED and algorithm != "find"
+    assert sm.choose_algorithm("abc", max_errors=1,
+                                    sample="abd" * 100)[0] in APPROXIMATE
+    # Samples shorter than the pattern fall back to heuristics
+    assert sm.choose_algorithm("abcd", sample="ab")[1] == \
+                                            sm.choose_algorithm("abcd")[1]
@@ -0,0 +1,94 @@
+import re
+import json
+
+import pytest
+
+from parallel_string_matching import suffix_index
+from parallel_string_matching.find_string import cli, load_input, main
+
+WARNING = "Suffix array index search is case sensitive!"
+
+@pytest.fixture
+def text_file(tmp_path, cases):
+    text = "".join(text for text, _ in cases(1, 40, ["ab", "ab "]))
+    path = tmp_path / "text.txt"
+    path.write_text(text + "ABAB", encoding="utf-8")
+    return str(path), text + "ABAB"
+
+def matches_found(output):
+    return [int(count) for count in re.findall(r"Matches found:\s+(\d+)",
+                                                                    output)]
+
+@pytest.mark.parametrize("pattern, encoding, ignore_case, fallback", [
+                ("abab", "utf-8", True, False), ("ab", "latin-1", True, False),
+                ("äb", "utf-8", True, True), ("äb", "utf-8", False, False),
+                ("ab", "cp037", True, True)])
+def test_bytes_fall_back_to_text(text_file, brute_force, pattern, encoding,
+                                                    ignore_case, fallback):
+    path, text = text_file
+    loaded, key = load_input(path, pattern, True, encoding, ignore_case)
+    if fallback:
+        assert key == pattern and isinstance(loaded, str)
+    else:
+        assert key == pattern.encode(encoding)
+        assert isinstance(loaded, bytearray)
+        assert brute_force(key, loaded) == brute_force(pattern, text)
+
+def test_index_warning_only_when_requested(text_file, brute_force, capsys):
+    path, text = text_file
+    suffix_index.save_index(suffix_index.build_suffix_array(path, 2),
+                                                    len(text), path + ".sa")
+    main(path, "abab", index=path + ".sa")
+    output = capsys.readouterr().out
+    assert WARNING not in output
+    assert matches_found(output) == [len(brute_force("abab", text))]
+    main(path, "abab", index=path + ".sa", ignore_case=False)
+    assert WARNING not in capsys.readouterr().out
+    main(path, "abab", index=path + ".sa", ignore_case=True)
+    assert WARNING in capsys.readouterr().out
+
+def test_cli_arguments_reach_main(text_file, brute_force, capsys):
+    path, text = text_file
+    folded = brute_force("abab", text.lower())
+    cli(["-t", path, "-p", "abab", "--mode", "count", "--processor_count",
+                                                                    "2"])
+    cli(["--text", path, "--pattern", "abab", "--mode", "count",
+            "--case_sensitive", "--bytes", "--mmap", "--chunk_size", "5"])
+    cli(["-t", path, "-p", "abbb", "-a", "shift_or", "--mode", "count",
+            "--stream", "--max-errors", "1", "--mismatch_only",
+            "--buffer_size", "3"])
+    mismatches = [i for i in range(len(text) - 3)
+        if sum(a != b for a, b in zip("abbb", text.lower()[i:i + 4])) <= 1]
+    assert matches_found(capsys.readouterr().out) == [len(folded),
+                    len(brute_force("abab", text)), len(mismatches)]
+
+def test_main_options_are_keywords(text_file):
+    path, _ = text_file
+    with pytest.raises(TypeError):
+        main(path, "abab", 2)
+
+@pytest.mark.parametrize("options", [["--parallel"], ["--mmap"], []])
+def test_json_stats_alone_on_stdout(text_file, brute_force, capsys, options):
+    path, text = text_file
+    cli(["-t", path, "-p", "abab", "--stats", "json"] + options)
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert "fold" in report["phases"]
+    expected = len(brute_force("abab", text.lower()))
+    assert sum(task["matches"] for task in report["tasks"]) == expected
+    assert matches_found(captured.err) == [expected]
+
+@pytest.mark.parametrize("encoding", ["latin-1", "utf-16", "utf-8"])
+def test_numpy_pattern_follows_encoding(tmp_path, brute_force, capsys, 
+                                                                encoding):
+    pytest.importorskip("numpy")
+    text = "señor Señor SEÑOR señora"
+    path = tmp_path / "text.txt"
+    path.write_text(text, encoding=encoding)
+    for ignore_case in (False, True):
+        main(str(path), "señor", algorithm="numpy", parallel=False, 
+                        mode="count", encoding=encoding, 
+                        ignore_case=ignore_case)
+        searched = text.lower() if ignore_case else text
+        assert matches_found(capsys.readouterr().out) == [
+                                        len(brute_force("señor", searched))]
@@ -0,0 +1,100 @@
+import os
+import random
+
+import pytest
+
+from parallel_string_matching.incremental import IncrementalSearch
+
+def scan(path, patterns, **kwargs):
+    return list(IncrementalSearch(str(path), patterns, **kwargs).scan())
+
+def append(path, data):
+    with open(path, "ab") as file:
+        file.write(data)
+
+@pytest.mark.parametrize("algorithm", ["kmp", "horspool", "find", "regex"])
+@pytest.mark.parametrize("pattern", [b"abab", b"aab", b"b"])
+def test_appends_match_whole_file(tmp_path, algorithm, pattern, brute_force):
+    rng = random.Random(1)
+    path = tmp_path / "app.log"
+    path.write_bytes(b"")
+    found = list()
+    for _ in range(30):
+        append(path, bytes(rng.choice(b"ab") 
+                                    for _ in range(rng.randint(0, 7))))
+        found.extend(scan(path, [pattern], algorithm=algorithm, 
+                                            ignore_case=False, buffer_size=3))
+    text = path.read_bytes()
+    assert found == [(str(path), pattern, i) 
+                                    for i in brute_force(pattern, text)]
+
+def test_ignore_case_across_appends(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"xx Err")
+    assert scan(path, [b"error"]) == []
+    append(path, b"OR yy error")
+    assert scan(path, [b"error"]) == [(str(path), b"error", 3), 
+                                        (str(path), b"error", 12)]
+
+def test_several_patterns_across_appends(tmp_path, brute_force):
+    rng = random.Random(2)
+    path = tmp_path / "app.log"
+    path.write_bytes(b"")
+    patterns = [b"ab", b"bab", b"aaa"]
+    found = list()
+    for _ in range(30):
+        append(path, bytes(rng.choice(b"ab") 
+                                    for _ in range(rng.randint(0, 7))))
+        found.extend(scan(path, patterns, ignore_case=False, buffer_size=4))
+    text = path.read_bytes()
+    expected = sorted((i, pattern) for pattern in patterns 
+                                        for i in brute_force(pattern, text))
+    assert [(i, pattern) for _, pattern, i in found] == expected
+
+def test_truncated_file_is_scanned_again(tmp_path, capsys):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"error one, error two, error three")
+    assert len(scan(path, [b"error"])) == 3
+    with open(path, "r+b") as file:
+        file.truncate(5)
+    assert scan(path, [b"error"]) == [(str(path), b"error", 0)]
+    assert "truncated" in capsys.readouterr().out
+
+def test_rewritten_file_is_scanned_again(tmp_path, capsys):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"error one")
+    assert len(scan(path, [b"error"])) == 1
+    with open(path, "r+b") as file:
+        file.write(b"ERROR")
+    append(path, b" two")
+    assert scan(path, [b"error"]) == [(str(path), b"error", 0)]
+    assert "rewritten" in capsys.readouterr().out
+
+def test_rotation_scans_rest_of_rotated_file(tmp_path, capsys):
+    path = tmp_path / "app.log"
+    rotated = tmp_path / "app.log.1"
+    path.write_bytes(b"error 1\n")
+    assert scan(path, [b"error"]) == [(str(path), b"error", 0)]
+    append(path, b"error 2\n")
+    os.rename(path, rotated)
+    path.write_bytes(b"new error 3\n")
+    assert scan(path, [b"error"]) == [(str(rotated), b"error", 8),
+                                        (str(path), b"error", 4)]
+    assert "rotated" in capsys.readouterr().out
+    assert scan(path, [b"error"]) == []
+
+def test_rotated_file_removed(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"error 1\n")
+    scan(path, [b"error"])
+    os.remove(path)
+    path.write_bytes(b"error 2\n")
+    assert scan(path, [b"error"]) == [(str(path), b"error", 0)]
+
+def test_pattern_sets_keep_their_own_checkpoints(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"error warn ")
+    assert len(scan(path, [b"error"])) == 1
+    append(path, b"error warn")
+    assert len(scan(path, [b"warn"])) == 2
+    assert len(scan(path, [b"error"])) == 1
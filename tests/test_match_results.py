@@ -0,0 +1,79 @@
+import random
+from array import array
+
+import pytest
+
+from parallel_string_matching.string_matching import MatchResults
+from parallel_string_matching.string_matching import ParallelStringMatching
+from parallel_string_matching.string_matching import shared_memory
+
+PARTS = [[0, 3, 7], [], [10], [12, 13, 20, 31], [], [40, 41]]
+
+def results(shared=False):
+    share = ParallelStringMatching.share_matches
+    parts = [array("q", part) for part in PARTS]
+    if shared:
+        parts = [share(part) for part in parts]
+    return MatchResults(parts)
+
+@pytest.fixture(params=[False, True], ids=["arrays", "shared"])
+def shared(request):
+    if request.param and shared_memory is None:
+        pytest.skip("shared memory unavailable")
+    return request.param
+
+def test_sequence(shared):
+    expected = [i for part in PARTS for i in part]
+    with results(shared) as matches:
+        assert len(matches) == len(expected)
+        assert list(matches) == expected
+        assert matches.tolist() == expected
+        for i in range(-len(expected), len(expected)):
+            assert matches[i] == expected[i]
+        for i in (len(expected), -len(expected) - 1):
+            with pytest.raises(IndexError):
+                matches[i]
+
+def test_slices(shared):
+    expected = [i for part in PARTS for i in part]
+    rng = random.Random(1)
+    bounds = [None] + list(range(-15, 16))
+    with results(shared) as matches:
+        for _ in range(500):
+            index = slice(rng.choice(bounds), rng.choice(bounds), 
+                                rng.choice([None, 1, 1, 2, 3, -1, -2]))
+            sliced = matches[index]
+            assert isinstance(sliced, array)
+            assert list(sliced) == expected[index], index
+
+def test_close_releases_blocks(shared):
+    matches = results(shared)
+    names = [block.name for block in matches.blocks]
+    assert len(names) == (4 if shared else 0)
+    matches.close()
+    assert len(matches) == 0 and list(matches) == []
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+    matches.close()
+
+def test_empty():
+    with MatchResults() as matches:
+        assert len(matches) == 0
+        assert list(matches[:]) == []
+        with pytest.raises(IndexError):
+            matches[0]
+
+@pytest.mark.parametrize("vectorized", [True, False], 
+                                        ids=["numpy", "no-numpy"])
+def test_shift_array(vectorized, monkeypatch):
+    from parallel_string_matching import numpy_backend
+    if vectorized and numpy_backend.np is None:
+        pytest.skip("NumPy not installed")
+    if not vectorized:
+        monkeypatch.setattr(numpy_backend, "np", None)
+    shift = ParallelStringMatching.shift_array
+    for part in PARTS:
+        matches = array("q", part)
+        assert shift(matches, 2**40) == array("q", [i + 2**40 for i in part])
+        assert shift(array("q", part), 0) == array("q", part)
@@ -0,0 +1,57 @@
+import multiprocessing as mp
+import random
+
+import pytest
+
+from parallel_string_matching.string_matching import StringMatching
+from parallel_string_matching.string_matching import ParallelStringMatching
+from parallel_string_matching.string_matching import ParallelPreprocessing
+
+def kmp(pattern, data):
+    sm = StringMatching()
+    return sm.kmp_algorithm(pattern, data, *sm.preprocess("kmp", pattern))
+
+def search_mmap(path, pattern, processors, algorithm="kmp"):
+    psm = ParallelStringMatching()
+    args = psm.preprocess(algorithm, pattern)
+    segments = ParallelPreprocessing.get_file_segments(path, processors)
+    with mp.Pool(processors) as pool:
+        results = pool.starmap(psm.mmap_algorithm,
+                                [(path, pattern, segment, algorithm) + args
+                                for segment in segments])
+    return [offset for result in results for offset in result], segments
+
+@pytest.mark.parametrize("algorithm", ["naive", "kmp"])
+@pytest.mark.parametrize("shift", [-6, -5, -1, 0])
+def test_match_crossing_range_boundary(tmp_path, algorithm, shift):
+    data = b"a" * 50 + b"b" * 50
+    path = tmp_path / "text"
+    path.write_bytes(data)
+    boundary = ParallelPreprocessing.get_file_segments(str(path), 2)[0][1]
+    data = data[:boundary + shift] + b"needle" + data[boundary + shift + 6:]
+    path.write_bytes(data)
+    matches, _ = search_mmap(str(path), b"needle", 2, algorithm)
+    # Owned by one range only, and reported once
+    assert matches == kmp(b"needle", data) == [boundary + shift]
+
+@pytest.mark.parametrize("processors", [2, 4, 8])
+def test_file_shorter_than_workers(tmp_path, processors):
+    path = tmp_path / "text"
+    for data in (b"", b"a", b"ab", b"aba"):
+        path.write_bytes(data)
+        for pattern in (b"a", b"ab", b"aba", b"abab"):
+            matches, _ = search_mmap(str(path), pattern, processors)
+            assert matches == kmp(pattern, data), (data, pattern)
+
+@pytest.mark.parametrize("algorithm", ["naive", "kmp"])
+def test_matches_sequential_kmp(tmp_path, algorithm):
+    rng = random.Random(1)
+    path = tmp_path / "text"
+    for _ in range(8):
+        data = bytes(rng.choice(b"ab ") for _ in range(rng.randint(0, 300)))
+        pattern = bytes(rng.choice(b"ab") for _ in range(rng.randint(1, 5)))
+        path.write_bytes(data)
+        for processors in (1, 2, 3, 5):
+            matches, _ = search_mmap(str(path), pattern, processors,
+                                                                algorithm)
+            assert matches == kmp(pattern, data), (data, pattern, processors)
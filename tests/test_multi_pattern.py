@@ -0,0 +1,66 @@
+import re
+import multiprocessing as mp
+
+from parallel_string_matching import multi_pattern
+from parallel_string_matching.multi_pattern import MultiPatternMatcher
+from parallel_string_matching.multi_pattern import ParallelMultiPatternMatcher
+from parallel_string_matching.string_matching import ParallelPreprocessing
+
+TEXT = "Gregor Samsa woke, GREGOR said, gregor ushers hers."
+
+def reference(pattern, text, ignore_case=False):
+    flags = re.IGNORECASE if ignore_case else 0
+    return [m.start() for m in re.finditer(
+                        "(?={})".format(re.escape(pattern)), text, flags)]
+
+def test_search_matches_reference():
+    patterns = ["he", "she", "hers", "us", "Gregor"]
+    results = MultiPatternMatcher(patterns).search(TEXT)
+    assert results == {p: reference(p, TEXT) for p in patterns}
+
+def test_ignore_case_keys_results_by_given_patterns():
+    patterns = ["Gregor", "gregor", "SAMSA"]
+    results = MultiPatternMatcher(patterns, ignore_case=True).search(TEXT)
+    assert list(results) == patterns
+    for pattern in patterns:
+        assert results[pattern] == reference(pattern, TEXT, True)
+
+def test_bytes_ignore_case():
+    patterns = [b"Gregor", b"sAmSa"]
+    results = MultiPatternMatcher(patterns, True).search(TEXT.encode())
+    for pattern in patterns:
+        assert results[pattern] == reference(pattern.decode(), TEXT, True)
+
+def test_parallel_shared_key_results_are_shifted_once():
+    matcher = ParallelMultiPatternMatcher(["Gregor", "GREGOR"], True)
+    results = matcher.search(TEXT[10:], [10, len(TEXT)])
+    expected = [i for i in reference("gregor", TEXT, True) if i >= 10]
+    assert results == {"Gregor": expected, "GREGOR": expected}
+
+def test_parallel_results_are_shifted():
+    patterns = ["Gregor", "gregor", "hers"]
+    results = ParallelMultiPatternMatcher(patterns).search(TEXT[10:],
+                                                            [10, len(TEXT)])
+    assert results == {p: [i for i in reference(p, TEXT) if i >= 10]
+                                                            for p in patterns}
+
+def test_compile_matcher_is_cached():
+    matcher = multi_pattern.compile_matcher(["he", "she"], True, True)
+    assert multi_pattern.compile_matcher(("he", "she"), 1, 1) is matcher
+    assert isinstance(matcher, ParallelMultiPatternMatcher)
+
+def test_pool_workers_search_with_installed_matcher():
+    patterns = ["he", "she", "hers", "gregor"]
+    matcher = multi_pattern.compile_matcher(patterns, True, True)
+    text = TEXT * 5
+    sliced_text, segments = ParallelPreprocessing.get_text_segments(text, 3,
+                                                        matcher.max_length)
+    with mp.Pool(3, initializer=multi_pattern.init_worker, 
+                                                initargs=(matcher,)) as pool:
+        results = pool.starmap(multi_pattern.search_segment, 
+                                                zip(sliced_text, segments))
+    merged = {pattern: list() for pattern in patterns}
+    for result in results:
+        for pattern, matches in result.items():
+            merged[pattern].extend(matches)
+    assert merged == {p: reference(p, text, True) for p in patterns}
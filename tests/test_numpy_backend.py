@@ -0,0 +1,29 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from parallel_string_matching.numpy_backend import find_matches
+from parallel_string_matching.string_matching import StringMatching
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 8, 13])
+def test_candidates_across_blocks(block_size, cases, brute_force):
+    for text, pattern in cases(1, 150):
+        for haystack, needle in ((text, pattern),
+                                    (text.encode(), pattern.encode())):
+            matches = find_matches(needle, haystack, block_size)
+            assert matches.dtype == np.int64
+            assert matches.tolist() == brute_force(needle, haystack), \
+                                                            (text, pattern)
+
+@pytest.mark.parametrize("block_size", [1, 4, 7])
+def test_ignore_case_across_blocks(block_size, cases, brute_force):
+    sm = StringMatching()
+    for text, pattern in cases(2, 100, ["aAbB", "aäÄ b"], None, 60, 5):
+        fold = sm.build_fold_table(pattern)
+        assert find_matches(pattern.lower(), text, block_size,
+                                                    fold).tolist() == \
+                    brute_force(pattern.lower(), text.lower()), (text, pattern)
+
+def test_mixed_types():
+    with pytest.raises(TypeError):
+        find_matches("ab", b"abab")
@@ -0,0 +1,72 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from parallel_string_matching.search_server import SearchServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERIES = ["abab", "", '{"pattern": "ABAB", "ignore_case": false}',
+            '{"pattern": "ABab", "algorithm": "auto", "offsets": true}',
+            '{"pattern": "aab", "algorithm": "find", "offsets": true}',
+            '{"pattern": "ab", "algorithm": "unknown"}', "{broken"]
+
+@pytest.fixture
+def text_file(tmp_path, cases):
+    text = "".join(text for text, _ in cases(1, 40, ["ab", "ab "]))
+    path = tmp_path / "text.txt"
+    path.write_text(text + "ABAB")
+    return str(path), (text + "ABAB").encode()
+
+def check_responses(responses, data, brute_force):
+    folded = data.lower()
+    assert len(responses) == len(QUERIES) - 1
+    assert responses[0]["matches"] == len(brute_force(b"abab", folded))
+    assert responses[1]["matches"] == 1
+    assert responses[2]["offsets"] == brute_force(b"abab", folded)
+    assert responses[2]["algorithm"] != "auto"
+    assert responses[3]["offsets"] == brute_force(b"aab", folded)
+    assert "Unknown algorithm" in responses[4]["error"]
+    assert "Invalid request" in responses[5]["error"]
+
+@pytest.mark.parametrize("processors", [1, 3])
+def test_serve_stream(text_file, brute_force, processors):
+    path, data = text_file
+    output = io.StringIO()
+    with SearchServer(path, processors) as server:
+        server.serve_stream(io.StringIO("\n".join(QUERIES) + "\n"), output)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    check_responses(responses, data, brute_force)
+
+def test_stdin_round_trip(text_file, brute_force):
+    path, data = text_file
+    process = subprocess.run([sys.executable, "-m",
+                    "parallel_string_matching.search_server", "-t", path,
+                    "--processor_count", "2"], input="\n".join(QUERIES),
+                    capture_output=True, text=True, cwd=ROOT, timeout=60)
+    assert process.returncode == 0, process.stderr
+    assert "Server ready with 2 worker(s)" in process.stderr
+    responses = [json.loads(line) for line in process.stdout.splitlines()]
+    check_responses(responses, data, brute_force)
+
+def test_socket_does_not_replace_files(text_file):
+    path, _ = text_file
+    with SearchServer(path, 1) as server:
+        with pytest.raises(FileExistsError):
+            server.serve_socket(path)
+    assert os.path.exists(path)
+
+def test_algorithm_resolved_once(text_file, monkeypatch):
+    path, _ = text_file
+    with SearchServer(path, 2, algorithm="auto") as server:
+        calls = list()
+        select = server.select_algorithm
+        monkeypatch.setattr(server, "select_algorithm", 
+                            lambda *args: calls.append(args) or select(*args))
+        response = server.handle_request('{"pattern": "abab"}')
+        assert len(calls) == 1 and response["algorithm"] != "auto"
+        server.query("abab")
+        assert len(calls) == 2
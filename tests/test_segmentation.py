@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from parallel_string_matching.string_matching import ParallelStringMatching
+from parallel_string_matching.string_matching import ParallelPreprocessing
+from parallel_string_matching.string_matching import DEFAULT_CHUNK_SIZE
+
+ALPHABETS = ["ab", "ab ", "a,b "]
+
+@pytest.fixture
+def segment_cases(cases):
+    """
+    Random (text, pattern, processors, chunk_size) cases, small chunks
+    cutting the text far more often than the pattern length.
+    """
+
+    def generate(seed, count=200):
+        rng = random.Random(seed)
+        for text, pattern in cases(seed, count, ALPHABETS, text_length=120,
+                                                            pattern_length=6):
+            yield (text, pattern, rng.randint(1, 9),
+                                rng.choice([None, None, 1, 2, 3, 5, 8, 13]))
+    return generate
+
+def test_text_segments(engine, segment_cases, brute_force):
+    psm = ParallelStringMatching()
+    for text, pattern, processors, chunk_size in segment_cases(1):
+        args = psm.preprocess(engine, pattern)
+        sliced_text, segments = ParallelPreprocessing.get_text_segments(text,
+                                        processors, len(pattern), chunk_size)
+        matches = list()
+        for piece, segment in zip(sliced_text, segments):
+            matches.extend(psm.segment_algorithm(pattern, piece, segment,
+                                                        engine, *args))
+        assert matches == brute_force(pattern, text), (text, pattern,
+                                                    processors, chunk_size)
+
+def test_buffer_segments(engine, segment_cases, brute_force):
+    psm = ParallelStringMatching()
+    for text, pattern, processors, chunk_size in segment_cases(2, 100):
+        for buffer, key in ((text, pattern),
+                            (text.encode(), pattern.encode())):
+            args = psm.preprocess(engine, key)
+            segments = ParallelPreprocessing.calculate_chunk_size(len(buffer),
+                                    chunk_size) if chunk_size else \
+                        ParallelPreprocessing.calculate_segment_size(
+                                                    len(buffer), processors)
+            matches = list()
+            for segment in segments:
+                matches.extend(psm.buffer_algorithm(buffer, key, segment,
+                                                            engine, *args))
+            assert matches == brute_force(key, buffer), (text, pattern,
+                                                    processors, chunk_size)
+
+@pytest.mark.parametrize("algorithm", ["naive", "kmp", "horspool", "find",
+                                                                    "bndm"])
+def test_file_segments(algorithm, segment_cases, brute_force, tmp_path):
+    psm = ParallelStringMatching()
+    path = str(tmp_path / "text")
+    for text, pattern, processors, chunk_size in segment_cases(3, 100):
+        with open(path, "w") as file:
+            file.write(text)
+        encoded = pattern.encode()
+        args = psm.preprocess(algorithm, encoded)
+        matches = list()
+        for segment in ParallelPreprocessing.get_file_segments(path,
+                                                processors, chunk_size):
+            matches.extend(psm.mmap_algorithm(path, encoded, segment,
+                                                        algorithm, *args))
+        assert matches == brute_force(pattern, text), (text, pattern,
+                                                    processors, chunk_size)
+
+def test_segments_cover_text():
+    for length in range(0, 40):
+        for processors in range(1, 7):
+            segments = ParallelPreprocessing.calculate_segment_size(length,
+                                                                processors)
+            assert segments[0][0] == 0 and segments[-1][1] == length
+            assert all(a[1] == b[0] for a, b in zip(segments, segments[1:]))
+            sizes = [upper - lower for lower, upper in segments]
+            assert max(sizes) - min(sizes) <= 1
+
+def test_task_size():
+    task_size = ParallelPreprocessing.calculate_task_size
+    assert task_size(0, 4, 100) == 1
+    assert task_size(10, 4, 100) == 1
+    assert task_size(1000, 4, 100) == 63
+    assert task_size(10**6, 4, 100) == 100
+
+def test_chunk_size_by_mode():
+    choose = ParallelPreprocessing.choose_chunk_size
+    assert choose(None, "all") is None and choose(None, "count") is None
+    assert choose(None, "exists") == choose(None, "first-k") == \
+                                                    DEFAULT_CHUNK_SIZE
+    assert choose(5, "exists") == choose(5, "all") == 5
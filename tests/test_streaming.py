@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+from parallel_string_matching.string_matching import StreamingStringMatching
+
+ALPHABETS = ["ab", "aäb", "aé b"]
+
+def test_matches_in_memory_search(engine, cases, search):
+    ssm = StreamingStringMatching()
+    for text, pattern in cases(1, 60, ALPHABETS, text_length=120):
+        data, encoded = text.encode(), pattern.encode()
+        expected = search(engine, encoded, data)
+        for buffer_size in (1, 2, 3, 7, 64):
+            matches = ssm.search_stream(encoded, io.BytesIO(data), engine,
+                                        buffer_size, ignore_case=False)
+            assert list(matches) == expected, (text, pattern, buffer_size)
+
+@pytest.mark.parametrize("engine", ["shift_or", "bndm"])
+@pytest.mark.parametrize("edits", [True, False])
+def test_approximate(engine, edits, cases, search):
+    ssm = StreamingStringMatching()
+    for text, pattern in cases(2, 60, ["ab", "abc"], None, 120, 6):
+        data, encoded = text.encode(), pattern.encode()
+        max_errors = len(pattern) // 3
+        expected = search(engine, encoded, data, False, max_errors, edits)
+        for buffer_size in (1, 4, 9):
+            matches = ssm.search_stream(encoded, io.BytesIO(data), engine,
+                            buffer_size, False, max_errors, edits)
+            assert list(matches) == expected, (text, pattern, buffer_size)
+
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1", "utf-16-le"])
+def test_encoding(encoding, cases, brute_force, tmp_path):
+    ssm = StreamingStringMatching()
+    path = tmp_path / "text"
+    for text, pattern in cases(3, 40, ["aäb", "aé b"], None, 120, 4):
+        data = text.encode(encoding)
+        path.write_bytes(data)
+        expected = brute_force(pattern.encode(encoding), data)
+        for buffer_size in (1, 5, 64):
+            matches = ssm.search_file(pattern, str(path), "kmp", buffer_size,
+                                    ignore_case=False, encoding=encoding)
+            assert list(matches) == expected, (text, pattern, buffer_size)
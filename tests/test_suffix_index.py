@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from parallel_string_matching import suffix_index
+from parallel_string_matching.suffix_index import SuffixArrayIndex
+
+TEXTS = [b"", b"a", b"banana", b"mississippi", b"a" * 50, b"abab" * 20,
+            b"\x00\x00a\x00", bytes(range(256)) * 2]
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(suffix_index, "np", None)
+    return request.param
+
+def random_texts(seed=3, count=30):
+    rng = random.Random(seed)
+    for _ in range(count):
+        alphabet = rng.choice([b"ab", b"abc", b"\x00\xff", b"the qu"])
+        yield bytes(rng.choice(alphabet) for _ in range(rng.randint(1, 300)))
+
+def build(path, text, processors):
+    path.write_bytes(text)
+    runs = [suffix_index.sort_segment(str(path), segment) for segment in
+                    suffix_index.pp.get_file_segments(str(path), processors)]
+    return suffix_index.refine_suffix_array(*suffix_index.merge_runs(
+                                        suffix_index.open_text(str(path)), 
+                                        runs))
+
+def test_prefix_keys_order_suffixes(backend):
+    text = b"ab\x00ab\x00\x00ab"
+    keys = suffix_index.prefix_keys(text, 0, len(text))
+    for i in range(len(text)):
+        for j in range(len(text)):
+            a = text[i:i + suffix_index.INITIAL_DEPTH]
+            b = text[j:j + suffix_index.INITIAL_DEPTH]
+            assert (keys[i] < keys[j]) == (a < b)
+            assert (keys[i] == keys[j]) == (a == b)
+
+@pytest.mark.parametrize("processors", [1, 3])
+def test_suffix_array_matches_sorted_suffixes(backend, tmp_path, processors):
+    for text in TEXTS + list(random_texts()):
+        suffix_array = build(tmp_path / "text", text, processors)
+        assert list(suffix_array) == sorted(range(len(text)), 
+                                                key=lambda i: text[i:])
+
+def test_small_blocks(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(suffix_index, "BLOCK_SIZE", 5)
+    for text in TEXTS + list(random_texts(seed=4)):
+        suffix_array = build(tmp_path / "text", text, 2)
+        assert list(suffix_array) == sorted(range(len(text)), 
+                                                key=lambda i: text[i:])
+
+def test_index_queries(tmp_path):
+    text = b"".join(random_texts(seed=5, count=5))
+    path = tmp_path / "text"
+    path.write_bytes(text)
+    suffix_index.save_index(suffix_index.build_suffix_array(str(path), 2),
+                                len(text), str(path) + ".sa")
+    index = SuffixArrayIndex(str(path))
+    for pattern in [b"a", b"ab", b"aba", b"the", b"\x00", b"zz"]:
+        expected = [i for i in range(len(text)) 
+                                        if text.startswith(pattern, i)]
+        assert index.count(pattern) == len(expected)
+        assert sorted(index.locate(pattern)) == expected